@@ -1,13 +1,30 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 import os
 from app import routes
+from app.rate_limit import RateLimitHeadersMiddleware
+from app.services import config, metrics, tracing
+from app.services.warmup import readiness, start_warmup
+from app.services.watchlist import watchlist_scheduler, watchlist_store
 
 # Read from env (comma-separated). Falls back to local Streamlit.
 origins_str = os.getenv("CORS_ORIGINS", "http://localhost:8501,http://127.0.0.1:8501")
 ALLOWED_ORIGINS = [o.strip() for o in origins_str.split(",") if o.strip()]
 
-app = FastAPI(title="AI Agent", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background: /health is live right away, /ready once warm
+    watchlist_store.seed(config.WATCHLIST)
+    start_warmup(asyncio.get_running_loop())
+    if config.WATCHLIST_ENABLED:
+        watchlist_scheduler.start()
+    yield
+    await watchlist_scheduler.stop()
+
+app = FastAPI(title="AI Agent", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,6 +34,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Adds the RateLimit-* headers set by the route rate limit checks
+app.add_middleware(RateLimitHeadersMiddleware)
+
+# Root span per request (exported, or inlined for X-Debug-Trace)
+if tracing.ACTIVE:
+    app.add_middleware(tracing.TracingMiddleware)
+
+# Per-route latency histograms for /metrics
+if config.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
 app.include_router(routes.router)
 
 @app.get("/")
@@ -26,3 +54,15 @@ def root():
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+@app.get("/ready")
+def ready():
+    # 503 until warm-up has finished, so launchers wait for a warm backend
+    state = readiness.snapshot()
+    return JSONResponse(state, status_code=200 if state["status"] == "ready" else 503)
+
+@app.get("/metrics")
+def metrics_endpoint():
+    if not config.METRICS_ENABLED:
+        return PlainTextResponse("metrics disabled\n", status_code=404)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
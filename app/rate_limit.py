@@ -0,0 +1,170 @@
+import math
+import threading
+import time
+from typing import NamedTuple
+from fastapi import HTTPException, Request, status
+from app import auth
+from app.services import config, db
+
+# Token buckets shared by every worker on the host (one SQLite WAL file)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key        TEXT PRIMARY KEY,
+    tokens     REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    allowed    INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS buckets_updated ON buckets (updated_at);
+"""
+
+# Refill the bucket for the time since its last update, then take `cost` tokens
+# if there are enough. One statement, so it's atomic across workers without an
+# explicit transaction. (SET expressions all see the row as it was.)
+HIT_SQL = """
+INSERT INTO buckets (key, tokens, updated_at, allowed) VALUES (:key, :capacity - :cost, :now, 1)
+ON CONFLICT (key) DO UPDATE SET
+    allowed = MIN(:capacity, tokens + MAX(:now - updated_at, 0) * :rate) >= :cost,
+    tokens = MIN(:capacity, tokens + MAX(:now - updated_at, 0) * :rate)
+             - (CASE WHEN MIN(:capacity, tokens + MAX(:now - updated_at, 0) * :rate) >= :cost THEN :cost ELSE 0 END),
+    updated_at = :now
+RETURNING tokens, allowed
+"""
+
+# Budgets: name -> (requests, window seconds). A bucket holds `requests` tokens
+# and refills at requests/window per second, so bursts up to `requests` pass.
+BUDGETS = {
+    "default": (config.RATE_LIMIT_REQUESTS, config.RATE_LIMIT_WINDOW),
+    "llm": (config.RATE_LIMIT_LLM_REQUESTS, config.RATE_LIMIT_LLM_WINDOW),
+}
+
+# Drop buckets idle long enough to have refilled completely, every N checks
+PRUNE_EVERY = 1000
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: float
+    reset: float        # seconds until the bucket is full again
+    retry_after: float  # seconds until `cost` tokens are available (0 if allowed)
+    window: int
+
+    def headers(self) -> dict[str, str]:
+        return {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(max(int(self.remaining), 0)),
+            "RateLimit-Reset": str(math.ceil(self.reset)),
+            "RateLimit-Policy": f"{self.limit};w={self.window}",
+        }
+
+
+class RateLimiter:
+    """Token-bucket limiter keyed by (budget, client); O(1) primary-key upsert per check."""
+
+    def __init__(self, name: str = "rate_limits"):
+        self.name = name
+        self._checks = 0
+        self._lock = threading.Lock()
+
+    def _conn(self):
+        return db.connect(self.name, SCHEMA)
+
+    def hit(self, key: str, requests: int, window: int, cost: float = 1) -> Decision:
+        rate = requests / window
+        now = time.time()
+        tokens, allowed = self._conn().execute(
+            HIT_SQL, {"key": key, "capacity": requests, "cost": cost, "rate": rate, "now": now}
+        ).fetchone()
+        self._maybe_prune(now)
+        return Decision(
+            allowed=bool(allowed),
+            limit=requests,
+            remaining=tokens,
+            reset=(requests - tokens) / rate,
+            retry_after=0.0 if allowed else (cost - tokens) / rate,
+            window=window,
+        )
+
+    def _maybe_prune(self, now: float) -> None:
+        with self._lock:
+            self._checks += 1
+            if self._checks % PRUNE_EVERY:
+                return
+        idle = max(window for _, window in BUDGETS.values())
+        self._conn().execute("DELETE FROM buckets WHERE updated_at < ?", (now - idle,))
+
+
+rate_limiter = RateLimiter()
+
+
+def client_key(request: Request) -> str:
+    """Authenticated user if the request carries a valid bearer token, else the client address."""
+    header = request.headers.get("authorization", "")
+    if header.lower().startswith("bearer "):
+        try:
+            user = auth.decode_access_token(header[7:]).get("sub")
+            if user:
+                return f"user:{user}"
+        except ValueError:
+            pass
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+def check(request: Request, budget: str = "default", cost: float = 1) -> None:
+    """
+    Charge `cost` tokens from the client's `budget`; raise 429 when it's spent,
+    and 400 when `cost` is more than the whole budget (it could never pass).
+    The RateLimit-* headers of the last budget checked go on the response
+    (see RateLimitHeadersMiddleware).
+    """
+    if not config.RATE_LIMIT_ENABLED:
+        return
+    requests, window = BUDGETS[budget]
+    if cost > requests:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Request costs {cost:g} {budget} requests, more than the budget of {requests} per {window}s",
+        )
+    decision = rate_limiter.hit(f"{budget}:{client_key(request)}", requests, window, cost)
+    headers = decision.headers()
+    request.state.rate_limit = headers
+    if not decision.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Rate limit exceeded ({requests} {budget} requests per {window}s)",
+            headers={**headers, "Retry-After": str(math.ceil(decision.retry_after))},
+        )
+
+
+# ---- Dependencies ----
+# Plain `def`: FastAPI runs them on its threadpool, so the SQLite upsert (and a
+# busy write lock) never blocks the event loop.
+def default_limit(request: Request) -> None:
+    check(request, "default")
+
+
+def llm_limit(request: Request) -> None:
+    check(request, "llm")
+
+
+class RateLimitHeadersMiddleware:
+    """ASGI middleware copying request.state.rate_limit onto the response headers."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        scope.setdefault("state", {})
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                limits = scope.get("state", {}).get("rate_limit")
+                if limits:
+                    present = {k.lower() for k, _ in message.get("headers", [])}
+                    extra = [(k.lower().encode(), v.encode()) for k, v in limits.items() if k.lower().encode() not in present]
+                    message["headers"] = list(message.get("headers", [])) + extra
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -1,25 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import json
+from typing import Literal
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from pydantic import BaseModel
 from app import auth
-from app.utils import rate_limiter
+from app.rate_limit import check as rate_limit_check, default_limit, llm_limit
+from app.services import config, tracing
+from app.services.response_cache import has_error, response_cache
+from app.services.sentiment_cache import sentiment_cache
+from app.services.singleflight import agent_key, normalize_symbol, request_coalescer, request_key
+from app.services.watchlist import watchlist_scheduler, watchlist_store
 
+# Services pull in pandas, yfinance, openai and langgraph, so they're imported
+# inside the handlers that use them: the app (and /health) comes up without
+# paying for them, and each handler loads its dependencies on first use.
 
-from app.services.equity_tool import get_stock_data
-from app.services.news_tool import get_latest_news
-
-from app.services.indicators import compute_indicators
-from app.services.sentiment_tool import analyze_sentiment, aggregate_sentiment
-from app.services.decision_tool import hybrid_decision
-
-from app.services.orchestrator import build_agent_workflow
-
-router = APIRouter()
+# Every route draws from the caller's default rate limit budget
+router = APIRouter(dependencies=[Depends(default_limit)])
 
 # Fake in-memory user database
+# (hash precomputed with auth.hash_password("password123"); hashing Argon2 at import slows every cold start)
 fake_users_db = {
     "abu": {
         "username": "abu",
-        "hashed_password": auth.hash_password("password123")
+        "hashed_password": "$argon2id$v=19$m=65536,t=3,p=4$B+D837u39v7/HwOg9L73ng$7iLYUWpo1GKJi4a5We1HoWwTee20J8k6rbNK84RLyec"
     }
 }
 
@@ -56,54 +63,281 @@ def login(form_data: OAuth2PasswordRequestForm = Depends()):
 
 @router.get("/ping")
 def ping(user: str = Depends(get_current_user)):
-    # Apply limiter before doing anything else
-    rate_limiter(user)
     return {"message": f"Hello {user}, you are authenticated!"}
 
 @router.get("/news/{symbol}")
-def news(symbol: str, limit: int = 5):
+async def news(symbol: str, limit: int = 5):
+    from app.services.news_tool import get_latest_news_async
+
     try:
-        return {"symbol": symbol, "news": get_latest_news(symbol, limit)}
+        return {"symbol": symbol, "news": await get_latest_news_async(symbol, limit)}
     except Exception as e:
         return {"error": str(e)}
 
 @router.get("/equity/{symbol}")
-def equity(symbol: str, days: int = 30):
-    return get_stock_data(symbol, days)
+async def equity(
+    symbol: str,
+    days: int = 30,
+    fmt: Literal["records", "columnar"] = Query("records", alias="format"),
+    accept: str | None = Header(None),
+):
+    from app.services.arrow_format import ARROW_STREAM, bars_to_arrow, wants_arrow
+    from app.services.equity_tool import get_stock_bars, get_stock_columns, get_stock_data_async
+
+    # Arrow IPC is negotiated via Accept; JSON (records or columnar) otherwise.
+    # Bar store / yfinance calls block, so they run on worker threads.
+    if wants_arrow(accept):
+        try:
+            bars = await asyncio.to_thread(get_stock_bars, symbol, days)
+        except Exception as e:
+            return {"symbol": symbol, "error": str(e)}
+        return Response(bars_to_arrow(symbol, bars), media_type=ARROW_STREAM, headers={"Vary": "Accept"})
+
+    if fmt == "columnar":
+        return await asyncio.to_thread(get_stock_columns, symbol, days)
+    return await get_stock_data_async(symbol, days)
 
 @router.get("/indicators/{symbol}")
-def indicators(symbol: str, advanced: bool = False, days: int = 60):
-    stock_data = get_stock_data(symbol, days)
-    return compute_indicators(stock_data, advanced=advanced)
+async def indicators(symbol: str, advanced: bool = False, days: int = 60, accept: str | None = Header(None)):
+    from app.services.arrow_format import ARROW_STREAM, indicators_to_arrow, wants_arrow
+    from app.services.equity_tool import get_stock_data_async
+    from app.services.indicators import compute_indicators_async
+
+    stock_data = await get_stock_data_async(symbol, days)
+    result = await compute_indicators_async(stock_data, advanced=advanced)
+    if wants_arrow(accept) and "indicators" in result:
+        return Response(indicators_to_arrow(result), media_type=ARROW_STREAM, headers={"Vary": "Accept"})
+    return result
+
+async def _sentiment(symbol: str, model: str, limit: int) -> dict:
+    from app.services.news_tool import get_latest_news_async
+    from app.services.sentiment_tool import aggregate_sentiment, analyze_sentiment_async
 
-@router.get("/sentiment/{symbol}")
-def sentiment(symbol: str, model: str = "gpt-4o-mini", limit: int = 3):
-    news = get_latest_news(symbol, limit)
+    news = await get_latest_news_async(symbol, limit)
     headlines = [n["title"] for n in news]
-    results = analyze_sentiment(headlines, model=model)
+    results = await analyze_sentiment_async(headlines, model=model)
     overall = aggregate_sentiment(results)
     return {"symbol": symbol, "results": results, "overall": overall}
 
+@router.get("/sentiment/{symbol}", dependencies=[Depends(llm_limit)])
+async def sentiment(symbol: str, model: str = "gpt-4o-mini", limit: int = 3):
+    # Identical concurrent requests share one NewsAPI + OpenAI round
+    symbol = normalize_symbol(symbol)
+    key = request_key("sentiment", symbol, model=model, limit=limit)
+    return await request_coalescer.do(key, lambda: _sentiment(symbol, model, limit))
+
+
+@router.get("/cache/stats")
+def cache_stats():
+    return {
+        "sentiment": sentiment_cache.stats(),
+        "coalescing": request_coalescer.stats(),
+        "responses": response_cache.stats(),
+    }
+
+
+# ---- Response cache (stale-while-revalidate, see services/response_cache.py) ----
+def _encode(result) -> bytes:
+    # The bytes FastAPI would send for `result`
+    return JSONResponse(jsonable_encoder(result)).body
+
+
+def _json_response(body: bytes, cache_status: str, age: float, fresh_for: float) -> Response:
+    if cache_status == "BYPASS":
+        cache_control = "no-store"
+    else:
+        cache_control = f"max-age={round(fresh_for)}, stale-while-revalidate={config.RESPONSE_CACHE_STALE}"
+    headers = {"X-Cache": cache_status, "Age": str(int(age)), "Cache-Control": cache_control}
+    tracing.annotate(cache=cache_status)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+async def _cached(key: tuple, compute) -> Response:
+    """Serve `compute()` (coalesced on `key`) through the response cache."""
+    async def fill():
+        result = await request_coalescer.do(key, compute)
+        return _encode(result), not has_error(result)
+
+    return _json_response(*await response_cache.get(key, fill))
+
+
+async def _decision(symbol: str, advanced: bool, model: str, limit: int, days: int) -> dict:
+    from app.services.decision_tool import hybrid_decision_async
+    from app.services.equity_tool import get_stock_data_async
+    from app.services.indicators import compute_indicators_async
+    from app.services.news_tool import get_latest_news_async
+    from app.services.sentiment_tool import aggregate_sentiment, analyze_sentiment_async
 
-@router.get("/decision/{symbol}")
-def decision(symbol: str, advanced: bool = False, model: str = "gpt-4o-mini", limit: int = 3, days: int = 60):
     # 1. Get news + sentiment
-    news = get_latest_news(symbol, limit)
-    headlines = [n["title"] for n in news]
-    sentiment_results = analyze_sentiment(headlines, model=model)
-    sentiment_overall = aggregate_sentiment(sentiment_results)
+    async def sentiment_branch():
+        news = await get_latest_news_async(symbol, limit)
+        headlines = [n["title"] for n in news]
+        sentiment_results = await analyze_sentiment_async(headlines, model=model)
+        return aggregate_sentiment(sentiment_results)
 
     # 2. Get stock data + indicators
-    stock_data = get_stock_data(symbol, days)
-    indicators = compute_indicators(stock_data, advanced=advanced)["indicators"]
+    async def indicator_branch():
+        stock_data = await get_stock_data_async(symbol, days)
+        return (await compute_indicators_async(stock_data, advanced=advanced))["indicators"]
+
+    # Both branches are independent, so run them side by side
+    sentiment_overall, indicators = await asyncio.gather(sentiment_branch(), indicator_branch())
 
     # 3. Hybrid decision
-    final = hybrid_decision(symbol, sentiment_overall, indicators, model=model)
+    final = await hybrid_decision_async(symbol, sentiment_overall, indicators, model=model)
     return final
 
-@router.get("/agent/{symbol}")
-def agent(symbol: str):
-    workflow = build_agent_workflow()
-    state = workflow.invoke({"symbol": symbol})
-    return state
+@router.get("/decision/{symbol}", dependencies=[Depends(llm_limit)])
+async def decision(symbol: str, advanced: bool = False, model: str = "gpt-4o-mini", limit: int = 3, days: int = 60):
+    symbol = normalize_symbol(symbol)
+    key = request_key("decision", symbol, advanced=advanced, model=model, limit=limit, days=days)
+    return await _cached(key, lambda: _decision(symbol, advanced, model, limit, days))
+
+class StageFlags:
+    """Query flags selecting which agent stages to run (all on by default)."""
+
+    def __init__(
+        self,
+        news: bool = True,
+        equity: bool = True,
+        sentiment: bool = True,
+        indicators: bool = True,
+        decision: bool = True,
+    ):
+        flags = {"news": news, "equity": equity, "sentiment": sentiment, "indicators": indicators, "decision": decision}
+        self.stages = [name for name, enabled in flags.items() if enabled]
+        if not self.stages:
+            raise HTTPException(status_code=400, detail="Select at least one stage")
+
+
+# Stages that call the LLM (and draw from the llm rate limit budget)
+LLM_STAGES = {"sentiment", "decision"}
+
+
+def agent_llm_limit(request: Request, flags: StageFlags = Depends()):
+    if LLM_STAGES & set(flags.stages):
+        rate_limit_check(request, "llm")
+
+
+class BatchRequest(BaseModel):
+    symbols: list[str]
+
+
+def batch_llm_limit(request: Request, body: BatchRequest, flags: StageFlags = Depends()):
+    # One llm token per distinct symbol (as run_agent_batch dedupes them)
+    if LLM_STAGES & set(flags.stages):
+        symbols = {normalize_symbol(s) for s in body.symbols if s.strip()}
+        rate_limit_check(request, "llm", cost=max(len(symbols), 1))
+
+
+class WatchlistRequest(BaseModel):
+    symbols: list[str]
+
+
+# ---- Watchlist (refreshed in the background, see services/watchlist.py) ----
+# Plain `def`: status() reads the store (SQLite), so it runs on the threadpool
+@router.get("/watchlist")
+def watchlist():
+    return {
+        "symbols": watchlist_scheduler.status(),
+        "refresh_interval_s": watchlist_scheduler.interval,
+        "snapshot_hits": watchlist_scheduler.hits,
+    }
+
+
+@router.post("/watchlist")
+async def watchlist_add(body: WatchlistRequest, user: str = Depends(get_current_user)):
+    if not config.WATCHLIST_ENABLED:
+        raise HTTPException(status_code=409, detail="The watchlist scheduler is disabled (WATCHLIST_ENABLED=false)")
+    symbols = {s.strip().upper() for s in body.symbols if s.strip()}
+    if not symbols:
+        raise HTTPException(status_code=400, detail="symbols must not be empty")
+    current = await asyncio.to_thread(watchlist_store.symbols)
+    if len(symbols | set(current)) > config.WATCHLIST_MAX_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"At most {config.WATCHLIST_MAX_SYMBOLS} watchlist symbols")
+
+    added = await asyncio.to_thread(watchlist_store.add, symbols)
+    watchlist_scheduler.schedule_now(added)
+    return {"added": added, "symbols": await asyncio.to_thread(watchlist_store.symbols)}
+
+
+@router.delete("/watchlist/{symbol}")
+async def watchlist_remove(symbol: str, user: str = Depends(get_current_user)):
+    if not await asyncio.to_thread(watchlist_store.remove, symbol):
+        raise HTTPException(status_code=404, detail=f"{symbol.upper()} is not on the watchlist")
+    watchlist_scheduler.remove(symbol)
+    return {"removed": symbol.strip().upper(), "symbols": await asyncio.to_thread(watchlist_store.symbols)}
+
+
+@router.post("/agent/batch", dependencies=[Depends(batch_llm_limit)])
+def agent_batch(body: BatchRequest, flags: StageFlags = Depends()):
+    from app.services.batch import run_agent_batch
+
+    if not body.symbols:
+        raise HTTPException(status_code=400, detail="symbols must not be empty")
+    if len(body.symbols) > config.BATCH_MAX_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"At most {config.BATCH_MAX_SYMBOLS} symbols per batch")
+
+    # One NDJSON line per symbol, in completion order
+    lines = (json.dumps(item, default=str) + "\n" for item in run_agent_batch(body.symbols, flags.stages))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get("/agent/{symbol}/stream", dependencies=[Depends(agent_llm_limit)])
+async def agent_stream(symbol: str, flags: StageFlags = Depends()):
+    """
+    Server-Sent Events version of /agent: one event per finished stage, named
+    after its state key (news, sentiment, stock_data, indicators, decision),
+    then "done" (or "error").
+    """
+    from app.services.orchestrator import get_agent_workflow
+
+    # Same symbol as /agent would run and report
+    symbol = normalize_symbol(symbol)
+    workflow = get_agent_workflow(flags.stages)
+    snapshot = watchlist_scheduler.snapshot(symbol, flags.stages)
+
+    async def events():
+        if snapshot:
+            # Watchlist symbol: everything is precomputed, send it all at once
+            state = snapshot[0]
+            for key, value in state.items():
+                if key != "symbol":
+                    yield _sse(key, value)
+            yield _sse("done", {"symbol": symbol})
+            return
+        try:
+            async for update in workflow.astream({"symbol": symbol}, stream_mode="updates"):
+                for values in update.values():
+                    for key, value in (values or {}).items():
+                        yield _sse(key, value)
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
+            return
+        yield _sse("done", {"symbol": symbol})
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
+
+
+@router.get("/agent/{symbol}", dependencies=[Depends(agent_llm_limit)])
+async def agent(symbol: str, flags: StageFlags = Depends()):
+    from app.services.orchestrator import get_agent_workflow
+
+    # Coalesced callers share the leader's result, so it must not depend on casing
+    symbol = normalize_symbol(symbol)
+
+    # Watchlist symbols are served from the background scheduler's snapshot
+    snapshot = watchlist_scheduler.snapshot(symbol, flags.stages)
+    if snapshot:
+        state, age, fresh_for = snapshot
+        return _json_response(_encode(state), "SNAPSHOT", age, fresh_for)
 
+    # Only run the part of the graph the selected stages need
+    workflow = get_agent_workflow(flags.stages)
+    key = agent_key(symbol, flags.stages)
+    return await _cached(key, lambda: workflow.ainvoke({"symbol": symbol}))
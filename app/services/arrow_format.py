@@ -0,0 +1,45 @@
+import numpy as np
+from app.services.bar_store import COLUMNS
+
+# pyarrow is optional: without it the API simply keeps answering in JSON
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+
+def wants_arrow(accept: str | None) -> bool:
+    """True if the Accept header lists the Arrow stream type and pyarrow is installed."""
+    if pa is None or not accept:
+        return False
+    return any(part.split(";")[0].strip().lower() == ARROW_STREAM for part in accept.split(","))
+
+
+def _ipc_bytes(table) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def bars_to_arrow(symbol: str, bars: dict) -> bytes:
+    """
+    Encode OHLCV bars as an Arrow IPC stream: a UTC `date` timestamp column plus
+    float/int columns taken directly from the numpy arrays.
+    """
+    arrays = {"date": pa.array(bars["date"].astype("datetime64[s]"), type=pa.timestamp("s", tz="UTC"))}
+    for col in COLUMNS:
+        arrays[col] = pa.array(bars[col])
+    table = pa.table(arrays).replace_schema_metadata({"symbol": symbol})
+    return _ipc_bytes(table)
+
+
+def indicators_to_arrow(result: dict) -> bytes:
+    """Encode a compute_indicators result as a one-row Arrow IPC stream."""
+    indicators = result.get("indicators", {})
+    arrays = {"symbol": pa.array([result.get("symbol")], type=pa.string())}
+    for name, value in indicators.items():
+        arrays[name] = pa.array([None if value is None or not np.isfinite(value) else float(value)], type=pa.float64())
+    return _ipc_bytes(pa.table(arrays))
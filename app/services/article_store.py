@@ -0,0 +1,86 @@
+import hashlib
+import time
+from app.services import config, db
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    symbol       TEXT NOT NULL,
+    url_hash     TEXT NOT NULL,
+    url          TEXT NOT NULL,
+    title        TEXT,
+    published_at TEXT NOT NULL,
+    source       TEXT,
+    fetched_at   REAL NOT NULL,
+    PRIMARY KEY (symbol, url_hash)
+);
+CREATE INDEX IF NOT EXISTS articles_recent ON articles (symbol, published_at DESC);
+"""
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha256(url.strip().encode("utf-8")).hexdigest()
+
+
+class ArticleStore:
+    """
+    Per-symbol news articles in a local SQLite (WAL) file, deduplicated by URL.
+    Articles are kept in publishedAt order so the newest one tells the news client
+    where to resume (`from=`). Each symbol keeps at most `max_per_symbol` articles.
+    """
+
+    def __init__(self, name: str = "articles", max_per_symbol: int | None = None):
+        self.name = name
+        self.max_per_symbol = config.NEWS_STORE_MAX_PER_SYMBOL if max_per_symbol is None else max_per_symbol
+
+    def _conn(self):
+        return db.connect(self.name, SCHEMA)
+
+    def count(self, symbol: str) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM articles WHERE symbol = ?", (symbol,)).fetchone()[0]
+
+    def newest_published(self, symbol: str) -> str | None:
+        """publishedAt of the newest stored article (ISO 8601, as NewsAPI sent it)."""
+        return self._conn().execute("SELECT MAX(published_at) FROM articles WHERE symbol = ?", (symbol,)).fetchone()[0]
+
+    def latest(self, symbol: str, limit: int) -> list[dict]:
+        """Newest `limit` articles in the get_latest_news format."""
+        rows = self._conn().execute(
+            "SELECT title, published_at, url, source FROM articles WHERE symbol = ? "
+            "ORDER BY published_at DESC LIMIT ?",
+            (symbol, limit),
+        ).fetchall()
+        return [{"title": t, "publishedAt": p, "url": u, "source": s} for t, p, u, s in rows]
+
+    def add_many(self, symbol: str, articles: list[dict], replace_older: bool = False) -> int:
+        """
+        Insert articles not seen before; returns how many were new.
+        With `replace_older`, stored articles older than this batch are dropped first,
+        for when the batch didn't reach back to what we had (the store would have a gap).
+        """
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if replace_older and articles:
+                oldest = min(a["publishedAt"] for a in articles)
+                conn.execute("DELETE FROM articles WHERE symbol = ? AND published_at < ?", (symbol, oldest))
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO articles (symbol, url_hash, url, title, published_at, source, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(symbol, url_hash(a["url"]), a["url"], a["title"], a["publishedAt"], a["source"], now) for a in articles],
+            )
+            added = conn.total_changes - before
+            conn.execute(
+                "DELETE FROM articles WHERE symbol = ? AND url_hash NOT IN "
+                "(SELECT url_hash FROM articles WHERE symbol = ? ORDER BY published_at DESC LIMIT ?)",
+                (symbol, symbol, self.max_per_symbol),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return added
+
+
+article_store = ArticleStore()
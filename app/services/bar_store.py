@@ -0,0 +1,272 @@
+import os
+import re
+import threading
+import time
+from datetime import date, timedelta
+import numpy as np
+import yfinance as yf
+from app.services import config, market_calendar, metrics, tracing
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+_YF_COLUMNS = {"open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"}
+
+# Relative close difference on an overlapping bar that means the adjusted history
+# was re-based (yfinance back-adjusts every bar for splits and dividends)
+ADJUSTMENT_TOLERANCE = 1e-4
+
+
+def _empty_bars() -> dict:
+    bars = {"date": np.array([], dtype="datetime64[D]")}
+    for col in COLUMNS:
+        bars[col] = np.array([], dtype=np.int64 if col == "volume" else np.float64)
+    return bars
+
+
+def frame_to_bars(hist) -> dict:
+    """Convert a yfinance history frame into columnar numpy arrays (one per field)."""
+    if hist is None or hist.empty:
+        return _empty_bars()
+    index = hist.index.tz_localize(None) if hist.index.tz is not None else hist.index
+    bars = {"date": index.values.astype("datetime64[D]")}
+    for col in COLUMNS:
+        values = hist[_YF_COLUMNS[col]].to_numpy()
+        # Bulk downloads leave NaN volume on partial rows; treat it as no volume
+        bars[col] = np.nan_to_num(values).astype(np.int64) if col == "volume" else values.astype(np.float64, copy=False)
+    return bars
+
+
+def merge_bars(old: dict, new: dict) -> dict:
+    """Concatenate two bar sets, sorted by date; on duplicate dates the newer bar wins."""
+    if not len(old["date"]):
+        return new
+    if not len(new["date"]):
+        return old
+    merged = {k: np.concatenate([old[k], new[k]]) for k in ("date", *COLUMNS)}
+    order = np.argsort(merged["date"], kind="stable")
+    dates = merged["date"][order]
+    keep = np.r_[dates[1:] != dates[:-1], True]
+    return {k: v[order][keep] for k, v in merged.items()}
+
+
+def readjusted(old: dict, new: dict) -> bool:
+    """True if bars present in both sets disagree on the close, i.e. a split or dividend changed the adjustment."""
+    _, i, j = np.intersect1d(old["date"], new["date"], assume_unique=True, return_indices=True)
+    return bool(len(i)) and not np.allclose(old["close"][i], new["close"][j], rtol=ADJUSTMENT_TOLERANCE)
+
+
+def coverage(bars: dict, start: date, end: date) -> tuple[date, date] | None:
+    """
+    The part of [start, end) a fetch vouches for: its first to last bar, widened
+    over neighbouring days without an NYSE session. None if it came back empty
+    (yfinance returns an empty frame on errors rather than raising).
+    """
+    if not len(bars["date"]):
+        return None
+    lo = bars["date"][0].item()
+    hi = bars["date"][-1].item() + timedelta(days=1)
+    while lo > start and not market_calendar.is_trading_day(lo - timedelta(days=1)):
+        lo -= timedelta(days=1)
+    while hi < end and not market_calendar.is_trading_day(hi):
+        hi += timedelta(days=1)
+    return lo, hi
+
+
+class BarStore:
+    """
+    Persistent per-symbol daily OHLCV bars stored as columnar .npz files.
+    Each file remembers the date range it already covers, so a request only
+    downloads the part of its window that is missing (usually the tail), plus
+    one stored bar to check the adjustment hasn't changed since.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or (config.DATA_DIR / "bars")
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    # ---- Files ----
+    def _path(self, symbol: str):
+        return self.root / f"{re.sub(r'[^A-Za-z0-9._^=-]', '_', symbol.upper())}.npz"
+
+    def _lock(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(symbol.upper(), threading.Lock())
+
+    def _load(self, symbol: str) -> dict | None:
+        path = self._path(symbol)
+        if not path.exists():
+            return None
+        with np.load(path) as f:
+            return {k: f[k] for k in f.files}
+
+    def _save(self, symbol: str, entry: dict) -> None:
+        # Write to a temp file and swap it in, so readers never see a partial file
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(symbol)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, **entry)
+        os.replace(tmp, path)
+
+    # ---- Upstream ----
+    @metrics.timed_upstream("yfinance")
+    def _fetch(self, symbol: str, start: date, end: date) -> dict:
+        hist = yf.Ticker(symbol).history(start=start.strftime("%Y-%m-%d"), end=end.strftime("%Y-%m-%d"))
+        return frame_to_bars(hist)
+
+    @metrics.timed_upstream("yfinance")
+    def _fetch_many(self, symbols: list[str], start: date, end: date) -> dict:
+        """
+        One multi-ticker yfinance download for all `symbols`.
+        Returns {symbol: bars} with an Exception in place of bars for symbols that failed.
+        """
+        hist = yf.download(
+            symbols,
+            start=start.strftime("%Y-%m-%d"),
+            end=end.strftime("%Y-%m-%d"),
+            group_by="ticker",
+            auto_adjust=True,
+            progress=False,
+            threads=True,
+        )
+
+        out = {}
+        tickers = set(hist.columns.get_level_values(0)) if hist is not None and not hist.empty else set()
+        for symbol in symbols:
+            key = symbol.upper()
+            # A ticker that failed is missing from the frame or has no closes at all
+            if key not in tickers or hist[key]["Close"].isna().all():
+                out[symbol] = RuntimeError(f"No data for {symbol} in bulk download")
+            else:
+                # hist[key] selects that ticker's column block; rows where it had no trading are all-NaN
+                out[symbol] = frame_to_bars(hist[key].dropna(how="all"))
+        return out
+
+    def _missing_range(self, entry: dict | None, start: date, end: date) -> tuple[date, date] | None:
+        """Smallest range that brings `entry` up to covering [start, end), or None if already covered."""
+        if entry is None:
+            return start, end
+        covered_from, covered_until = entry["covered_from"][()].item(), entry["covered_until"][()].item()
+        lo = start if start < covered_from else None
+        hi = end if end > covered_until else None
+        if lo is None and hi is None:
+            return None
+        return (lo or covered_until), (hi or covered_from)
+
+    @staticmethod
+    def _with_overlap(entry: dict | None, start: date, end: date) -> tuple[date, date]:
+        """Widen a missing range to include the nearest stored bar, so readjusted() has one to compare."""
+        if entry is None or not len(entry["date"]):
+            return start, end
+        first, last = entry["date"][0].item(), entry["date"][-1].item()
+        return min(start, last), max(end, first + timedelta(days=1))
+
+    def _merge(self, symbol: str, entry: dict | None, bars: dict, start: date, end: date) -> dict | None:
+        """
+        Merge bars fetched for [start, end) into `entry` and persist it. Coverage
+        only grows over the dates that came back, and an empty fetch stores nothing.
+        Caller holds the symbol lock.
+        """
+        covered = coverage(bars, start, end)
+        if covered is None:
+            return entry
+        lo, hi = (np.datetime64(d, "D") for d in covered)
+        if entry is None:
+            entry = {**bars, "covered_from": lo, "covered_until": hi}
+        else:
+            covered_from, covered_until = entry["covered_from"][()], entry["covered_until"][()]
+            entry.update(merge_bars(entry, bars))
+            # Only join ranges that touch, so coverage never spans a gap
+            if lo <= covered_until and hi >= covered_from:
+                entry["covered_from"] = min(covered_from, lo)
+                entry["covered_until"] = max(covered_until, hi)
+        entry["fetched_at"] = np.float64(time.time())
+        self._save(symbol, entry)
+        return entry
+
+    def _discard(self, symbol: str) -> None:
+        self._path(symbol).unlink(missing_ok=True)
+
+    @staticmethod
+    def _slice(entry: dict | None, start: date, end: date) -> dict:
+        if entry is None:
+            return _empty_bars()
+        mask = (entry["date"] >= np.datetime64(start, "D")) & (entry["date"] < np.datetime64(end, "D"))
+        return {k: entry[k][mask] for k in ("date", *COLUMNS)}
+
+    # ---- Public API ----
+    def get_bars(self, symbol: str, start: date, end: date) -> dict:
+        """
+        Return bars with start <= date < end as numpy arrays keyed by
+        date/open/high/low/close/volume, fetching only the uncovered range.
+        """
+        with self._lock(symbol):
+            entry = self._load(symbol)
+            missing = self._missing_range(entry, start, end)
+            tracing.annotate(cache="miss" if missing else "hit")
+            if missing:
+                lo, hi = self._with_overlap(entry, *missing)
+                bars = self._fetch(symbol, lo, hi)
+                if entry is not None and readjusted(entry, bars):
+                    # A split or dividend re-based the history: replace the file
+                    self._discard(symbol)
+                    entry, (lo, hi) = None, (start, end)
+                    bars = self._fetch(symbol, lo, hi)
+                entry = self._merge(symbol, entry, bars, lo, hi)
+        return self._slice(entry, start, end)
+
+    def get_bars_many(self, symbols: list[str], start: date, end: date) -> dict:
+        """
+        get_bars for many symbols, downloading every symbol with a gap in one bulk
+        request spanning all their missing ranges.
+        Symbols the bulk download failed (or found readjusted) are retried one by one.
+        Returns {symbol: bars}, with an Exception for symbols whose download failed.
+        """
+        entries = {s: self._load(s) for s in dict.fromkeys(symbols)}
+        missing = {s: self._with_overlap(e, *r) for s, e in entries.items() if (r := self._missing_range(e, start, end))}
+
+        retry = []
+        if missing:
+            lo = min(r[0] for r in missing.values())
+            hi = max(r[1] for r in missing.values())
+            for symbol, bars in self._fetch_many(list(missing), lo, hi).items():
+                if isinstance(bars, Exception):
+                    retry.append(symbol)
+                    continue
+                with self._lock(symbol):
+                    entry = self._load(symbol)
+                    if entry is not None and readjusted(entry, bars):
+                        self._discard(symbol)
+                        retry.append(symbol)
+                        continue
+                    entries[symbol] = self._merge(symbol, entry, bars, lo, hi)
+
+        out = {s: self._slice(e, start, end) for s, e in entries.items() if s not in retry}
+        for symbol in retry:
+            try:
+                out[symbol] = self.get_bars(symbol, start, end)
+            except Exception as e:
+                out[symbol] = e
+        return out
+
+    def last_bar_date(self, symbol: str) -> date | None:
+        entry = self._load(symbol)
+        if entry is None or not len(entry["date"]):
+            return None
+        return entry["date"][-1].item()
+
+
+bar_store = BarStore()
+
+
+def window(days: int) -> tuple[date, date]:
+    """
+    [start, end) for the trailing `days` calendar days, ending the day after the
+    latest session whose bar is final. Weekends, holidays and the hours before
+    today's close settles then ask for nothing new, so they never reach yfinance.
+    """
+    if config.MARKET_AWARE_TTL:
+        end = market_calendar.last_completed_session() + timedelta(days=1)
+    else:
+        end = date.today()
+    return end - timedelta(days=days), end
@@ -0,0 +1,80 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator
+
+from app.services import config
+from app.services.equity_tool import get_stock_data_many
+from app.services.orchestrator import EQUITY_DAYS, STAGES, get_agent_workflow, resolve_nodes
+from app.services.sentiment_cache import cache_key
+from app.services.sentiment_tool import PROMPT_VERSION, analyze_sentiment
+from app.services.singleflight import normalize_symbol
+
+
+class SharedHeadlineClassifier:
+    """
+    Headline classifier shared by every symbol in a batch.
+    The first symbol to ask for a headline classifies it; any other symbol that
+    sees the same headline meanwhile waits for that result instead of paying
+    for another LLM call.
+    """
+
+    def __init__(self, model: str = "gpt-4o-mini"):
+        self.model = model
+        self._lock = threading.Lock()
+        self._results: dict[str, Future] = {}
+
+    def __call__(self, headlines: list[str]) -> list[dict]:
+        keys = [cache_key(h, self.model, PROMPT_VERSION) for h in headlines]
+        owned = {}
+        with self._lock:
+            for h, k in zip(headlines, keys):
+                if k not in self._results:
+                    self._results[k] = Future()
+                    owned[k] = h
+
+        # Classify what we own first, then wait on headlines owned by other symbols
+        if owned:
+            futures = [self._results[k] for k in owned]
+            try:
+                for fut, result in zip(futures, analyze_sentiment(list(owned.values()), model=self.model)):
+                    fut.set_result(result)
+            except Exception as e:
+                for fut in futures:
+                    fut.set_exception(e)
+
+        results = []
+        for h, k in zip(headlines, keys):
+            result = self._results[k].result()
+            results.append({"headline": h, **{f: v for f, v in result.items() if f != "headline"}})
+        return results
+
+
+def run_agent_batch(symbols: Iterable[str], stages: Iterable[str] = STAGES, max_workers: int | None = None) -> Iterator[dict]:
+    """
+    Run the agent workflow for many symbols on a bounded worker pool.
+    Yields {"symbol", "result"} (or {"symbol", "error"}) per symbol as soon as it
+    finishes, so a slow ticker doesn't hold up the others. Duplicate symbols are
+    run once, and identical headlines across symbols are classified once.
+    """
+    symbols = list(dict.fromkeys(normalize_symbol(s) for s in symbols if s.strip()))
+    stages = list(stages)
+    workflow = get_agent_workflow(stages)
+
+    # Warm the bar store with one bulk download so each fetch_equity is a local read
+    if "fetch_equity" in resolve_nodes(stages):
+        get_stock_data_many(symbols, days=EQUITY_DAYS)
+
+    run_config = {"configurable": {"classify_headlines": SharedHeadlineClassifier()}}
+
+    pool = ThreadPoolExecutor(max_workers=max_workers or config.BATCH_MAX_WORKERS)
+    try:
+        futures = {pool.submit(workflow.invoke, {"symbol": s}, run_config): s for s in symbols}
+        for fut in as_completed(futures):
+            symbol = futures[fut]
+            try:
+                yield {"symbol": symbol, "result": fut.result()}
+            except Exception as e:
+                yield {"symbol": symbol, "error": str(e)}
+    finally:
+        # Client went away or we're done: don't start symbols nobody will read
+        pool.shutdown(wait=False, cancel_futures=True)
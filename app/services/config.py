@@ -6,14 +6,127 @@ from pathlib import Path
 env_path = Path(__file__).resolve().parents[2] / ".env"
 load_dotenv(dotenv_path=env_path)
 
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes", "on")
+
+
 # ----- Basic Config -----
 SECRET_KEY = os.getenv("SECRET_KEY", "changeme")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 
+# ----- Local Storage -----
+# Caches and stores live here (SQLite files etc.)
+DATA_DIR = Path(os.getenv("DATA_DIR", Path(__file__).resolve().parents[2] / "data"))
+
 # ----- External API Keys -----
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 EQUITY_API_KEY = os.getenv("EQUITY_API_KEY")
 
+# ----- Metrics -----
+# /metrics (Prometheus text format). Off = instrumentation hooks are no-ops.
+METRICS_ENABLED = _env_bool("METRICS_ENABLED", True)
+
+# ----- Tracing -----
+# Finished request traces go to: none, jsonl (TRACE_JSONL_PATH, default
+# DATA_DIR/traces.jsonl) or otlp (OTLP/HTTP JSON, e.g. an OpenTelemetry Collector).
+# With TRACE_DEBUG_HEADER on, a request sending X-Debug-Trace is traced whatever
+# the exporter and gets its span waterfall back in the JSON body. Off by default:
+# anyone can send the header, and the waterfall exposes upstream timings, models
+# and token counts.
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "none").strip().lower()
+TRACE_JSONL_PATH = os.getenv("TRACE_JSONL_PATH")
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "ai-agent")
+TRACE_DEBUG_HEADER = _env_bool("TRACE_DEBUG_HEADER", False)
+
+# ----- Rate Limits -----
+# Token buckets per client (user, else IP) shared by all workers via SQLite:
+# REQUESTS per WINDOW seconds, with bursts up to REQUESTS. Every route uses the
+# default budget; LLM-backed routes (sentiment, decision, agent) also the llm one.
+RATE_LIMIT_ENABLED = _env_bool("RATE_LIMIT_ENABLED", True)
+RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", 120))
+RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", 60))
+RATE_LIMIT_LLM_REQUESTS = int(os.getenv("RATE_LIMIT_LLM_REQUESTS", 20))
+RATE_LIMIT_LLM_WINDOW = int(os.getenv("RATE_LIMIT_LLM_WINDOW", 60))
+
+# ----- Market Calendar -----
+# Cache lifetimes follow the NYSE session (services/market_calendar.py): each cache's
+# own TTL while the market is open and for MARKET_CLOSE_SETTLE seconds after the
+# close, otherwise entries stay valid until the next open. Off = fixed TTLs.
+MARKET_AWARE_TTL = _env_bool("MARKET_AWARE_TTL", True)
+MARKET_CLOSE_SETTLE = int(os.getenv("MARKET_CLOSE_SETTLE", 900))
+
+# ----- News -----
+# NewsAPI client: timeouts (s), retries on network errors/5xx, pooled connections
+NEWS_CONNECT_TIMEOUT = float(os.getenv("NEWS_CONNECT_TIMEOUT", 3.05))
+NEWS_READ_TIMEOUT = float(os.getenv("NEWS_READ_TIMEOUT", 10))
+NEWS_MAX_RETRIES = int(os.getenv("NEWS_MAX_RETRIES", 2))
+NEWS_RETRY_BACKOFF = float(os.getenv("NEWS_RETRY_BACKOFF", 0.5))
+NEWS_POOL_SIZE = int(os.getenv("NEWS_POOL_SIZE", 10))
+
+# Per-(symbol, limit) response cache (in-session TTL), and how long to stop calling after a 429
+# when NewsAPI sends no Retry-After (seconds)
+NEWS_CACHE_TTL = int(os.getenv("NEWS_CACHE_TTL", 300))
+# Least recently used entries beyond this are dropped (expired ones still serve as stale fallback)
+NEWS_CACHE_MAX_ENTRIES = int(os.getenv("NEWS_CACHE_MAX_ENTRIES", 1000))
+NEWS_QUOTA_BACKOFF = int(os.getenv("NEWS_QUOTA_BACKOFF", 900))
+
+# Local per-symbol article store (incremental `from=` fetches) and its retention
+NEWS_STORE_ENABLED = _env_bool("NEWS_STORE_ENABLED", True)
+NEWS_STORE_MAX_PER_SYMBOL = int(os.getenv("NEWS_STORE_MAX_PER_SYMBOL", 500))
+
+# ----- LLM -----
+# Max concurrent completion requests per worker
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
+
+# ----- Sentiment -----
+# Headlines classified per LLM call (1 = one call per headline)
+SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", 20))
+
+# Headline label cache (seconds / entries)
+SENTIMENT_CACHE_ENABLED = _env_bool("SENTIMENT_CACHE_ENABLED", True)
+SENTIMENT_CACHE_TTL = int(os.getenv("SENTIMENT_CACHE_TTL", 7 * 24 * 3600))
+SENTIMENT_CACHE_MAX_ENTRIES = int(os.getenv("SENTIMENT_CACHE_MAX_ENTRIES", 50_000))
+
+# ----- Decision -----
+# Decisions for an identical prompt (same sentiment + indicators) are reused (in-session TTL)
+DECISION_CACHE_TTL = int(os.getenv("DECISION_CACHE_TTL", 300))
+# Least recently used decisions beyond this are dropped
+DECISION_CACHE_MAX_ENTRIES = int(os.getenv("DECISION_CACHE_MAX_ENTRIES", 1000))
+
+# ----- Response Cache -----
+# Encoded /agent and /decision bodies: fresh for TTL (in session; off hours until
+# the next open), then served for STALE more seconds while refreshing in the background
+RESPONSE_CACHE_ENABLED = _env_bool("RESPONSE_CACHE_ENABLED", True)
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 60))
+RESPONSE_CACHE_STALE = int(os.getenv("RESPONSE_CACHE_STALE", 900))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 1000))
+
+# ----- Startup -----
+# Warm-up before /ready reports ready: imports, graph compilation, HTTP/LLM pools,
+# and prefetching the watchlist
+WARMUP_ON_STARTUP = _env_bool("WARMUP_ON_STARTUP", True)
+
+# ----- Watchlist -----
+# Comma-separated symbols added to the watchlist on its first start (then managed via /watchlist)
+WATCHLIST = [s.strip().upper() for s in os.getenv("WATCHLIST", "").split(",") if s.strip()]
+
+# Background refresh: every INTERVAL + up to JITTER seconds per symbol, at most
+# MAX_CONCURRENCY symbols at once. /agent serves snapshots up to MAX_AGE seconds old.
+# INTERVAL and MAX_AGE apply in session; off hours both stretch to the next open.
+WATCHLIST_ENABLED = _env_bool("WATCHLIST_ENABLED", True)
+WATCHLIST_REFRESH_INTERVAL = int(os.getenv("WATCHLIST_REFRESH_INTERVAL", 300))
+WATCHLIST_REFRESH_JITTER = int(os.getenv("WATCHLIST_REFRESH_JITTER", 30))
+WATCHLIST_MAX_CONCURRENCY = int(os.getenv("WATCHLIST_MAX_CONCURRENCY", 4))
+WATCHLIST_MAX_AGE = int(os.getenv("WATCHLIST_MAX_AGE", 2 * WATCHLIST_REFRESH_INTERVAL))
+WATCHLIST_MAX_SYMBOLS = int(os.getenv("WATCHLIST_MAX_SYMBOLS", 200))
+
+# ----- Batch -----
+# Symbols analyzed concurrently by /agent/batch, and max symbols per request
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", 8))
+BATCH_MAX_SYMBOLS = int(os.getenv("BATCH_MAX_SYMBOLS", 100))
+
 # Simple validator
 def check_keys():
     missing = []
@@ -0,0 +1,29 @@
+import sqlite3
+import threading
+from app.services import config
+
+# One connection per (thread, database file); sqlite3 connections are not shared across threads
+_local = threading.local()
+
+
+def connect(name: str, schema: str = "") -> sqlite3.Connection:
+    """
+    Return this thread's connection to DATA_DIR/<name>.db.
+    Connections run in autocommit mode with WAL journaling, so readers never
+    block the writer and several workers can share one file.
+    `schema` (CREATE ... IF NOT EXISTS statements) runs when a connection is opened.
+    """
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+
+    conn = conns.get(name)
+    if conn is None:
+        config.DATA_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(config.DATA_DIR / f"{name}.db", timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if schema:
+            conn.executescript(schema)
+        conns[name] = conn
+    return conn
@@ -1,12 +1,55 @@
+import copy
+import hashlib
 import json
-from app.services.llm_clients import analyze_with_openai
+import threading
+import time
+from collections import OrderedDict
+from app.services import config, market_calendar, metrics, tracing
+from app.services.llm_clients import analyze_with_openai, analyze_with_openai_async
+
+# ---- Decision cache ----
+# The prompt holds every input (sentiment + indicators), so an identical prompt
+# gets the same answer until new data can exist: DECISION_CACHE_TTL in session,
+# the next market open off hours. sha256(model, prompt) -> (expires_at, result),
+# least recently used first (at most DECISION_CACHE_MAX_ENTRIES)
+_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_key(prompt: str, model: str) -> str:
+    return hashlib.sha256(f"{model}\x1f{prompt}".encode("utf-8")).hexdigest()
+
+
+def _cached(key: str) -> dict | None:
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit:
+            _cache.move_to_end(key)
+    if hit and time.monotonic() < hit[0]:
+        metrics.cache_result("decision", "hit")
+        tracing.annotate(cache="hit")
+        return copy.deepcopy(hit[1])
+    metrics.cache_result("decision", "miss")
+    tracing.annotate(cache="miss")
+    return None
+
+
+def _remember(key: str, result: dict) -> None:
+    if "error" in result:
+        return
+    now = time.monotonic()
+    expires_at = now + market_calendar.cache_ttl(config.DECISION_CACHE_TTL)
+    with _cache_lock:
+        for k in [k for k, (exp, _) in _cache.items() if exp <= now]:
+            del _cache[k]
+        # A copy: callers get `result` itself and may change it
+        _cache[key] = (expires_at, copy.deepcopy(result))
+        _cache.move_to_end(key)
+        while len(_cache) > config.DECISION_CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
 
-def hybrid_decision(symbol: str, sentiment: dict, indicators: dict, model: str = "gpt-4o-mini") -> dict:
-    """
-    Combine sentiment + indicators into Buy/Sell/Hold decision.
-    Returns t+1 and t+5 signals with confidence and explanation.
-    """
 
+def _decision_prompt(symbol: str, sentiment: dict, indicators: dict) -> str:
     # ---- Rule-based nudges ----
     rsi = indicators.get("RSI", 50)
     ema = indicators.get("EMA", 0)
@@ -43,16 +86,49 @@ def hybrid_decision(symbol: str, sentiment: dict, indicators: dict, model: str =
       "t+5": {{"signal": "Buy/Sell/Hold", "confidence": 0.65, "explanation": "..."}}
     }}
     """
+    return prompt
 
-    try:
-        response = analyze_with_openai(prompt, model=model)
-        result = json.loads(response)
-    except Exception as e:
-        result = {"error": str(e)}
 
+def _decision_result(symbol: str, sentiment: dict, indicators: dict, result: dict) -> dict:
     return {
         "symbol": symbol,
         "sentiment": sentiment,
         "indicators": indicators,
         "decision": result
     }
+
+
+def hybrid_decision(symbol: str, sentiment: dict, indicators: dict, model: str = "gpt-4o-mini") -> dict:
+    """
+    Combine sentiment + indicators into Buy/Sell/Hold decision.
+    Returns t+1 and t+5 signals with confidence and explanation.
+    Successful answers are reused for identical inputs (see the decision cache).
+    """
+    prompt = _decision_prompt(symbol, sentiment, indicators)
+    key = _cache_key(prompt, model)
+    result = _cached(key)
+    if result is None:
+        try:
+            response = analyze_with_openai(prompt, model=model)
+            result = json.loads(response)
+        except Exception as e:
+            result = {"error": str(e)}
+        _remember(key, result)
+
+    return _decision_result(symbol, sentiment, indicators, result)
+
+
+async def hybrid_decision_async(symbol: str, sentiment: dict, indicators: dict, model: str = "gpt-4o-mini") -> dict:
+    """Async version of hybrid_decision."""
+    prompt = _decision_prompt(symbol, sentiment, indicators)
+    key = _cache_key(prompt, model)
+    result = _cached(key)
+    if result is None:
+        try:
+            response = await analyze_with_openai_async(prompt, model=model)
+            result = json.loads(response)
+        except Exception as e:
+            result = {"error": str(e)}
+        _remember(key, result)
+
+    return _decision_result(symbol, sentiment, indicators, result)
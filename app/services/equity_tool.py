@@ -1,34 +1,92 @@
-import yfinance as yf
-from datetime import datetime, timedelta
+import asyncio
+import numpy as np
+from app.services import tracing
+from app.services.bar_store import COLUMNS, bar_store, window
 
+def bars_to_records(bars: dict) -> list[dict]:
+    """Turn columnar bars into the list-of-dicts payload (no per-row pandas access)."""
+    dates = np.datetime_as_string(bars["date"], unit="D").tolist()
+    return [
+        {"date": d, "open": o, "high": h, "low": l, "close": c, "volume": v}
+        for d, o, h, l, c, v in zip(
+            dates,
+            bars["open"].tolist(),
+            bars["high"].tolist(),
+            bars["low"].tolist(),
+            bars["close"].tolist(),
+            bars["volume"].tolist(),
+        )
+    ]
+
+def bars_to_columns(bars: dict) -> dict:
+    """Parallel arrays per field; dates as epoch seconds (UTC midnight)."""
+    columns = {"date": bars["date"].astype("datetime64[s]").astype(np.int64).tolist()}
+    for col in COLUMNS:
+        columns[col] = bars[col].tolist()
+    return columns
+
+def _payload(symbol: str, bars: dict) -> dict:
+    tracing.annotate(bars=len(bars["date"]))
+    if not len(bars["date"]):
+        return {"symbol": symbol, "data": [], "error": "No data found"}
+    return {"symbol": symbol, "data": bars_to_records(bars)}
+
+def get_stock_bars(symbol: str, days: int = 30) -> dict:
+    """Raw columnar bars (numpy arrays) for the past `days`; raises on upstream errors."""
+    start, end = window(days)
+    return bar_store.get_bars(symbol, start, end)
+
+def _span_attributes(symbol: str, days: int = 30) -> dict:
+    return {"symbol": symbol, "days": days}
+
+@tracing.traced("equity.stock_data", _span_attributes)
 def get_stock_data(symbol: str, days: int = 30) -> dict:
     """
     Fetch OHLCV (Open, High, Low, Close, Volume) for the past `days`.
+    Bars come from the local bar store; only missing dates hit yfinance.
     Returns dict with symbol and data list.
     """
     try:
-        end = datetime.today()
-        start = end - timedelta(days=days)
+        return _payload(symbol, get_stock_bars(symbol, days))
 
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(start=start.strftime("%Y-%m-%d"), end=end.strftime("%Y-%m-%d"))
+    except Exception as e:
+        return {"symbol": symbol, "error": str(e)}
+
+async def get_stock_data_async(symbol: str, days: int = 30) -> dict:
+    """
+    Async version of get_stock_data. yfinance and the bar store's file I/O are
+    blocking, so the call runs on a worker thread.
+    """
+    return await asyncio.to_thread(get_stock_data, symbol, days)
 
-        if hist.empty:
-            return {"symbol": symbol, "data": [], "error": "No data found"}
+def get_stock_data_many(symbols: list[str], days: int = 30) -> dict[str, dict]:
+    """
+    get_stock_data for many symbols with a single bulk yfinance download for
+    whatever the local store is missing.
+    Returns {symbol: payload}; a failing symbol gets its own error payload.
+    """
+    try:
+        start, end = window(days)
+        bars_by_symbol = bar_store.get_bars_many(symbols, start, end)
+    except Exception as e:
+        return {s: {"symbol": s, "error": str(e)} for s in symbols}
 
-        # Clean and convert to JSON
-        data = []
-        for date, row in hist.iterrows():
-            data.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "open": float(row["Open"]),
-                "high": float(row["High"]),
-                "low": float(row["Low"]),
-                "close": float(row["Close"]),
-                "volume": int(row["Volume"])
-            })
+    return {
+        s: {"symbol": s, "error": str(bars)} if isinstance(bars, Exception) else _payload(s, bars)
+        for s, bars in bars_by_symbol.items()
+    }
 
-        return {"symbol": symbol, "data": data}
+def get_stock_columns(symbol: str, days: int = 30) -> dict:
+    """
+    Columnar variant of get_stock_data: {"symbol", "format": "columnar", "columns": {...}}
+    where columns holds parallel date/open/high/low/close/volume arrays.
+    """
+    try:
+        bars = get_stock_bars(symbol, days)
+        payload = {"symbol": symbol, "format": "columnar", "columns": bars_to_columns(bars)}
+        if not len(bars["date"]):
+            payload["error"] = "No data found"
+        return payload
 
     except Exception as e:
-        return {"symbol": symbol, "error": str(e)}
+        return {"symbol": symbol, "format": "columnar", "error": str(e)}
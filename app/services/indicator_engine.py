@@ -0,0 +1,422 @@
+"""
+Incremental (streaming) versions of the indicators in indicators.compute_indicators.
+
+Each indicator keeps a small state object that is updated in O(1) per new bar and can be
+serialized with to_dict()/from_dict(), so the latest values can be maintained bar by bar
+instead of recomputing pandas_ta over the whole history.
+
+Recurrences follow pandas_ta's definitions:
+- EMA: seeded with the SMA of the first `length` values, then alpha = 2 / (length + 1)
+- RSI / ATR: Wilder smoothing (alpha = 1 / length) in the weighted form of
+  pandas' ewm(adjust=True), which is what pandas_ta.rma computes
+- SMA / Bollinger / Volatility: fixed-size rolling windows with running sums
+- VWAP: cumulative typical price x volume, anchored to each calendar day
+"""
+import math
+from collections import deque
+
+
+def _finite(x) -> bool:
+    return x is not None and not (isinstance(x, float) and math.isnan(x))
+
+
+# ---- Primitive states ----
+class EMAState:
+    """Exponential moving average seeded with the SMA of the first `length` values."""
+
+    def __init__(self, length: int):
+        self.length = length
+        self.alpha = 2.0 / (length + 1)
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value = None
+
+    def update(self, x: float):
+        self.count += 1
+        if self.count < self.length:
+            self.seed_sum += x
+        elif self.count == self.length:
+            self.value = (self.seed_sum + x) / self.length
+        else:
+            self.value = self.alpha * x + (1 - self.alpha) * self.value
+        return self.value
+
+    def to_dict(self) -> dict:
+        return {"length": self.length, "count": self.count, "seed_sum": self.seed_sum, "value": self.value}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "EMAState":
+        s = cls(d["length"])
+        s.count, s.seed_sum, s.value = d["count"], d["seed_sum"], d["value"]
+        return s
+
+
+class RMAState:
+    """
+    Wilder's moving average (alpha = 1 / length).
+    Keeps the weighted numerator/denominator of ewm(adjust=True) so every step is O(1).
+    """
+
+    def __init__(self, length: int):
+        self.length = length
+        self.decay = 1.0 - 1.0 / length
+        self.count = 0
+        self.num = 0.0
+        self.den = 0.0
+
+    def update(self, x: float):
+        self.count += 1
+        self.num = x + self.decay * self.num
+        self.den = 1.0 + self.decay * self.den
+        return self.value
+
+    @property
+    def value(self):
+        return self.num / self.den if self.count >= self.length else None
+
+    def to_dict(self) -> dict:
+        return {"length": self.length, "count": self.count, "num": self.num, "den": self.den}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RMAState":
+        s = cls(d["length"])
+        s.count, s.num, s.den = d["count"], d["num"], d["den"]
+        return s
+
+
+class RollingState:
+    """Fixed-size window with running sum / sum of squares (mean and std in O(1))."""
+
+    def __init__(self, length: int, ddof: int = 1):
+        self.length = length
+        self.ddof = ddof
+        self.window = deque(maxlen=length)
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def update(self, x: float):
+        if len(self.window) == self.length:
+            old = self.window[0]
+            self.total -= old
+            self.total_sq -= old * old
+        self.window.append(x)
+        self.total += x
+        self.total_sq += x * x
+
+    @property
+    def ready(self) -> bool:
+        return len(self.window) == self.length
+
+    @property
+    def mean(self):
+        return self.total / self.length if self.ready else None
+
+    @property
+    def std(self):
+        if not self.ready:
+            return None
+        var = (self.total_sq - self.total * self.total / self.length) / (self.length - self.ddof)
+        return math.sqrt(max(var, 0.0))
+
+    def to_dict(self) -> dict:
+        return {"length": self.length, "ddof": self.ddof, "window": list(self.window)}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RollingState":
+        s = cls(d["length"], d["ddof"])
+        for x in d["window"]:
+            s.update(x)
+        return s
+
+
+# ---- Indicator states ----
+class RSIState:
+    def __init__(self, length: int = 14):
+        self.prev_close = None
+        self.gain = RMAState(length)
+        self.loss = RMAState(length)
+
+    def update(self, bar: dict):
+        close = bar["close"]
+        if self.prev_close is not None:
+            change = close - self.prev_close
+            self.gain.update(max(change, 0.0))
+            self.loss.update(max(-change, 0.0))
+        self.prev_close = close
+
+    @property
+    def value(self):
+        gain, loss = self.gain.value, self.loss.value
+        if gain is None or loss is None or gain + loss == 0:
+            return None
+        return 100.0 * gain / (gain + loss)
+
+    def to_dict(self) -> dict:
+        return {"prev_close": self.prev_close, "gain": self.gain.to_dict(), "loss": self.loss.to_dict()}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RSIState":
+        s = cls()
+        s.prev_close = d["prev_close"]
+        s.gain, s.loss = RMAState.from_dict(d["gain"]), RMAState.from_dict(d["loss"])
+        return s
+
+
+class EMAIndicator:
+    def __init__(self, length: int = 20):
+        self.ema = EMAState(length)
+
+    def update(self, bar: dict):
+        self.ema.update(bar["close"])
+
+    @property
+    def value(self):
+        return self.ema.value
+
+    def to_dict(self) -> dict:
+        return {"ema": self.ema.to_dict()}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "EMAIndicator":
+        s = cls()
+        s.ema = EMAState.from_dict(d["ema"])
+        return s
+
+
+class SMAIndicator:
+    def __init__(self, length: int = 20):
+        self.window = RollingState(length)
+
+    def update(self, bar: dict):
+        self.window.update(bar["close"])
+
+    @property
+    def value(self):
+        return self.window.mean
+
+    def to_dict(self) -> dict:
+        return {"window": self.window.to_dict()}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "SMAIndicator":
+        s = cls()
+        s.window = RollingState.from_dict(d["window"])
+        return s
+
+
+class VolatilityState:
+    """Rolling std (ddof=1) of close-to-close returns, in percent."""
+
+    def __init__(self, length: int = 10):
+        self.prev_close = None
+        self.returns = RollingState(length, ddof=1)
+
+    def update(self, bar: dict):
+        close = bar["close"]
+        if self.prev_close is not None:
+            self.returns.update(close / self.prev_close - 1.0)
+        self.prev_close = close
+
+    @property
+    def value(self):
+        std = self.returns.std
+        return None if std is None else std * 100
+
+    def to_dict(self) -> dict:
+        return {"prev_close": self.prev_close, "returns": self.returns.to_dict()}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "VolatilityState":
+        s = cls()
+        s.prev_close = d["prev_close"]
+        s.returns = RollingState.from_dict(d["returns"])
+        return s
+
+
+class MACDState:
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EMAState(fast)
+        self.slow = EMAState(slow)
+        self.signal = EMAState(signal)
+        self.macd = None
+
+    def update(self, bar: dict):
+        fast = self.fast.update(bar["close"])
+        slow = self.slow.update(bar["close"])
+        if fast is not None and slow is not None:
+            self.macd = fast - slow
+            self.signal.update(self.macd)
+
+    @property
+    def value(self):
+        return self.macd
+
+    def to_dict(self) -> dict:
+        return {"fast": self.fast.to_dict(), "slow": self.slow.to_dict(), "signal": self.signal.to_dict(), "macd": self.macd}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "MACDState":
+        s = cls()
+        s.fast, s.slow, s.signal = (EMAState.from_dict(d[k]) for k in ("fast", "slow", "signal"))
+        s.macd = d["macd"]
+        return s
+
+
+class ATRState:
+    def __init__(self, length: int = 14):
+        self.prev_close = None
+        self.rma = RMAState(length)
+
+    def update(self, bar: dict):
+        high, low = bar["high"], bar["low"]
+        if self.prev_close is not None:
+            pc = self.prev_close
+            self.rma.update(max(high - low, abs(high - pc), abs(low - pc)))
+        self.prev_close = bar["close"]
+
+    @property
+    def value(self):
+        return self.rma.value
+
+    def to_dict(self) -> dict:
+        return {"prev_close": self.prev_close, "rma": self.rma.to_dict()}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "ATRState":
+        s = cls()
+        s.prev_close = d["prev_close"]
+        s.rma = RMAState.from_dict(d["rma"])
+        return s
+
+
+class BollingerState:
+    def __init__(self, length: int = 20, std: float = 2.0, ddof: int = 0):
+        self.mult = std
+        self.window = RollingState(length, ddof=ddof)
+
+    def update(self, bar: dict):
+        self.window.update(bar["close"])
+
+    @property
+    def upper(self):
+        return None if not self.window.ready else self.window.mean + self.mult * self.window.std
+
+    @property
+    def lower(self):
+        return None if not self.window.ready else self.window.mean - self.mult * self.window.std
+
+    def to_dict(self) -> dict:
+        return {"mult": self.mult, "window": self.window.to_dict()}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "BollingerState":
+        s = cls(std=d["mult"])
+        s.window = RollingState.from_dict(d["window"])
+        return s
+
+
+class VWAPState:
+    """Volume-weighted average of the typical price, reset at each new calendar day."""
+
+    def __init__(self):
+        self.anchor = None
+        self.pv = 0.0
+        self.volume = 0.0
+
+    def update(self, bar: dict):
+        day = str(bar["date"])[:10]
+        if day != self.anchor:
+            self.anchor, self.pv, self.volume = day, 0.0, 0.0
+        typical = (bar["high"] + bar["low"] + bar["close"]) / 3
+        self.pv += typical * bar["volume"]
+        self.volume += bar["volume"]
+
+    @property
+    def value(self):
+        return self.pv / self.volume if self.volume else None
+
+    def to_dict(self) -> dict:
+        return {"anchor": self.anchor, "pv": self.pv, "volume": self.volume}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "VWAPState":
+        s = cls()
+        s.anchor, s.pv, s.volume = d["anchor"], d["pv"], d["volume"]
+        return s
+
+
+# ---- Engine ----
+STATE_TYPES = {
+    "RSI": RSIState,
+    "EMA": EMAIndicator,
+    "SMA": SMAIndicator,
+    "Volatility": VolatilityState,
+    "MACD": MACDState,
+    "ATR": ATRState,
+    "Bollinger": BollingerState,
+    "VWAP": VWAPState,
+}
+
+
+def _round(x):
+    return None if x is None else round(x, 2)
+
+
+class IndicatorEngine:
+    """
+    Holds one state object per indicator; update() folds in one OHLCV bar in O(1).
+    Bars must arrive in date order; rows with missing prices/volume are skipped,
+    matching compute_indicators' dropna.
+    """
+
+    def __init__(self):
+        self.states = {name: cls() for name, cls in STATE_TYPES.items()}
+        self.last_date = None
+        self.bars = 0
+
+    def update(self, bar: dict) -> None:
+        if not all(_finite(bar.get(k)) for k in ("close", "high", "low", "volume")):
+            return
+        date = str(bar["date"])
+        if self.last_date is not None and date <= self.last_date:
+            raise ValueError(f"Bar {date} is not after the last bar {self.last_date}")
+        for state in self.states.values():
+            state.update(bar)
+        self.last_date = date
+        self.bars += 1
+
+    def extend(self, bars: list[dict]) -> None:
+        for bar in bars:
+            self.update(bar)
+
+    def values(self, advanced: bool = False) -> dict:
+        """Latest values, keyed and rounded like compute_indicators()["indicators"]."""
+        s = self.states
+        indicators = {
+            "RSI": _round(s["RSI"].value),
+            "EMA": _round(s["EMA"].value),
+            "SMA": _round(s["SMA"].value),
+            "Volatility": _round(s["Volatility"].value),
+        }
+        if advanced:
+            indicators["MACD"] = _round(s["MACD"].value)
+            indicators["MACD_signal"] = _round(s["MACD"].signal.value)
+            indicators["ATR"] = _round(s["ATR"].value)
+            indicators["VWAP"] = _round(s["VWAP"].value)
+            indicators["Bollinger_Upper"] = _round(s["Bollinger"].upper)
+            indicators["Bollinger_Lower"] = _round(s["Bollinger"].lower)
+        return indicators
+
+    def to_dict(self) -> dict:
+        return {
+            "last_date": self.last_date,
+            "bars": self.bars,
+            "states": {name: state.to_dict() for name, state in self.states.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "IndicatorEngine":
+        engine = cls()
+        engine.last_date, engine.bars = d["last_date"], d["bars"]
+        engine.states = {name: STATE_TYPES[name].from_dict(state) for name, state in d["states"].items()}
+        return engine
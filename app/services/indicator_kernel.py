@@ -0,0 +1,154 @@
+"""
+Vectorized multi-symbol indicator kernel.
+
+Takes 2-D (symbols x bars) close/high/low/volume arrays and computes the latest value of
+every indicator compute_indicators supports for all symbols in one pass. Recursive
+indicators (EMA, MACD, RSI, ATR) step through the bar axis once with every symbol
+updated together; window indicators only read the trailing columns.
+
+Ragged histories are handled with a validity mask: each row's valid bars are shifted
+to the right edge (keeping their order), so every row ends at the last column and
+shorter histories are simply NaN-padded on the left.
+"""
+import numpy as np
+
+
+# ---- Recurrence helpers (one value per symbol) ----
+class _EMA:
+    """SMA-seeded EMA, same recurrence as indicator_engine.EMAState."""
+
+    def __init__(self, symbols: int, length: int):
+        self.length = length
+        self.alpha = 2.0 / (length + 1)
+        self.count = np.zeros(symbols, dtype=np.int64)
+        self.seed_sum = np.zeros(symbols)
+        self.value = np.full(symbols, np.nan)
+
+    def update(self, x: np.ndarray, valid: np.ndarray) -> None:
+        self.count += valid
+        seeding = valid & (self.count < self.length)
+        self.seed_sum[seeding] += x[seeding]
+        seeded = valid & (self.count == self.length)
+        self.value[seeded] = (self.seed_sum[seeded] + x[seeded]) / self.length
+        step = valid & (self.count > self.length)
+        self.value[step] = self.alpha * x[step] + (1 - self.alpha) * self.value[step]
+
+
+class _RMA:
+    """Wilder smoothing in ewm(adjust=True) form, same as indicator_engine.RMAState."""
+
+    def __init__(self, symbols: int, length: int):
+        self.length = length
+        self.decay = 1.0 - 1.0 / length
+        self.count = np.zeros(symbols, dtype=np.int64)
+        self.num = np.zeros(symbols)
+        self.den = np.zeros(symbols)
+
+    def update(self, x: np.ndarray, valid: np.ndarray) -> None:
+        self.count += valid
+        self.num[valid] = x[valid] + self.decay * self.num[valid]
+        self.den[valid] = 1.0 + self.decay * self.den[valid]
+
+    @property
+    def value(self) -> np.ndarray:
+        out = np.full(self.num.shape, np.nan)
+        ready = self.count >= self.length
+        out[ready] = self.num[ready] / self.den[ready]
+        return out
+
+
+# ---- Layout ----
+def right_align(mask: np.ndarray, *arrays: np.ndarray) -> tuple[np.ndarray, ...]:
+    """
+    Move each row's valid entries to the right edge, preserving their order.
+    Returns (aligned_mask, *aligned_arrays) with invalid slots set to NaN.
+    """
+    order = np.argsort(mask, axis=1, kind="stable")
+    aligned_mask = np.take_along_axis(mask, order, axis=1)
+    aligned = []
+    for arr in arrays:
+        out = np.take_along_axis(np.asarray(arr, dtype=np.float64), order, axis=1)
+        out[~aligned_mask] = np.nan
+        aligned.append(out)
+    return (aligned_mask, *aligned)
+
+
+def _tail_window(x: np.ndarray, length: int) -> np.ndarray:
+    """Last `length` columns (NaN rows where the history is shorter)."""
+    if x.shape[1] < length:
+        return np.full((x.shape[0], length), np.nan)
+    return x[:, -length:]
+
+
+# ---- Kernel ----
+def compute_indicators_batch(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    volume: np.ndarray,
+    mask: np.ndarray | None = None,
+    advanced: bool = False,
+) -> dict[str, np.ndarray]:
+    """
+    Latest indicator values for every row of the (symbols x bars) inputs.
+    `mask` marks valid bars (default: all four inputs finite); each row's valid bars
+    must be in date order. Bars are assumed daily, so VWAP (anchored per day)
+    is the last bar's typical price. Returns {name: array of shape (symbols,)}
+    with NaN where a history is too short.
+    """
+    close, high, low, volume = (np.atleast_2d(np.asarray(a, dtype=np.float64)) for a in (close, high, low, volume))
+    if mask is None:
+        mask = np.isfinite(close) & np.isfinite(high) & np.isfinite(low) & np.isfinite(volume)
+    mask, close, high, low, volume = right_align(np.asarray(mask, dtype=bool), close, high, low, volume)
+    symbols, bars = close.shape
+
+    # ---- Window indicators: only the trailing columns matter ----
+    last20 = _tail_window(close, 20)
+    sma = last20.mean(axis=1)
+    returns = close[:, 1:] / close[:, :-1] - 1.0
+    volatility = _tail_window(returns, 10).std(axis=1, ddof=1) * 100
+
+    # ---- Recursive indicators: one pass over the bar axis ----
+    ema20 = _EMA(symbols, 20)
+    gain, loss = _RMA(symbols, 14), _RMA(symbols, 14)
+    if advanced:
+        fast, slow, signal = _EMA(symbols, 12), _EMA(symbols, 26), _EMA(symbols, 9)
+        atr = _RMA(symbols, 14)
+
+    for t in range(bars):
+        valid = mask[:, t]
+        x = close[:, t]
+        ema20.update(x, valid)
+        if advanced:
+            fast.update(x, valid)
+            slow.update(x, valid)
+            # The signal line starts once MACD itself exists
+            signal.update(fast.value - slow.value, valid & np.isfinite(slow.value))
+
+        if t == 0:
+            continue
+        # Diffs / true range exist only where this bar and the previous one are both valid
+        paired = valid & mask[:, t - 1]
+        prev = close[:, t - 1]
+        change = np.where(paired, x - prev, 0.0)
+        gain.update(np.maximum(change, 0.0), paired)
+        loss.update(np.maximum(-change, 0.0), paired)
+        if advanced:
+            tr = np.maximum.reduce([high[:, t] - low[:, t], np.abs(high[:, t] - prev), np.abs(low[:, t] - prev)])
+            atr.update(np.where(paired, tr, 0.0), paired)
+
+    g, l = gain.value, loss.value
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rsi = 100.0 * g / (g + l)
+
+    out = {"RSI": rsi, "EMA": ema20.value, "SMA": sma, "Volatility": volatility}
+    if advanced:
+        std20 = last20.std(axis=1, ddof=0)
+        out["MACD"] = fast.value - slow.value
+        out["MACD_signal"] = signal.value
+        out["ATR"] = atr.value
+        out["VWAP"] = np.where(volume[:, -1] > 0, (high[:, -1] + low[:, -1] + close[:, -1]) / 3, np.nan)
+        out["Bollinger_Upper"] = sma + 2.0 * std20
+        out["Bollinger_Lower"] = sma - 2.0 * std20
+
+    return out
@@ -1,6 +1,12 @@
+import asyncio
+import numpy as np
 import pandas as pd
 import pandas_ta as ta
+from app.services import metrics
+from app.services.indicator_kernel import compute_indicators_batch
+from app.services.indicator_engine import IndicatorEngine
 
+@metrics.timed_upstream("pandas_ta")
 def compute_indicators(stock_data: dict, advanced: bool = False) -> dict:
     """
     Compute technical indicators from OHLCV stock data.
@@ -56,3 +62,53 @@ def compute_indicators(stock_data: dict, advanced: bool = False) -> dict:
             indicators["Bollinger_Lower"] = round(lower.iloc[-1], 2)
 
     return {"symbol": stock_data["symbol"], "indicators": indicators}
+
+
+async def compute_indicators_async(stock_data: dict, advanced: bool = False) -> dict:
+    """compute_indicators on a worker thread, so the pandas work doesn't block the event loop."""
+    return await asyncio.to_thread(compute_indicators, stock_data, advanced)
+
+
+def compute_indicators_streaming(stock_data: dict, advanced: bool = False, engine: IndicatorEngine | None = None) -> dict:
+    """
+    Same output as compute_indicators, computed with the incremental IndicatorEngine.
+    Pass a restored `engine` (IndicatorEngine.from_dict) to only fold in bars newer than its state.
+    """
+    if "data" not in stock_data or not stock_data["data"]:
+        return {"error": "No stock data available"}
+
+    engine = engine or IndicatorEngine()
+    bars = sorted(stock_data["data"], key=lambda b: b["date"])
+    if engine.last_date is not None:
+        bars = [b for b in bars if str(b["date"]) > engine.last_date]
+    engine.extend(bars)
+
+    return {"symbol": stock_data["symbol"], "indicators": engine.values(advanced=advanced)}
+
+
+def compute_indicators_many(stock_data_list: list[dict], advanced: bool = False) -> list[dict]:
+    """
+    Batch version of compute_indicators for many symbols at once.
+    Histories are packed into (symbols x bars) arrays with a validity mask and run
+    through the vectorized NumPy kernel in a single pass.
+    Returns one result per input, in the same shape as compute_indicators.
+    """
+    rows = [sorted(sd.get("data") or [], key=lambda b: b["date"]) for sd in stock_data_list]
+    width = max((len(r) for r in rows), default=0)
+
+    fields = ("close", "high", "low", "volume")
+    arrays = {f: np.full((len(rows), width), np.nan) for f in fields}
+    for i, bars in enumerate(rows):
+        for f in fields:
+            arrays[f][i, :len(bars)] = [np.nan if b.get(f) is None else b[f] for b in bars]
+
+    values = compute_indicators_batch(arrays["close"], arrays["high"], arrays["low"], arrays["volume"], advanced=advanced) if width else {}
+
+    results = []
+    for i, sd in enumerate(stock_data_list):
+        if not rows[i]:
+            results.append({"error": "No stock data available"})
+            continue
+        indicators = {k: (round(float(v[i]), 2) if np.isfinite(v[i]) else None) for k, v in values.items()}
+        results.append({"symbol": sd["symbol"], "indicators": indicators})
+    return results
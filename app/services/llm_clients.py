@@ -1,15 +1,54 @@
+import asyncio
 import os
-from openai import OpenAI
-from app.services import config
+import threading
+import weakref
+from openai import AsyncOpenAI, OpenAI
+from app.services import config, metrics, tracing
 
 # Load keys from env
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-# Setup OpenAI client
+SYSTEM_PROMPT = "You are a financial sentiment classifier."
+
+# Setup OpenAI clients (sync for existing callers, async for the concurrent path)
 openai_client = None
+async_openai_client = None
 if OPENAI_API_KEY:
     openai_client = OpenAI(api_key=OPENAI_API_KEY)
+    async_openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+
+# Global cap on in-flight completions. asyncio semaphores are bound to the loop
+# that first uses them, so keep one per running loop.
+_sync_slots = threading.BoundedSemaphore(config.LLM_MAX_CONCURRENCY)
+_async_slots = weakref.WeakKeyDictionary()  # event loop -> asyncio.Semaphore
+
+
+def _messages(prompt: str) -> list[dict]:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _async_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    sem = _async_slots.get(loop)
+    if sem is None:
+        sem = _async_slots[loop] = asyncio.Semaphore(config.LLM_MAX_CONCURRENCY)
+    return sem
+
+
+def _span_attributes(prompt: str, model: str = "gpt-4o-mini") -> dict:
+    return {"model": model, "prompt_chars": len(prompt)}
+
 
+def _record_usage(model: str, usage) -> None:
+    metrics.llm_usage(model, usage)
+    if usage is not None:
+        tracing.annotate(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+
+
+@tracing.traced("openai.chat", _span_attributes)
 def analyze_with_openai(prompt: str, model: str = "gpt-4o-mini") -> str:
     """
     Send a prompt to OpenAI LLM and return response text.
@@ -18,11 +57,30 @@ def analyze_with_openai(prompt: str, model: str = "gpt-4o-mini") -> str:
     if not openai_client:
         raise ValueError("OPENAI_API_KEY not set")
 
-    response = openai_client.chat.completions.create(
-        model=model,
-        messages=[
-            {"role": "system", "content": "You are a financial sentiment classifier."},
-            {"role": "user", "content": prompt}
-        ]
-    )
+    with _sync_slots, metrics.upstream_timer("openai"):
+        response = openai_client.chat.completions.create(
+            model=model,
+            messages=_messages(prompt)
+        )
+    _record_usage(model, response.usage)
+    return response.choices[0].message.content
+
+
+@tracing.traced("openai.chat", _span_attributes)
+async def analyze_with_openai_async(prompt: str, model: str = "gpt-4o-mini") -> str:
+    """
+    Async version of analyze_with_openai.
+    At most config.LLM_MAX_CONCURRENCY requests are in flight per event loop;
+    extra callers wait on the semaphore instead of holding a worker thread.
+    """
+    if not async_openai_client:
+        raise ValueError("OPENAI_API_KEY not set")
+
+    async with _async_semaphore():
+        with metrics.upstream_timer("openai"):
+            response = await async_openai_client.chat.completions.create(
+                model=model,
+                messages=_messages(prompt)
+            )
+    _record_usage(model, response.usage)
     return response.choices[0].message.content
@@ -0,0 +1,141 @@
+from datetime import date, datetime, time as dtime, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+from app.services import config
+
+# NYSE regular session (exchange local time)
+EXCHANGE_TZ = ZoneInfo("America/New_York")
+OPEN = dtime(9, 30)
+CLOSE = dtime(16, 0)
+EARLY_CLOSE = dtime(13, 0)
+
+
+# ---- Holidays ----
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th `weekday` (Mon=0) of the month; n=-1 for the last one."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(d: date) -> date:
+    # Saturday holidays are observed on Friday, Sunday ones on Monday
+    if d.weekday() == 5:
+        return d - timedelta(days=1)
+    if d.weekday() == 6:
+        return d + timedelta(days=1)
+    return d
+
+
+@lru_cache(maxsize=None)
+def holidays(year: int) -> frozenset:
+    """NYSE full-day closures for `year`."""
+    days = {
+        _nth_weekday(year, 1, 0, 3),                # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),                # Washington's Birthday
+        _easter(year) - timedelta(days=2),          # Good Friday
+        _nth_weekday(year, 5, 0, -1),               # Memorial Day
+        _observed(date(year, 7, 4)),                # Independence Day
+        _nth_weekday(year, 9, 0, 1),                # Labor Day
+        _nth_weekday(year, 11, 3, 4),               # Thanksgiving
+        _observed(date(year, 12, 25)),              # Christmas
+    }
+    # New Year's Day on a Saturday is not made up on the Friday before
+    if date(year, 1, 1).weekday() != 5:
+        days.add(_observed(date(year, 1, 1)))
+    if year >= 2022:
+        days.add(_observed(date(year, 6, 19)))      # Juneteenth
+    return frozenset(days)
+
+
+def _early_close(d: date) -> bool:
+    # 1pm closes: July 3, the day after Thanksgiving, Christmas Eve
+    return (
+        (d.month, d.day) in ((7, 3), (12, 24))
+        or d == _nth_weekday(d.year, 11, 3, 4) + timedelta(days=1)
+    )
+
+
+# ---- Sessions ----
+def is_trading_day(d: date) -> bool:
+    return d.weekday() < 5 and d not in holidays(d.year)
+
+
+def session(d: date) -> tuple[datetime, datetime] | None:
+    """(open, close) of the regular session on `d` as exchange-local datetimes, or None if closed."""
+    if not is_trading_day(d):
+        return None
+    close = EARLY_CLOSE if _early_close(d) else CLOSE
+    return datetime.combine(d, OPEN, EXCHANGE_TZ), datetime.combine(d, close, EXCHANGE_TZ)
+
+
+def now() -> datetime:
+    return datetime.now(EXCHANGE_TZ)
+
+
+def is_live(at: datetime | None = None) -> bool:
+    """
+    True while data can change: from the open until MARKET_CLOSE_SETTLE seconds
+    after the close (the final daily bar takes a while to settle upstream).
+    """
+    at = at or now()
+    hours = session(at.astimezone(EXCHANGE_TZ).date())
+    if hours is None:
+        return False
+    open_, close = hours
+    return open_ <= at < close + timedelta(seconds=config.MARKET_CLOSE_SETTLE)
+
+
+def next_open(at: datetime | None = None) -> datetime:
+    """Open of the first session starting after `at`."""
+    at = at or now()
+    d = at.astimezone(EXCHANGE_TZ).date()
+    while True:
+        hours = session(d)
+        if hours and hours[0] > at:
+            return hours[0]
+        d += timedelta(days=1)
+
+
+def last_completed_session(at: datetime | None = None) -> date:
+    """Date of the latest session whose daily bar is final (closed and settled)."""
+    at = at or now()
+    d = at.astimezone(EXCHANGE_TZ).date()
+    while True:
+        hours = session(d)
+        if hours and hours[1] + timedelta(seconds=config.MARKET_CLOSE_SETTLE) <= at:
+            return d
+        d -= timedelta(days=1)
+
+
+# ---- TTL policy ----
+def cache_ttl(session_ttl: float, at: datetime | None = None) -> float:
+    """
+    Seconds a cache entry stored at `at` stays valid.
+    While the market is live that's the cache's own short `session_ttl`. Off
+    hours nothing new can appear until the next open, so the entry lasts until
+    then (plus `session_ttl`, as if it had been stored at the open).
+    With MARKET_AWARE_TTL off, always `session_ttl`.
+    """
+    if not config.MARKET_AWARE_TTL:
+        return session_ttl
+    at = at or now()
+    if is_live(at):
+        return session_ttl
+    return (next_open(at) - at).total_seconds() + session_ttl
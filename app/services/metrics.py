@@ -0,0 +1,275 @@
+import asyncio
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from app.services import config
+
+# Instrumentation is fixed at startup: when disabled, decorators return the
+# function untouched and timers/counters are shared no-ops.
+ENABLED = config.METRICS_ENABLED
+
+# Seconds; upstream and LLM calls run into the tens of seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+REGISTRY: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+# ---- Metric types ----
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            return [f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in sorted(self._values.items())]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}", *self._samples()]
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def mirror(self, value: float, *labels) -> None:
+        """Set the total for a count kept elsewhere (read at scrape time)."""
+        with self._lock:
+            self._values[labels] = value
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def set(self, value: float, *labels) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = buckets
+
+    def observe(self, value: float, *labels) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][i] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _samples(self) -> list[str]:
+        lines = []
+        with self._lock:
+            items = sorted((k, (list(c), s, n)) for k, (c, s, n) in self._values.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, c in zip((*self.buckets, "+Inf"), counts):
+                cumulative += c
+                le = 'le="+Inf"' if bound == "+Inf" else f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+# ---- Metrics ----
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency by route template", ("route", "method", "status"))
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being served")
+NODE_LATENCY = Histogram("agent_node_duration_seconds", "Orchestrator node latency", ("node",))
+UPSTREAM_LATENCY = Histogram("upstream_request_duration_seconds", "Upstream call latency (NewsAPI, yfinance, OpenAI, pandas_ta)", ("upstream", "outcome"))
+UPSTREAM_IN_FLIGHT = Gauge("upstream_requests_in_flight", "Upstream calls in progress", ("upstream",))
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by result (hit, stale, miss)", ("cache", "result"))
+CACHE_HIT_RATIO = Gauge("cache_hit_ratio", "Share of cache lookups served from cache (stale included)", ("cache",))
+COALESCED = Counter("coalesced_requests_total", "Requests that joined an identical in-flight call", ("route",))
+COALESCER_IN_FLIGHT = Gauge("coalescer_in_flight", "Distinct calls in flight in the request coalescer")
+RESPONSE_REFRESHING = Gauge("response_cache_refreshing", "Background stale-while-revalidate refreshes running")
+LLM_TOKENS = Counter("llm_tokens_total", "LLM tokens by model and kind (prompt, completion)", ("model", "kind"))
+
+
+# ---- Hooks ----
+class _UpstreamTimer:
+    __slots__ = ("upstream", "start")
+
+    def __init__(self, upstream: str):
+        self.upstream = upstream
+
+    def __enter__(self):
+        UPSTREAM_IN_FLIGHT.inc(self.upstream)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        UPSTREAM_LATENCY.observe(time.perf_counter() - self.start, self.upstream, "error" if exc_type else "ok")
+        UPSTREAM_IN_FLIGHT.dec(self.upstream)
+        return False
+
+
+_NULL = nullcontext()
+
+
+def upstream_timer(upstream: str):
+    """`with upstream_timer("newsapi"):` around one upstream call (a no-op when disabled)."""
+    return _UpstreamTimer(upstream) if ENABLED else _NULL
+
+
+def timed_upstream(upstream: str):
+    """Decorator form of upstream_timer for sync and async functions."""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                with _UpstreamTimer(upstream):
+                    return await fn(*args, **kwargs)
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with _UpstreamTimer(upstream):
+                    return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def timed_node(node: str, fn):
+    """Wrap an orchestrator node body (sync or async) to record its latency."""
+    if not ENABLED:
+        return fn
+    if asyncio.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                NODE_LATENCY.observe(time.perf_counter() - start, node)
+    else:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                NODE_LATENCY.observe(time.perf_counter() - start, node)
+    return wrapper
+
+
+def cache_result(cache: str, result: str) -> None:
+    if ENABLED:
+        CACHE_REQUESTS.inc(cache, result)
+
+
+def llm_usage(model: str, usage) -> None:
+    """Count prompt/completion tokens from an OpenAI `usage` object."""
+    if ENABLED and usage is not None:
+        LLM_TOKENS.inc(model, "prompt", amount=usage.prompt_tokens or 0)
+        LLM_TOKENS.inc(model, "completion", amount=usage.completion_tokens or 0)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing each HTTP request (until its last body chunk) by route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        status = "500"
+
+        async def send_timed(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            HTTP_LATENCY.observe(time.perf_counter() - start, path, scope["method"], status)
+
+
+# ---- Exposition ----
+def _collect() -> None:
+    """Copy counts the caches and the coalescer keep themselves into the metrics above."""
+    from app.services.response_cache import response_cache
+    from app.services.sentiment_cache import sentiment_cache
+    from app.services.singleflight import request_coalescer
+    from app.services.watchlist import watchlist_scheduler
+
+    sentiment = sentiment_cache.stats()
+    responses = response_cache.stats()
+    coalescing = request_coalescer.stats()
+
+    CACHE_REQUESTS.mirror(sentiment["hits"], "sentiment", "hit")
+    CACHE_REQUESTS.mirror(sentiment["misses"], "sentiment", "miss")
+    CACHE_REQUESTS.mirror(responses["hits"], "response", "hit")
+    CACHE_REQUESTS.mirror(responses["stale_hits"], "response", "stale")
+    CACHE_REQUESTS.mirror(responses["misses"], "response", "miss")
+    CACHE_REQUESTS.mirror(watchlist_scheduler.hits, "watchlist", "hit")
+
+    for cache in ("news", "decision", "sentiment", "response"):
+        hits = CACHE_REQUESTS.value(cache, "hit") + CACHE_REQUESTS.value(cache, "stale")
+        total = hits + CACHE_REQUESTS.value(cache, "miss")
+        if total:
+            CACHE_HIT_RATIO.set(hits / total, cache)
+
+    for route, counts in coalescing["routes"].items():
+        COALESCED.mirror(counts["coalesced"], route)
+    COALESCER_IN_FLIGHT.set(coalescing["in_flight"])
+    RESPONSE_REFRESHING.set(responses["refreshing"])
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format (this worker process only)."""
+    _collect()
+    return "\n".join(m.render() for m in REGISTRY) + "\n"
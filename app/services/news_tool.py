@@ -1,31 +1,149 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+from collections import OrderedDict
+import httpx
 import requests
-from datetime import datetime
-from app.services import config
+from requests.adapters import HTTPAdapter
+from app.services import config, market_calendar, metrics, tracing
+from app.services.article_store import article_store
 
 BASE_URL = "https://newsapi.org/v2/everything"
 
-def get_latest_news(symbol: str, limit: int = 5) -> list[dict]:
-    """
-    Fetch latest financial news for a given stock symbol.
-    Returns a list of dicts with title, date, url.
-    """
+# Transient upstream failures worth another try. 429 is not one of them:
+# NewsAPI quotas are daily, so retrying only burns what's left.
+RETRY_STATUSES = {500, 502, 503, 504}
+
+# ---- HTTP clients ----
+# One pooled session per process (keep-alive, no TLS handshake per request).
+# Retries are done by hand below so 429s and jitter are under our control.
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=config.NEWS_POOL_SIZE, max_retries=0))
+
+TIMEOUT = (config.NEWS_CONNECT_TIMEOUT, config.NEWS_READ_TIMEOUT)
+
+# httpx.AsyncClient connections are bound to the loop that opened them, so keep one per loop.
+# Callers beyond the pool size wait on a semaphore rather than in httpx's pool,
+# whose bookkeeping gets slow when many requests queue for a connection.
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> (httpx.AsyncClient, asyncio.Semaphore)
+
+
+def _async_client() -> tuple[httpx.AsyncClient, asyncio.Semaphore]:
+    loop = asyncio.get_running_loop()
+    entry = _async_clients.get(loop)
+    if entry is None:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(config.NEWS_READ_TIMEOUT, connect=config.NEWS_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=config.NEWS_POOL_SIZE, max_keepalive_connections=config.NEWS_POOL_SIZE),
+        )
+        entry = _async_clients[loop] = (client, asyncio.Semaphore(config.NEWS_POOL_SIZE))
+    return entry
+
+
+# ---- Response cache ----
+# (SYMBOL, limit) -> {"results", "expires_at", "etag", "last_modified"}, in LRU order
+_cache: OrderedDict[tuple, dict] = OrderedDict()
+_cache_lock = threading.Lock()
+# Monotonic time until which NewsAPI told us the quota is spent
+_quota_blocked_until = 0.0
+
+
+def _cache_key(symbol: str, limit: int) -> tuple:
+    return (symbol.strip().upper(), limit)
 
-    if not config.NEWS_API_KEY:
-        raise ValueError("NEWS_API_KEY not found. Please set it in .env")
 
+def _expires_at() -> float:
+    # NEWS_CACHE_TTL in session; off hours the entry holds until the next open
+    return time.monotonic() + market_calendar.cache_ttl(config.NEWS_CACHE_TTL)
+
+
+def _fresh(entry: dict | None) -> bool:
+    return entry is not None and time.monotonic() < entry["expires_at"]
+
+
+def _store(key: tuple, results: list[dict], headers) -> list[dict]:
+    with _cache_lock:
+        _cache[key] = {
+            "results": results,
+            "expires_at": _expires_at(),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+        }
+        _cache.move_to_end(key)
+        while len(_cache) > config.NEWS_CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return [dict(a) for a in results]
+
+
+def _touch(entry: dict) -> list[dict]:
+    with _cache_lock:
+        entry["expires_at"] = _expires_at()
+    return [dict(a) for a in entry["results"]]
+
+
+def _stale_or_raise(key: tuple, entry: dict | None, error: Exception) -> list[dict]:
+    """Serve the last good response (or what the article store has) if we can, otherwise surface the error."""
+    if entry is not None:
+        return [dict(a) for a in entry["results"]]
+    if config.NEWS_STORE_ENABLED:
+        stored = article_store.latest(*key)
+        if stored:
+            return stored
+    raise error
+
+
+def _block_quota(headers) -> None:
+    global _quota_blocked_until
+    try:
+        backoff = float(headers.get("Retry-After", config.NEWS_QUOTA_BACKOFF))
+    except ValueError:
+        backoff = config.NEWS_QUOTA_BACKOFF
+    _quota_blocked_until = time.monotonic() + backoff
+
+
+# ---- Request helpers (shared by the sync and async paths) ----
+def _params(symbol: str, limit: int, since: str | None) -> dict:
     params = {
         "q": symbol,            # search query
         "sortBy": "publishedAt",# order by recency
         "pageSize": limit,      # number of articles
         "apiKey": config.NEWS_API_KEY
     }
+    if since:
+        params["from"] = since  # only articles we haven't seen yet
+    return params
 
-    response = requests.get(BASE_URL, params=params)
 
-    if response.status_code != 200:
-        raise RuntimeError(f"News API error: {response.status_code} - {response.text}")
+def _since(key: tuple) -> str | None:
+    """
+    Where to resume fetching: the newest stored publishedAt, once the store holds
+    at least `limit` articles for the symbol (otherwise do a full fetch).
+    """
+    symbol, limit = key
+    if not config.NEWS_STORE_ENABLED or article_store.count(symbol) < limit:
+        return None
+    return article_store.newest_published(symbol)
+
 
-    data = response.json()
+def _conditional_headers(entry: dict | None) -> dict:
+    """Revalidate with the validators of the cached response, if the server sent any."""
+    headers = {}
+    if entry is not None:
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def _retry_delay(attempt: int) -> float:
+    # Exponential backoff with full jitter
+    return random.uniform(0, config.NEWS_RETRY_BACKOFF * 2 ** attempt)
+
+
+def _format_articles(data: dict) -> list[dict]:
     articles = data.get("articles", [])
 
     # Clean and format output
@@ -39,3 +157,119 @@ def get_latest_news(symbol: str, limit: int = 5) -> list[dict]:
         })
 
     return results
+
+
+def _save_articles(key: tuple, data: dict) -> list[dict]:
+    """Merge a NewsAPI page into the article store and return the newest `limit` articles."""
+    articles = _format_articles(data)
+    if not config.NEWS_STORE_ENABLED:
+        return articles
+    symbol, limit = key
+    # More matches than we got back: the page doesn't reach what we had stored
+    gap = data.get("totalResults", 0) > len(articles)
+    article_store.add_many(symbol, articles, replace_older=gap)
+    return article_store.latest(symbol, limit)
+
+
+def _handle_response(key: tuple, entry: dict | None, status_code: int, headers, text: str, json_fn) -> list[dict]:
+    if status_code == 304 and entry is not None:
+        return _touch(entry)
+    if status_code == 429:
+        _block_quota(headers)
+    if status_code != 200:
+        error = RuntimeError(f"News API error: {status_code} - {text}")
+        if status_code == 429 or status_code in RETRY_STATUSES:
+            return _stale_or_raise(key, entry, error)
+        raise error
+    return _store(key, _save_articles(key, json_fn()), headers)
+
+
+def _lookup(symbol: str, limit: int) -> tuple[tuple, dict | None, list[dict] | None]:
+    """
+    Returns (key, cached entry, results to serve without calling NewsAPI).
+    Results are set when the cache is fresh, or when the quota is spent and a stale copy exists.
+    """
+    if not config.NEWS_API_KEY:
+        raise ValueError("NEWS_API_KEY not found. Please set it in .env")
+
+    key = _cache_key(symbol, limit)
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+    if _fresh(entry):
+        metrics.cache_result("news", "hit")
+        tracing.annotate(cache="hit")
+        return key, entry, [dict(a) for a in entry["results"]]
+    if time.monotonic() < _quota_blocked_until:
+        metrics.cache_result("news", "stale")
+        tracing.annotate(cache="stale")
+        error = RuntimeError("News API quota exhausted, no cached news for this symbol")
+        return key, entry, _stale_or_raise(key, entry, error)
+    metrics.cache_result("news", "miss")
+    tracing.annotate(cache="miss")
+    return key, entry, None
+
+
+# ---- Public API ----
+def _span_attributes(symbol: str, limit: int = 5) -> dict:
+    return {"symbol": symbol, "limit": limit}
+
+
+@tracing.traced("news.latest", _span_attributes)
+def get_latest_news(symbol: str, limit: int = 5) -> list[dict]:
+    """
+    Fetch latest financial news for a given stock symbol.
+    Returns a list of dicts with title, date, url.
+    Articles accumulate in the local article store, so once it holds `limit`
+    articles a refresh only asks NewsAPI for what was published since the newest one.
+    Responses are cached per (symbol, limit) for NEWS_CACHE_TTL seconds in session
+    and until the next market open otherwise; when
+    NewsAPI is over quota or failing, the last good response is served instead.
+    """
+    key, entry, cached = _lookup(symbol, limit)
+    if cached is not None:
+        return cached
+
+    headers = _conditional_headers(entry)
+    params = _params(symbol, limit, _since(key))
+    for attempt in range(config.NEWS_MAX_RETRIES + 1):
+        try:
+            with metrics.upstream_timer("newsapi"):
+                response = session.get(BASE_URL, params=params, headers=headers, timeout=TIMEOUT)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == config.NEWS_MAX_RETRIES:
+                return _stale_or_raise(key, entry, RuntimeError(f"News API unreachable: {e}"))
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == config.NEWS_MAX_RETRIES:
+                return _handle_response(key, entry, response.status_code, response.headers, response.text, response.json)
+        time.sleep(_retry_delay(attempt))
+
+
+@tracing.traced("news.latest", _span_attributes)
+async def get_latest_news_async(symbol: str, limit: int = 5) -> list[dict]:
+    """
+    Async version of get_latest_news (same cache, timeouts and retry policy).
+    Steps that can touch the article store (SQLite) run on worker threads.
+    """
+    key, entry, cached = await asyncio.to_thread(_lookup, symbol, limit)
+    if cached is not None:
+        return cached
+
+    headers = _conditional_headers(entry)
+    params = _params(symbol, limit, await asyncio.to_thread(_since, key))
+    client, slots = _async_client()
+    for attempt in range(config.NEWS_MAX_RETRIES + 1):
+        try:
+            async with slots:
+                with metrics.upstream_timer("newsapi"):
+                    response = await client.get(BASE_URL, params=params, headers=headers)
+        except httpx.TransportError as e:
+            if attempt == config.NEWS_MAX_RETRIES:
+                return await asyncio.to_thread(_stale_or_raise, key, entry, RuntimeError(f"News API unreachable: {e}"))
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == config.NEWS_MAX_RETRIES:
+                return await asyncio.to_thread(
+                    _handle_response, key, entry, response.status_code, response.headers, response.text, response.json
+                )
+        await asyncio.sleep(_retry_delay(attempt))
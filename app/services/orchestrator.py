@@ -1,11 +1,16 @@
-from langgraph.graph import StateGraph, END
-from typing import TypedDict
+import asyncio
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langgraph.graph import StateGraph, START, END
+from functools import lru_cache
+from typing import Iterable, TypedDict
 
-from app.services.news_tool import get_latest_news
-from app.services.sentiment_tool import analyze_sentiment, aggregate_sentiment
-from app.services.equity_tool import get_stock_data
-from app.services.indicators import compute_indicators
-from app.services.decision_tool import hybrid_decision
+from app.services import metrics, tracing
+
+from app.services.news_tool import get_latest_news, get_latest_news_async
+from app.services.sentiment_tool import analyze_sentiment, analyze_sentiment_async, aggregate_sentiment
+from app.services.equity_tool import get_stock_data, get_stock_data_async
+from app.services.indicators import compute_indicators, compute_indicators_async
+from app.services.decision_tool import hybrid_decision, hybrid_decision_async
 
 
 # ---- Define State ----
@@ -18,19 +23,25 @@ class AgentState(TypedDict):
     decision: dict
 
 
+# Price history window used by fetch_equity (days)
+EQUITY_DAYS = 60
+
+
 # ---- Define Nodes ----
 def fetch_news(state: AgentState):
     news = get_latest_news(state["symbol"], limit=3)
     return {"news": news}
 
-def analyze_news(state: AgentState):
+def analyze_news(state: AgentState, config: RunnableConfig):
+    # Callers (e.g. batch runs) may share one headline classifier across symbols
+    classify = config.get("configurable", {}).get("classify_headlines", analyze_sentiment)
     headlines = [n["title"] for n in state["news"]]
-    results = analyze_sentiment(headlines)
+    results = classify(headlines)
     overall = aggregate_sentiment(results)
     return {"sentiment": overall}
 
 def fetch_equity(state: AgentState):
-    stock_data = get_stock_data(state["symbol"], days=60)
+    stock_data = get_stock_data(state["symbol"], days=EQUITY_DAYS)
     return {"stock_data": stock_data}
 
 def compute_tech(state: AgentState):
@@ -42,23 +53,145 @@ def make_decision(state: AgentState):
     return {"decision": decision}
 
 
+# ---- Async Nodes (used by ainvoke / astream) ----
+async def fetch_news_async(state: AgentState):
+    news = await get_latest_news_async(state["symbol"], limit=3)
+    return {"news": news}
+
+async def analyze_news_async(state: AgentState, config: RunnableConfig):
+    headlines = [n["title"] for n in state["news"]]
+    classify = config.get("configurable", {}).get("classify_headlines")
+    if classify is None:
+        results = await analyze_sentiment_async(headlines)
+    else:
+        # Injected classifiers are sync (shared across batch worker threads)
+        results = await asyncio.to_thread(classify, headlines)
+    overall = aggregate_sentiment(results)
+    return {"sentiment": overall}
+
+async def fetch_equity_async(state: AgentState):
+    stock_data = await get_stock_data_async(state["symbol"], days=EQUITY_DAYS)
+    return {"stock_data": stock_data}
+
+async def compute_tech_async(state: AgentState):
+    indicators = (await compute_indicators_async(state["stock_data"], advanced=True))["indicators"]
+    return {"indicators": indicators}
+
+async def make_decision_async(state: AgentState):
+    decision = await hybrid_decision_async(state["symbol"], state["sentiment"], state["indicators"])
+    return {"decision": decision}
+
+
+# ---- Stage Selection ----
+STAGES = ("news", "sentiment", "equity", "indicators", "decision")
+
+# Which node produces each stage
+STAGE_NODES = {
+    "news": "fetch_news",
+    "sentiment": "analyze_news",
+    "equity": "fetch_equity",
+    "indicators": "compute_tech",
+    "decision": "make_decision",
+}
+
+# Each node has a sync body (invoke/stream) and an async one (ainvoke/astream)
+NODES = {
+    "fetch_news": (fetch_news, fetch_news_async),
+    "analyze_news": (analyze_news, analyze_news_async),
+    "fetch_equity": (fetch_equity, fetch_equity_async),
+    "compute_tech": (compute_tech, compute_tech_async),
+    "make_decision": (make_decision, make_decision_async),
+}
+
+# State key each node writes
+NODE_OUTPUTS = {
+    "fetch_news": "news",
+    "analyze_news": "sentiment",
+    "fetch_equity": "stock_data",
+    "compute_tech": "indicators",
+    "make_decision": "decision",
+}
+
+# Upstream nodes each node reads its inputs from
+NODE_DEPENDENCIES = {
+    "analyze_news": ("fetch_news",),
+    "compute_tech": ("fetch_equity",),
+    "make_decision": ("analyze_news", "compute_tech"),
+}
+
+
+def resolve_nodes(stages: Iterable[str]) -> set[str]:
+    """
+    Expand requested stages into the set of nodes that must run,
+    including everything they depend on.
+    """
+    stages = list(stages)
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stages: {', '.join(sorted(unknown))}")
+
+    nodes = set()
+    pending = [STAGE_NODES[s] for s in stages]
+    while pending:
+        node = pending.pop()
+        if node not in nodes:
+            nodes.add(node)
+            pending.extend(NODE_DEPENDENCIES.get(node, ()))
+    return nodes
+
+
 # ---- Build Workflow ----
-def build_agent_workflow():
+def _instrument(name: str, fn):
+    # Latency histogram for /metrics and a span per node for request traces
+    traced = tracing.traced(f"node.{name}", lambda state, *args, **kwargs: {"symbol": state.get("symbol")})
+    return traced(metrics.timed_node(name, fn))
+
+
+def build_agent_workflow(stages: Iterable[str] = STAGES):
+    """
+    Compile the agent graph for the requested stages.
+    Independent branches start together from START and join where a node
+    depends on more than one of them (make_decision).
+    """
+    nodes = resolve_nodes(stages)
+    if not nodes:
+        raise ValueError("At least one stage must be selected")
+
     graph = StateGraph(AgentState)
 
-    # Add nodes
-    graph.add_node("fetch_news", fetch_news)
-    graph.add_node("analyze_news", analyze_news)
-    graph.add_node("fetch_equity", fetch_equity)
-    graph.add_node("compute_tech", compute_tech)
-    graph.add_node("make_decision", make_decision)
+    # Add nodes (in declaration order so the graph is deterministic)
+    for name, (fn, afn) in NODES.items():
+        if name in nodes:
+            runnable = RunnableLambda(_instrument(name, fn), afunc=_instrument(name, afn), name=name)
+            graph.add_node(name, runnable)
 
     # Define flow
-    graph.add_edge("fetch_news", "analyze_news")
-    graph.add_edge("analyze_news", "fetch_equity")
-    graph.add_edge("fetch_equity", "compute_tech")
-    graph.add_edge("compute_tech", "make_decision")
-    graph.add_edge("make_decision", END)
+    for name in nodes:
+        deps = NODE_DEPENDENCIES.get(name, ())
+        if not deps:
+            graph.add_edge(START, name)
+        elif len(deps) == 1:
+            graph.add_edge(deps[0], name)
+        else:
+            graph.add_edge(list(deps), name)
+
+    # Nodes nothing else depends on finish the run
+    upstream = {d for n in nodes for d in NODE_DEPENDENCIES.get(n, ())}
+    for name in nodes - upstream:
+        graph.add_edge(name, END)
 
-    graph.set_entry_point("fetch_news")
     return graph.compile()
+
+
+@lru_cache(maxsize=None)
+def _compiled_workflow(nodes: frozenset):
+    return build_agent_workflow(s for s in STAGES if STAGE_NODES[s] in nodes)
+
+
+def get_agent_workflow(stages: Iterable[str] = STAGES):
+    """
+    Return a compiled workflow for the requested stages.
+    Graphs are cached per resolved node set, so e.g. {"decision"} and
+    {"decision", "news"} share one compiled graph.
+    """
+    return _compiled_workflow(frozenset(resolve_nodes(stages)))
@@ -0,0 +1,112 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Hashable, NamedTuple
+from app.services import config, market_calendar
+
+def has_error(value) -> bool:
+    """True if any stage result carries an "error" key (such results aren't cached)."""
+    if isinstance(value, dict):
+        return "error" in value or any(has_error(v) for v in value.values())
+    if isinstance(value, list):
+        return any(has_error(v) for v in value)
+    return False
+
+
+# compute() returns the encoded body and whether it may be cached (e.g. no stage failed)
+Compute = Callable[[], Awaitable[tuple[bytes, bool]]]
+
+
+class CachedBody(NamedTuple):
+    body: bytes
+    status: str        # HIT, STALE, MISS or BYPASS (not stored)
+    age: float         # seconds since the body was computed
+    fresh_for: float   # seconds it stays fresh from now
+
+
+class ResponseCache:
+    """
+    Stale-while-revalidate cache of encoded response bodies.
+
+    A body is fresh for RESPONSE_CACHE_TTL (market-session aware, see
+    market_calendar.cache_ttl), then servable for another RESPONSE_CACHE_STALE
+    seconds: a stale hit is answered from cache right away while one background
+    task recomputes it. Older or missing entries are computed inline.
+    Bodies are stored already encoded, so hits skip serialization. Beyond
+    `max_entries` the least recently used entries are dropped.
+    Use from the event loop only (no locking).
+    """
+
+    def __init__(self, ttl: float | None = None, stale: float | None = None, max_entries: int | None = None):
+        self.ttl = config.RESPONSE_CACHE_TTL if ttl is None else ttl
+        self.stale = config.RESPONSE_CACHE_STALE if stale is None else stale
+        self.max_entries = config.RESPONSE_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.enabled = config.RESPONSE_CACHE_ENABLED
+        self._entries: OrderedDict[Hashable, dict] = OrderedDict()
+        self._refreshing: dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    async def get(self, key: Hashable, compute: Compute) -> CachedBody:
+        now = time.time()
+        entry = self._entries.get(key) if self.enabled else None
+        if entry is not None and now < entry["stale_until"]:
+            self._entries.move_to_end(key)
+            age = now - entry["stored_at"]
+            if now < entry["fresh_until"]:
+                self.hits += 1
+                return CachedBody(entry["body"], "HIT", age, entry["fresh_until"] - now)
+            self.stale_hits += 1
+            self._revalidate(key, compute)
+            return CachedBody(entry["body"], "STALE", age, 0.0)
+
+        self.misses += 1
+        body, fresh_for = await self._fill(key, compute)
+        if fresh_for is None:
+            return CachedBody(body, "BYPASS", 0.0, 0.0)
+        return CachedBody(body, "MISS", 0.0, fresh_for)
+
+    async def _fill(self, key: Hashable, compute: Compute) -> tuple[bytes, float | None]:
+        """Compute and store `key`; returns the body and how long it's fresh (None if not cacheable)."""
+        body, cacheable = await compute()
+        if not (self.enabled and cacheable):
+            return body, None
+        now = time.time()
+        fresh_until = now + market_calendar.cache_ttl(self.ttl)
+        self._entries[key] = {"body": body, "stored_at": now, "fresh_until": fresh_until, "stale_until": fresh_until + self.stale}
+        self._entries.move_to_end(key)
+        # (the new entry itself may go too, e.g. max_entries=0)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return body, fresh_until - now
+
+    def _revalidate(self, key: Hashable, compute: Compute) -> None:
+        """Recompute `key` in the background (once, however many stale hits arrive meanwhile)."""
+        if key in self._refreshing:
+            return
+        self.revalidations += 1
+
+        async def refresh():
+            try:
+                await self._fill(key, compute)
+            except Exception:
+                pass  # keep serving the stale body until it ages out
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "refreshing": len(self._refreshing),
+        }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,106 @@
+import hashlib
+import threading
+import time
+from app.services import config, db
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sentiment (
+    key         TEXT PRIMARY KEY,
+    label       TEXT NOT NULL,
+    confidence  REAL NOT NULL,
+    created_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sentiment_accessed ON sentiment (accessed_at);
+"""
+
+
+def normalize_headline(headline: str) -> str:
+    """Case- and whitespace-insensitive form used for cache keys."""
+    return " ".join(headline.split()).casefold()
+
+
+def cache_key(headline: str, model: str, prompt_version: str) -> str:
+    raw = "\x1f".join((normalize_headline(headline), model, prompt_version))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """
+    Content-addressed store of headline labels in a local SQLite (WAL) file.
+    Entries expire after `ttl` seconds; beyond `max_entries` the least recently
+    used rows are evicted.
+    """
+
+    def __init__(self, name: str = "sentiment_cache", ttl: int | None = None, max_entries: int | None = None):
+        self.name = name
+        self.ttl = config.SENTIMENT_CACHE_TTL if ttl is None else ttl
+        self.max_entries = config.SENTIMENT_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _conn(self):
+        return db.connect(self.name, SCHEMA)
+
+    def get_many(self, keys: list[str]) -> dict[str, dict]:
+        """Return {key: {"label", "confidence"}} for fresh entries; bumps their LRU position."""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        if keys:
+            now = time.time()
+            conn = self._conn()
+            marks = ",".join("?" * len(keys))
+            rows = conn.execute(
+                f"SELECT key, label, confidence FROM sentiment WHERE key IN ({marks}) AND created_at >= ?",
+                (*keys, now - self.ttl),
+            ).fetchall()
+            found = {k: {"label": label, "confidence": conf} for k, label, conf in rows}
+            if found:
+                conn.execute(
+                    f"UPDATE sentiment SET accessed_at = ? WHERE key IN ({','.join('?' * len(found))})",
+                    (now, *found),
+                )
+
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: dict[str, dict]) -> None:
+        """Store {key: {"label", "confidence"}} and evict expired / least recently used rows."""
+        if not items:
+            return
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO sentiment (key, label, confidence, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                [(k, v["label"], v["confidence"], now, now) for k, v in items.items()],
+            )
+            conn.execute("DELETE FROM sentiment WHERE created_at < ?", (now - self.ttl,))
+            excess = conn.execute("SELECT COUNT(*) FROM sentiment").fetchone()[0] - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM sentiment WHERE key IN (SELECT key FROM sentiment ORDER BY accessed_at LIMIT ?)",
+                    (excess,),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 4) if total else 0.0,
+            "entries": self._conn().execute("SELECT COUNT(*) FROM sentiment").fetchone()[0],
+        }
+
+
+sentiment_cache = SentimentCache()
@@ -1,31 +1,230 @@
+import asyncio
 import json
-from app.services.llm_clients import analyze_with_openai
+from app.services import config, tracing
+from app.services.llm_clients import analyze_with_openai, analyze_with_openai_async
+from app.services.sentiment_cache import cache_key, sentiment_cache
 
-def analyze_sentiment(headlines: list[str], model: str = "gpt-4o-mini") -> list[dict]:
-    """
-    Analyze sentiment of each headline using LLM.
-    Returns list of dicts with label + confidence.
-    """
-    results = []
-    for h in headlines:
-        prompt = f"""
+LABELS = ("Positive", "Negative", "Neutral")
+
+# Bump when the prompts change so cached labels from the old wording are ignored
+PROMPT_VERSION = "1"
+
+
+# ---- Prompts ----
+def _headline_prompt(headline: str) -> str:
+    return f"""
         Classify the sentiment of this financial news headline:
-        "{h}"
+        "{headline}"
 
         Respond ONLY in JSON format:
         {{"label": "Positive/Negative/Neutral", "confidence": float between 0 and 1}}
         """
 
+
+def _batch_prompt(headlines: list[str]) -> str:
+    numbered = "\n".join(f'{i}: "{h}"' for i, h in enumerate(headlines))
+    return f"""
+        Classify the sentiment of each financial news headline below.
+        Headlines are numbered from 0.
+
+        {numbered}
+
+        Respond ONLY with a JSON array containing exactly {len(headlines)} objects, one per headline:
+        [{{"index": 0, "label": "Positive/Negative/Neutral", "confidence": float between 0 and 1}}, ...]
+        """
+
+
+# ---- Parsing ----
+def _loads(response: str):
+    """Parse LLM JSON output, tolerating a surrounding ```json fence."""
+    text = response.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        if text.lower().startswith("json"):
+            text = text[4:]
+    return json.loads(text)
+
+
+def _valid_label(item) -> dict | None:
+    """Return {label, confidence} if item is a well-formed classification, else None."""
+    if not isinstance(item, dict):
+        return None
+    label = item.get("label")
+    confidence = item.get("confidence")
+    if label not in LABELS or isinstance(confidence, bool) or not isinstance(confidence, (int, float)):
+        return None
+    if not 0 <= confidence <= 1:
+        return None
+    return {"label": label, "confidence": confidence}
+
+
+def _parse_one(headline: str, response: str) -> dict:
+    parsed = _loads(response)
+    return {"headline": headline, "label": parsed["label"], "confidence": parsed["confidence"]}
+
+
+def _parse_batch(response: str, count: int) -> list[dict | None]:
+    """
+    Map a batch reply back onto `count` headlines.
+    Returns one entry per headline; None marks items that were missing or malformed.
+    """
+    labels = [None] * count
+    try:
+        parsed = _loads(response)
+    except Exception:
+        return labels
+
+    if isinstance(parsed, dict):
+        parsed = parsed.get("results") or parsed.get("labels")
+    if not isinstance(parsed, list):
+        return labels
+
+    # Without explicit indexes the position is only trustworthy if the length matches
+    positional = len(parsed) == count
+    for pos, item in enumerate(parsed):
+        idx = item.get("index") if isinstance(item, dict) else None
+        if isinstance(idx, bool) or not isinstance(idx, int):
+            if not positional:
+                continue
+            idx = pos
+        if 0 <= idx < count and labels[idx] is None:
+            labels[idx] = _valid_label(item)
+    return labels
+
+
+def _chunks(headlines: list[str], batch_size: int) -> list[list[str]]:
+    return [headlines[i:i + batch_size] for i in range(0, len(headlines), batch_size)]
+
+
+# ---- Classification ----
+def _classify_one(headline: str, model: str) -> dict:
+    try:
+        return _parse_one(headline, analyze_with_openai(_headline_prompt(headline), model=model))
+    except Exception as e:
+        return {"headline": headline, "error": str(e)}
+
+
+def _classify_batch(headlines: list[str], model: str) -> list[dict | None]:
+    """Classify a chunk of headlines in one LLM call."""
+    try:
+        response = analyze_with_openai(_batch_prompt(headlines), model=model)
+    except Exception:
+        return [None] * len(headlines)
+    return _parse_batch(response, len(headlines))
+
+
+def _classify(headlines: list[str], model: str, batch_size: int) -> list[dict]:
+    if batch_size <= 1:
+        return [_classify_one(h, model) for h in headlines]
+
+    results = []
+    for chunk in _chunks(headlines, batch_size):
+        labels = _classify_batch(chunk, model) if len(chunk) > 1 else [None]
+        for h, label in zip(chunk, labels):
+            if label is None:
+                results.append(_classify_one(h, model))
+            else:
+                results.append({"headline": h, **label})
+
+    return results
+
+
+# ---- Async Classification ----
+async def _classify_one_async(headline: str, model: str) -> dict:
+    try:
+        return _parse_one(headline, await analyze_with_openai_async(_headline_prompt(headline), model=model))
+    except Exception as e:
+        return {"headline": headline, "error": str(e)}
+
+
+async def _classify_chunk_async(chunk: list[str], model: str) -> list[dict]:
+    labels = [None]
+    if len(chunk) > 1:
         try:
-            response = analyze_with_openai(prompt, model=model)
-            parsed = json.loads(response)
-            results.append({"headline": h, "label": parsed["label"], "confidence": parsed["confidence"]})
-        except Exception as e:
-            results.append({"headline": h, "error": str(e)})
+            response = await analyze_with_openai_async(_batch_prompt(chunk), model=model)
+            labels = _parse_batch(response, len(chunk))
+        except Exception:
+            labels = [None] * len(chunk)
+
+    # Re-query the gaps concurrently
+    retries = {i: _classify_one_async(h, model) for i, h in enumerate(chunk) if labels[i] is None}
+    retried = dict(zip(retries, await asyncio.gather(*retries.values())))
+    return [retried[i] if i in retried else {"headline": h, **labels[i]} for i, h in enumerate(chunk)]
+
+
+async def _classify_async(headlines: list[str], model: str, batch_size: int) -> list[dict]:
+    if batch_size <= 1:
+        return list(await asyncio.gather(*(_classify_one_async(h, model) for h in headlines)))
+
+    chunks = await asyncio.gather(*(_classify_chunk_async(c, model) for c in _chunks(headlines, batch_size)))
+    return [r for chunk in chunks for r in chunk]
+
+
+# ---- Cache ----
+def _lookup(headlines: list[str], model: str) -> tuple[list[str], dict, dict]:
+    """
+    Return (keys, cached, misses): cache keys in headline order, cached labels by key,
+    and the unique uncached headlines by key.
+    """
+    keys = [cache_key(h, model, PROMPT_VERSION) for h in headlines]
+    cached = sentiment_cache.get_many(keys) if config.SENTIMENT_CACHE_ENABLED else {}
+    misses = {k: h for k, h in zip(keys, headlines) if k not in cached}
+    tracing.annotate(cache_hits=len(headlines) - len(misses))
+    return keys, cached, misses
 
+
+def _merge(headlines: list[str], keys: list[str], cached: dict, misses: dict, fresh: list[dict]) -> list[dict]:
+    """Store successful fresh labels and return results in the original headline order."""
+    fresh_by_key = dict(zip(misses, fresh))
+    if config.SENTIMENT_CACHE_ENABLED:
+        sentiment_cache.put_many({
+            k: {"label": r["label"], "confidence": r["confidence"]}
+            for k, r in fresh_by_key.items() if _valid_label(r)
+        })
+
+    results = []
+    for h, k in zip(headlines, keys):
+        label = cached.get(k) or fresh_by_key[k]
+        results.append({"headline": h, **{f: v for f, v in label.items() if f != "headline"}})
     return results
 
 
+# ---- Public API ----
+def _span_attributes(headlines: list[str], model: str = "gpt-4o-mini", batch_size: int | None = None) -> dict:
+    return {"model": model, "headlines": len(headlines)}
+
+
+@tracing.traced("sentiment.analyze", _span_attributes)
+def analyze_sentiment(headlines: list[str], model: str = "gpt-4o-mini", batch_size: int | None = None) -> list[dict]:
+    """
+    Analyze sentiment of each headline using LLM.
+    Cached labels are returned directly; only cache misses reach the model,
+    `batch_size` at a time (default: config.SENTIMENT_BATCH_SIZE). Items missing
+    from a batch reply are re-queried one by one.
+    Returns list of dicts with label + confidence.
+    """
+    if batch_size is None:
+        batch_size = config.SENTIMENT_BATCH_SIZE
+    keys, cached, misses = _lookup(headlines, model)
+    fresh = _classify(list(misses.values()), model, batch_size) if misses else []
+    return _merge(headlines, keys, cached, misses, fresh)
+
+
+@tracing.traced("sentiment.analyze", _span_attributes)
+async def analyze_sentiment_async(headlines: list[str], model: str = "gpt-4o-mini", batch_size: int | None = None) -> list[dict]:
+    """
+    Async version of analyze_sentiment.
+    All batches (or single-headline calls) are awaited together, bounded by
+    the LLM client's concurrency limit. Cache reads and writes (SQLite) run on
+    worker threads so a held write lock never stalls the event loop.
+    """
+    if batch_size is None:
+        batch_size = config.SENTIMENT_BATCH_SIZE
+    keys, cached, misses = await asyncio.to_thread(_lookup, headlines, model)
+    fresh = await _classify_async(list(misses.values()), model, batch_size) if misses else []
+    return await asyncio.to_thread(_merge, headlines, keys, cached, misses, fresh)
+
+
 def aggregate_sentiment(results: list[dict]) -> dict:
     """
     Aggregate sentiment results into overall label + score.
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+
+def normalize_symbol(symbol: str) -> str:
+    return symbol.strip().upper()
+
+
+def request_key(route: str, symbol: str, **params) -> tuple:
+    """
+    Coalescing key: route, symbol and the sorted query params. Callers normalize
+    the symbol first (normalize_symbol) and pass that same symbol to the call,
+    so every caller sharing a key gets a result built for it.
+    """
+    return (route, symbol, tuple(sorted(params.items())))
+
+
+def agent_key(symbol: str, stages) -> tuple:
+    """Key for an /agent run; stages are sorted so every caller builds the same one."""
+    return request_key("agent", symbol, stages=",".join(sorted(stages)))
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces identical in-flight calls on one event loop.
+    The first caller for a key runs the coroutine; callers arriving with the same
+    key while it's still running await that result (or exception) instead of
+    running it again. Nothing is kept once the call finishes, so this is not a cache.
+    The shared call runs as its own task, so a caller that disconnects
+    doesn't cancel it for everyone else waiting on it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self.executed: dict[str, int] = {}
+        self.coalesced: dict[str, int] = {}
+
+    async def do(self, key: tuple, fn: Callable[[], Awaitable[Any]]) -> Any:
+        with self._lock:
+            task = self._calls.get(key)
+            leader = task is None
+            if leader:
+                task = self._calls[key] = asyncio.ensure_future(fn())
+                task.add_done_callback(lambda _: self._forget(key))
+            self._count(key[0], leader)
+        return await asyncio.shield(task)
+
+    def _forget(self, key: tuple) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def _count(self, route: str, leader: bool) -> None:
+        # caller holds self._lock
+        counter = self.executed if leader else self.coalesced
+        counter[route] = counter.get(route, 0) + 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            routes = sorted(set(self.executed) | set(self.coalesced))
+            per_route = {
+                route: {"executed": self.executed.get(route, 0), "coalesced": self.coalesced.get(route, 0)}
+                for route in routes
+            }
+            return {"routes": per_route, "in_flight": len(self._calls)}
+
+
+request_coalescer = AsyncSingleFlight()
@@ -0,0 +1,352 @@
+import asyncio
+import functools
+import json
+import os
+import queue
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from app.services import config
+
+# A request is traced when an exporter is configured, or when it sends
+# X-Debug-Trace (and TRACE_DEBUG_HEADER is on). Outside a traced request,
+# span() is a shared no-op and annotate() does nothing.
+EXPORTING = config.TRACE_EXPORTER in ("jsonl", "otlp")
+DEBUG_HEADER = b"x-debug-trace"
+
+# Functions are only wrapped if something can ever turn tracing on
+ACTIVE = EXPORTING or config.TRACE_DEBUG_HEADER
+
+_current: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+# ---- Spans ----
+class Trace:
+    """Spans of one request (or background run), collected until its root span ends."""
+
+    def __init__(self, export: bool):
+        self.trace_id = os.urandom(16).hex()
+        self.export = export
+        self.spans: list[Span] = []
+        self.done = False
+        self._lock = threading.Lock()
+
+    def finish(self, span: "Span") -> None:
+        with self._lock:
+            if self.done:
+                return  # background work that outlived the request
+            self.spans.append(span)
+            if span.parent_id is None:
+                self.done = True
+        if self.done and self.export:
+            exporter.submit(self)
+
+    def waterfall(self) -> dict:
+        """Spans as a tree (each one followed by its children, in start order) for X-Debug-Trace responses."""
+        children = {}
+        for s in sorted(self.spans, key=lambda s: s.start):
+            children.setdefault(s.parent_id, []).append(s)
+        roots = children.get(None, [])
+        if not roots:
+            return {"trace_id": self.trace_id, "spans": []}
+
+        origin = roots[0].start
+        rows = []
+        pending = [(s, 0) for s in reversed(roots)]
+        while pending:
+            s, depth = pending.pop()
+            row = {
+                "name": s.name,
+                "start_ms": round((s.start - origin) * 1000, 1),
+                "duration_ms": round(s.duration * 1000, 1),
+                "depth": depth,
+                "attributes": s.attributes,
+            }
+            if s.error:
+                row["error"] = s.error
+            rows.append(row)
+            pending.extend((c, depth + 1) for c in reversed(children.get(s.span_id, [])))
+        return {"trace_id": self.trace_id, "duration_ms": rows[0]["duration_ms"], "spans": rows}
+
+
+class Span:
+    __slots__ = ("trace", "name", "span_id", "parent_id", "attributes", "start", "duration", "error", "_perf", "_token")
+
+    def __init__(self, trace: Trace, name: str, parent_id: str | None, attributes: dict):
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.duration = 0.0
+        self.error = None
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        self.start = time.time()
+        self._perf = time.perf_counter()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._perf
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current.reset(self._token)
+        self.trace.finish(self)
+        return False
+
+
+class _NullSpan:
+    def set(self, **attributes) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL = _NullSpan()
+
+
+def trace(name: str, debug: bool = False, **attributes):
+    """
+    Root span of a new trace. Recorded when an exporter is configured or `debug`
+    is set (X-Debug-Trace); otherwise a no-op.
+    """
+    if not (EXPORTING or debug):
+        return _NULL
+    return Span(Trace(export=EXPORTING), name, None, attributes)
+
+
+def span(name: str, **attributes):
+    """Child span of the current one (a no-op outside a traced request)."""
+    parent = _current.get()
+    if parent is None:
+        return _NULL
+    return Span(parent.trace, name, parent.span_id, attributes)
+
+
+def annotate(**attributes) -> None:
+    """Add attributes to the current span, if any."""
+    current = _current.get()
+    if current is not None:
+        current.attributes.update(attributes)
+
+
+def traced(name: str, attributes=None):
+    """
+    Decorator running a sync or async function in a span. `attributes` is called
+    with the function's arguments and returns the span's starting attributes.
+    """
+    def decorate(fn):
+        if not ACTIVE:
+            return fn
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                if _current.get() is None:
+                    return await fn(*args, **kwargs)
+                with span(name, **(attributes(*args, **kwargs) if attributes else {})):
+                    return await fn(*args, **kwargs)
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if _current.get() is None:
+                    return fn(*args, **kwargs)
+                with span(name, **(attributes(*args, **kwargs) if attributes else {})):
+                    return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# ---- Export ----
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(traces: list[Trace]) -> dict:
+    """OTLP/HTTP JSON payload (ExportTraceServiceRequest) for finished traces."""
+    spans = []
+    for t in traces:
+        for s in t.spans:
+            start_ns = int(s.start * 1e9)
+            item = {
+                "traceId": t.trace_id,
+                "spanId": s.span_id,
+                "name": s.name,
+                "kind": 2 if s.parent_id is None else 1,  # SERVER for the root, INTERNAL below it
+                "startTimeUnixNano": str(start_ns),
+                "endTimeUnixNano": str(start_ns + int(s.duration * 1e9)),
+                "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items() if v is not None],
+                "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+            }
+            if s.parent_id:
+                item["parentSpanId"] = s.parent_id
+            spans.append(item)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": config.TRACE_SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "app.services.tracing"}, "spans": spans}],
+        }]
+    }
+
+
+def to_json_line(t: Trace) -> str:
+    return json.dumps({
+        "trace_id": t.trace_id,
+        "spans": [
+            {
+                "span_id": s.span_id,
+                "parent_id": s.parent_id,
+                "name": s.name,
+                "start": s.start,
+                "duration_ms": round(s.duration * 1000, 3),
+                "attributes": s.attributes,
+                "error": s.error,
+            }
+            for s in sorted(t.spans, key=lambda s: s.start)
+        ],
+    }, default=str)
+
+
+class Exporter:
+    """
+    Ships finished traces from a background thread, so requests never wait on
+    the file or the collector. Traces are dropped if the queue backs up.
+    """
+
+    def __init__(self, kind: str, max_queue: int = 1000, batch_size: int = 100):
+        self.kind = kind
+        self.batch_size = batch_size
+        self._queue: queue.Queue[Trace] = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        self.exported = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def submit(self, t: Trace) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                self._thread.start()
+        try:
+            self._queue.put_nowait(t)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """Block until every submitted trace has been exported (or failed)."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._export(batch)
+                self.exported += len(batch)
+            except Exception:
+                self.failed += len(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _export(self, batch: list[Trace]) -> None:
+        if self.kind == "jsonl":
+            path = Path(config.TRACE_JSONL_PATH or config.DATA_DIR / "traces.jsonl")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as f:
+                f.write("".join(to_json_line(t) + "\n" for t in batch))
+        elif self.kind == "otlp":
+            import httpx
+
+            response = httpx.post(config.TRACE_OTLP_ENDPOINT, json=to_otlp(batch), timeout=10)
+            response.raise_for_status()
+
+    def stats(self) -> dict:
+        return {"exporter": self.kind, "exported": self.exported, "dropped": self.dropped, "failed": self.failed}
+
+
+exporter = Exporter(config.TRACE_EXPORTER)
+
+
+# ---- HTTP ----
+class TracingMiddleware:
+    """
+    ASGI middleware opening the root span of each traced request. The span is
+    named after the route template and carries the path parameters (symbol...).
+    With X-Debug-Trace, JSON object responses get the waterfall under "trace";
+    other responses (streams, Arrow) only get the X-Trace-Id header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        debug = config.TRACE_DEBUG_HEADER and any(k == DEBUG_HEADER for k, _ in scope["headers"])
+        if not (EXPORTING or debug):
+            return await self.app(scope, receive, send)
+
+        root = trace(f"{scope['method']} {scope['path']}", debug=debug)
+        buffered = {}  # response start + body held back to add the waterfall
+
+        async def send_traced(message):
+            if message["type"] == "http.response.start":
+                root.set(**{"http.status_code": message["status"]})
+                headers = list(message.get("headers", [])) + [(b"x-trace-id", root.trace.trace_id.encode())]
+                message = {**message, "headers": headers}
+                content_type = dict(headers).get(b"content-type", b"")
+                if debug and content_type.startswith(b"application/json"):
+                    buffered["start"] = message
+                    buffered["body"] = []
+                    return
+            elif message["type"] == "http.response.body" and "start" in buffered:
+                buffered["body"].append(message.get("body", b""))
+                return  # sent, with the waterfall, once the root span has ended
+            await send(message)
+
+        with root:
+            root.set(**{"http.method": scope["method"]})
+            await self.app(scope, receive, send_traced)
+            route = scope.get("route")
+            if getattr(route, "path", None):
+                root.name = f"{scope['method']} {route.path}"
+                root.set(**{"http.route": route.path})
+            root.set(**scope.get("path_params", {}))
+
+        if "start" in buffered:
+            await self._send_with_waterfall(send, buffered["start"], b"".join(buffered["body"]), root.trace)
+
+    @staticmethod
+    async def _send_with_waterfall(send, start, body: bytes, t: Trace) -> None:
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict):
+            payload["trace"] = t.waterfall()
+            body = json.dumps(payload, default=str).encode()
+        headers = [(k, v) for k, v in start["headers"] if k.lower() != b"content-length"]
+        headers.append((b"content-length", str(len(body)).encode()))
+        await send({**start, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,156 @@
+import asyncio
+import importlib
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.services import config
+
+# Modules the analysis routes import lazily (see routes.py)
+SERVICE_MODULES = (
+    "app.services.news_tool",
+    "app.services.sentiment_tool",
+    "app.services.decision_tool",
+    "app.services.equity_tool",
+    "app.services.indicators",
+    "app.services.arrow_format",
+    "app.services.orchestrator",
+    "app.services.batch",
+)
+
+
+class Readiness:
+    """
+    Startup state reported by /ready: "starting" -> "warming" -> "ready" (or "failed").
+    Each warm-up step records how long it took and, if it failed, why.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.status = "starting"
+        self.steps: dict[str, dict] = {}
+        self.started = time.monotonic()
+        self.ready_after = None
+
+    def set_status(self, status: str) -> None:
+        with self._lock:
+            self.status = status
+            if status == "ready":
+                self.ready_after = round(time.monotonic() - self.started, 3)
+
+    def record(self, step: str, seconds: float, error: str | None = None) -> None:
+        with self._lock:
+            self.steps[step] = {"ok": error is None, "seconds": round(seconds, 3)}
+            if error:
+                self.steps[step]["error"] = error
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"status": self.status, "ready_after_s": self.ready_after, "steps": dict(self.steps)}
+
+
+readiness = Readiness()
+
+
+# ---- Warm-up steps ----
+def _import_services() -> None:
+    for name in SERVICE_MODULES:
+        importlib.import_module(name)
+
+
+def _compile_graphs() -> None:
+    from app.services.orchestrator import STAGES, get_agent_workflow
+
+    # Every stage selection the /agent flags can produce (graphs are cached per node set)
+    for n in range(1, len(STAGES) + 1):
+        for stages in itertools.combinations(STAGES, n):
+            get_agent_workflow(stages)
+
+
+async def _open_async_pools() -> None:
+    from app.services import llm_clients, news_tool
+
+    client, _ = news_tool._async_client()
+    await client.head("https://newsapi.org")
+    if llm_clients.async_openai_client:
+        await llm_clients.async_openai_client.models.list()
+
+
+def _open_pools(loop: asyncio.AbstractEventLoop) -> None:
+    """
+    Put a live keep-alive connection in the NewsAPI and OpenAI pools the async
+    routes use (no quota used). Those clients belong to the serving loop, so
+    the connections are opened there.
+    """
+    asyncio.run_coroutine_threadsafe(_open_async_pools(), loop).result(timeout=30)
+
+
+def _prefetch_watchlist(symbols: list[str]) -> None:
+    """
+    Fill the bar store, news cache and sentiment cache for the watchlist,
+    WATCHLIST_MAX_CONCURRENCY symbols at a time.
+    """
+    from app.services.equity_tool import get_stock_data_many
+    from app.services.news_tool import get_latest_news
+    from app.services.orchestrator import EQUITY_DAYS
+    from app.services.sentiment_tool import analyze_sentiment
+
+    def prefetch(symbol: str) -> str | None:
+        try:
+            news = get_latest_news(symbol, limit=3)
+            analyze_sentiment([n["title"] for n in news])
+        except Exception as e:
+            return f"{symbol}: {e}"
+        return None
+
+    get_stock_data_many(symbols, days=EQUITY_DAYS)
+    with ThreadPoolExecutor(max_workers=max(config.WATCHLIST_MAX_CONCURRENCY, 1)) as pool:
+        failed = [error for error in pool.map(prefetch, symbols) if error]
+    if failed:
+        raise RuntimeError("; ".join(failed))
+
+
+def _run_step(name: str, fn, *args) -> bool:
+    start = time.monotonic()
+    try:
+        fn(*args)
+    except Exception as e:
+        readiness.record(name, time.monotonic() - start, str(e))
+        return False
+    readiness.record(name, time.monotonic() - start)
+    return True
+
+
+def warm_up(loop: asyncio.AbstractEventLoop | None = None, watchlist: list[str] | None = None) -> None:
+    """
+    Load everything the first real request would otherwise pay for.
+    Imports and graph compilation must succeed for the backend to be ready;
+    opening pools (on `loop`, the serving event loop) is best effort (failures
+    are only reported). The watchlist prefetch runs after the backend is marked
+    ready: it's optional cache warming and takes minutes for a long watchlist.
+    """
+    readiness.set_status("warming")
+    if not (_run_step("imports", _import_services) and _run_step("graphs", _compile_graphs)):
+        readiness.set_status("failed")
+        return
+
+    if loop is not None:
+        _run_step("pools", _open_pools, loop)
+    readiness.set_status("ready")
+
+    if watchlist is None:
+        from app.services.watchlist import watchlist_store
+        watchlist = watchlist_store.symbols()
+    if watchlist:
+        _run_step("watchlist", _prefetch_watchlist, watchlist)
+
+
+def start_warmup(loop: asyncio.AbstractEventLoop | None = None) -> None:
+    """
+    Run warm_up on a background thread (so /health answers meanwhile), or mark
+    ready if disabled. `loop` is the serving event loop whose client pools to open.
+    """
+    if not config.WARMUP_ON_STARTUP:
+        readiness.set_status("ready")
+        return
+    threading.Thread(target=warm_up, args=(loop,), name="warmup", daemon=True).start()
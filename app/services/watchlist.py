@@ -0,0 +1,214 @@
+import asyncio
+import random
+import time
+from typing import Iterable
+from app.services import config, db, market_calendar, tracing
+from app.services.response_cache import has_error
+from app.services.singleflight import agent_key, normalize_symbol, request_coalescer
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS watchlist (
+    symbol   TEXT PRIMARY KEY,
+    added_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS seeded (
+    id INTEGER PRIMARY KEY CHECK (id = 1)
+);
+"""
+
+
+class WatchlistStore:
+    """Watchlist symbols in a local SQLite (WAL) file, so API changes survive restarts."""
+
+    def __init__(self, name: str = "watchlist"):
+        self.name = name
+
+    def _conn(self):
+        return db.connect(self.name, SCHEMA)
+
+    def symbols(self) -> list[str]:
+        return [s for (s,) in self._conn().execute("SELECT symbol FROM watchlist ORDER BY symbol")]
+
+    def added_at(self) -> dict[str, float]:
+        return dict(self._conn().execute("SELECT symbol, added_at FROM watchlist"))
+
+    def add(self, symbols: Iterable[str]) -> list[str]:
+        """Add symbols; returns the ones that weren't on the watchlist yet."""
+        symbols = list(dict.fromkeys(normalize_symbol(s) for s in symbols if s.strip()))
+        existing = set(self.symbols())
+        new = [s for s in symbols if s not in existing]
+        now = time.time()
+        self._conn().executemany(
+            "INSERT OR IGNORE INTO watchlist (symbol, added_at) VALUES (?, ?)", [(s, now) for s in new]
+        )
+        return new
+
+    def seed(self, symbols: Iterable[str]) -> list[str]:
+        """
+        Add the configured symbols the first time this store starts, and never
+        again: later changes through the API (removals included) are kept.
+        """
+        if self._conn().execute("INSERT OR IGNORE INTO seeded (id) VALUES (1)").rowcount == 0:
+            return []
+        return self.add(symbols)
+
+    def remove(self, symbol: str) -> bool:
+        cur = self._conn().execute("DELETE FROM watchlist WHERE symbol = ?", (normalize_symbol(symbol),))
+        return cur.rowcount > 0
+
+
+class WatchlistScheduler:
+    """
+    Background refresh of the full agent analysis (prices, indicators, news,
+    sentiment, decision) for every watchlist symbol.
+
+    Each symbol is refreshed every `interval` seconds plus a random delay of up
+    to `jitter` seconds, so symbols drift apart instead of hitting the upstreams
+    together, and at most `max_concurrency` refreshes run at once. Off market
+    hours the interval and the snapshot lifetime stretch to the next open. Refreshes
+    share /agent's coalescing key, so a request arriving mid-refresh waits for it.
+    Snapshots live in memory: each worker process runs its own scheduler.
+    """
+
+    def __init__(self, store: WatchlistStore, interval: float | None = None, jitter: float | None = None,
+                 max_concurrency: int | None = None, max_age: float | None = None):
+        self.store = store
+        self.interval = config.WATCHLIST_REFRESH_INTERVAL if interval is None else interval
+        self.jitter = config.WATCHLIST_REFRESH_JITTER if jitter is None else jitter
+        self.max_concurrency = config.WATCHLIST_MAX_CONCURRENCY if max_concurrency is None else max_concurrency
+        self.max_age = config.WATCHLIST_MAX_AGE if max_age is None else max_age
+        self._snapshots: dict[str, dict] = {}
+        self._next_due: dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+        self._running: dict[str, asyncio.Task] = {}
+        self._wake: asyncio.Event | None = None
+        self.hits = 0
+
+    # ---- Lifecycle ----
+    def start(self) -> None:
+        """Start the refresh loop on the running event loop."""
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="watchlist-scheduler")
+
+    async def stop(self) -> None:
+        tasks = [t for t in (self._task, *self._running.values()) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    def wake(self) -> None:
+        """Re-check due symbols now (after the watchlist changed). Call from the event loop."""
+        if self._wake is not None:
+            self._wake.set()
+
+    # ---- Refresh loop ----
+    async def _run(self) -> None:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        running = self._running
+        while True:
+            now = time.time()
+            symbols = await asyncio.to_thread(self.store.symbols)
+            for symbol in set(self._next_due) - set(symbols):
+                self._forget(symbol)
+            for symbol in symbols:
+                # First sighting: spread the initial refreshes over the jitter window
+                due = self._next_due.setdefault(symbol, now + random.uniform(0, self.jitter))
+                if due <= now and symbol not in running:
+                    running[symbol] = task = asyncio.create_task(self._refresh(symbol, semaphore))
+                    task.add_done_callback(lambda _, s=symbol: running.pop(s, None))
+
+            pending = [d for s, d in self._next_due.items() if s not in running]
+            timeout = max(min(pending, default=now + self.interval) - now, 0.5)
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _refresh(self, symbol: str, semaphore: asyncio.Semaphore) -> None:
+        from app.services.orchestrator import STAGES, get_agent_workflow
+
+        async with semaphore:
+            start = time.time()
+            entry = self._snapshots.setdefault(symbol, {"state": None, "refreshed_at": None})
+            try:
+                workflow = get_agent_workflow(STAGES)
+                # Same key as /agent, so a request arriving mid-refresh joins it
+                key = agent_key(symbol, STAGES)
+                with tracing.trace("watchlist.refresh", symbol=symbol):
+                    state = await request_coalescer.do(key, lambda: workflow.ainvoke({"symbol": symbol}))
+                failed = [k for k, v in state.items() if has_error(v)]
+                if failed:
+                    # Like the response cache, never serve a run where a stage failed
+                    raise RuntimeError(f"stage errors in {', '.join(failed)}")
+            except Exception as e:
+                # Keep the previous snapshot; it's served until it exceeds max_age
+                entry["error"] = str(e)
+            else:
+                now = time.time()
+                entry.update(state=state, refreshed_at=now, expires_at=now + market_calendar.cache_ttl(self.max_age), error=None)
+            entry["duration_s"] = round(time.time() - start, 3)
+            if symbol in self._next_due:
+                interval = market_calendar.cache_ttl(self.interval)
+                self._next_due[symbol] = time.time() + interval + random.uniform(0, self.jitter)
+
+    def _forget(self, symbol: str) -> None:
+        self._next_due.pop(symbol, None)
+        self._snapshots.pop(symbol, None)
+
+    def schedule_now(self, symbols: Iterable[str]) -> None:
+        """Refresh these symbols on the next loop pass (newly added ones)."""
+        now = time.time()
+        for symbol in symbols:
+            self._next_due[normalize_symbol(symbol)] = now
+        self.wake()
+
+    def remove(self, symbol: str) -> None:
+        self._forget(normalize_symbol(symbol))
+
+    # ---- Serving ----
+    def snapshot(self, symbol: str, stages: Iterable[str]) -> tuple[dict, float, float] | None:
+        """
+        The precomputed state for `symbol`, cut down to what a run of `stages`
+        would have returned, with its age and remaining lifetime in seconds;
+        None if missing or expired.
+        """
+        from app.services.orchestrator import NODE_OUTPUTS, resolve_nodes
+
+        entry = self._snapshots.get(normalize_symbol(symbol))
+        if not entry or entry["state"] is None:
+            return None
+        now = time.time()
+        if now >= entry["expires_at"]:
+            return None
+        age = now - entry["refreshed_at"]
+        keys = {NODE_OUTPUTS[n] for n in resolve_nodes(stages)}
+        state = {"symbol": symbol, **{k: v for k, v in entry["state"].items() if k in keys}}
+        self.hits += 1
+        return state, age, entry["expires_at"] - now
+
+    def status(self) -> list[dict]:
+        """Per symbol: when it was added, last refreshed, next due, and the last error."""
+        added = self.store.added_at()
+        now = time.time()
+        rows = []
+        for symbol in sorted(added):
+            entry = self._snapshots.get(symbol, {})
+            refreshed = entry.get("refreshed_at")
+            due = self._next_due.get(symbol)
+            rows.append({
+                "symbol": symbol,
+                "added_at": added[symbol],
+                "refreshed_at": refreshed,
+                "age_s": round(now - refreshed, 1) if refreshed else None,
+                "next_refresh_in_s": round(max(due - now, 0), 1) if due else None,
+                "duration_s": entry.get("duration_s"),
+                "error": entry.get("error"),
+            })
+        return rows
+
+
+watchlist_store = WatchlistStore()
+watchlist_scheduler = WatchlistScheduler(watchlist_store)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Time-to-first-useful-byte for /agent/{symbol}/stream vs the blocking /agent.
+
+Upstream calls are replaced by sleeps with fixed latencies (as in
+bench_agent_workflow.py) and the app is served by a real uvicorn server on a local
+port, since TestClient buffers streaming bodies. The first SSE event (news) should
+arrive after roughly the news latency, long before /agent returns.
+
+Usage:
+    python tools/bench_agent_stream.py [--port 8765]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Upstreams are stubbed; skip the startup warm-up (it would hit the real ones)
+# and watchlist snapshots (requests must reach the workflow)
+os.environ.setdefault("WARMUP_ON_STARTUP", "false")
+os.environ.setdefault("WATCHLIST_ENABLED", "false")
+
+import httpx
+import uvicorn
+
+from app.main import app
+from bench_agent_workflow import LATENCY, patch_upstreams
+
+
+def serve(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    patch_upstreams()
+    server = serve(args.port)
+    client = httpx.Client(base_url=f"http://127.0.0.1:{args.port}", timeout=30)
+
+    try:
+        start = time.perf_counter()
+        client.get("/agent/TSLA").raise_for_status()
+        blocking = time.perf_counter() - start
+
+        arrivals = []
+        start = time.perf_counter()
+        with client.stream("GET", "/agent/TSLA/stream") as r:
+            r.raise_for_status()
+            for line in r.iter_lines():
+                if line.startswith("event:"):
+                    arrivals.append((line[6:].strip(), time.perf_counter() - start))
+    finally:
+        server.should_exit = True
+
+    print(f"/agent (blocking)       : {blocking:.2f}s to first byte")
+    for event, t in arrivals:
+        print(f"/agent/stream {event:<10}: {t:.2f}s")
+
+    events = [e for e, _ in arrivals]
+    first = arrivals[0][1] if arrivals else float("inf")
+    expected = {"news", "sentiment", "stock_data", "indicators", "decision", "done"}
+    if set(events) != expected:
+        print(f"FAIL: expected events {sorted(expected)}, got {events}")
+        return 1
+    # First event should come with the fastest node, well before the full run
+    if first >= blocking * 0.5 or first >= min(LATENCY["news"], LATENCY["equity"]) + 0.3:
+        print("FAIL: first event arrived too late")
+        return 1
+    print(f"OK: first useful event {blocking / first:.1f}x sooner than the blocking response")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
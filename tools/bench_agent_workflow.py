@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Timing check for the /agent fan-out/fan-in workflow.
+
+Upstream calls (NewsAPI, OpenAI, yfinance, indicators) are replaced by sleeps with
+fixed latencies, then /agent is called through FastAPI's TestClient. The news/sentiment
+branch and the equity/indicator branch run side by side, so wall time should track
+max(branch) + decision rather than the sum of every node.
+
+Usage:
+    python tools/bench_agent_workflow.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import orchestrator
+
+# Simulated upstream latencies (seconds)
+LATENCY = {
+    "news": 0.4,
+    "sentiment": 0.8,
+    "equity": 0.6,
+    "indicators": 0.1,
+    "decision": 0.3,
+}
+
+
+def _slow(key, value):
+    def fn(*args, **kwargs):
+        time.sleep(LATENCY[key])
+        return value
+    return fn
+
+
+def _slow_async(key, value):
+    async def fn(*args, **kwargs):
+        await asyncio.sleep(LATENCY[key])
+        return value
+    return fn
+
+
+STUBS = {
+    "get_latest_news": ("news", [{"title": "Stub headline"}]),
+    "analyze_sentiment": ("sentiment", [{"headline": "Stub headline", "label": "Positive", "confidence": 0.9}]),
+    "get_stock_data": ("equity", {"symbol": "TSLA", "data": []}),
+    "compute_indicators": ("indicators", {"symbol": "TSLA", "indicators": {"RSI": 50.0}}),
+    "hybrid_decision": ("decision", {"symbol": "TSLA", "decision": {}}),
+}
+
+
+def patch_upstreams():
+    # Sync names serve workflow.invoke (batch), *_async names serve the async routes
+    for name, (key, value) in STUBS.items():
+        setattr(orchestrator, name, _slow(key, value))
+        setattr(orchestrator, f"{name}_async", _slow_async(key, value))
+
+
+def main():
+    patch_upstreams()
+    client = TestClient(app)
+
+    news_branch = LATENCY["news"] + LATENCY["sentiment"]
+    equity_branch = LATENCY["equity"] + LATENCY["indicators"]
+    serial = news_branch + equity_branch + LATENCY["decision"]
+    parallel = max(news_branch, equity_branch) + LATENCY["decision"]
+
+    start = time.perf_counter()
+    r = client.get("/agent/TSLA")
+    wall = time.perf_counter() - start
+    r.raise_for_status()
+
+    print(f"sum(branch) + decision : {serial:.2f}s")
+    print(f"max(branch) + decision : {parallel:.2f}s")
+    print(f"/agent wall time       : {wall:.2f}s")
+
+    # Allow for graph scheduling overhead, but fail loudly if branches are serialized again.
+    if wall >= serial * 0.9:
+        print("FAIL: branches appear to run sequentially")
+        return 1
+    print("OK: branches run concurrently")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Throughput of the blocking (sync def) vs async /sentiment handler under load.
+
+Starts three local servers:
+ - a stub upstream answering NewsAPI (/v2/everything) and OpenAI
+   (/v1/chat/completions) after fixed delays,
+ - "before": the pre-async /sentiment handler (sync def on the threadpool,
+   requests + sync OpenAI client),
+ - "after": the real app, whose /sentiment is async end to end,
+then drives each with CONCURRENCY clients and reports requests/s and latency.
+
+Every request uses a distinct symbol, so coalescing and caching don't flatter
+either side, but the app otherwise runs with its defaults: the sentiment cache,
+article store and rate limiter (all SQLite) are on. The rate limit budget is
+raised so the single load generator isn't throttled. NEWS_POOL_SIZE and
+LLM_MAX_CONCURRENCY are raised to 64 (above the 40 threads the sync handler can use).
+The load generator speaks plain HTTP/1.1 over asyncio streams, so client overhead
+stays out of the numbers.
+
+Usage:
+    python tools/bench_async_routes.py [--concurrency 200] [--requests 2000] [--news-delay 0.5] [--llm-delay 1.0]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx
+
+PORTS = {"stub": 8790, "before": 8791, "after": 8792}
+UPSTREAM_CONCURRENCY = 64
+
+
+# ---- Servers (each runs in its own process) ----
+def stub_app(news_delay: float, llm_delay: float):
+    import re
+    from fastapi import FastAPI, Request
+
+    app = FastAPI()
+
+    @app.get("/v2/everything")
+    async def everything(q: str, pageSize: int = 5):
+        await asyncio.sleep(news_delay)
+        articles = [
+            {"title": f"{q} headline {i}", "publishedAt": "2026-01-01T00:00:00Z", "url": f"https://example.com/{q}/{i}", "source": {"name": "Stub"}}
+            for i in range(pageSize)
+        ]
+        return {"status": "ok", "totalResults": pageSize, "articles": articles}
+
+    @app.post("/v1/chat/completions")
+    async def completions(request: Request):
+        body = await request.json()
+        prompt = body["messages"][-1]["content"]
+        count = len(re.findall(r'^\s*\d+: "', prompt, flags=re.M)) or 1
+        await asyncio.sleep(llm_delay)
+        labels = [{"index": i, "label": "Positive", "confidence": 0.8} for i in range(count)]
+        return {
+            "id": "stub", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": str(labels).replace("'", '"')}}],
+        }
+
+    return app
+
+
+def before_app():
+    from fastapi import FastAPI
+    from app.services.news_tool import get_latest_news
+    from app.services.sentiment_tool import aggregate_sentiment, analyze_sentiment
+
+    app = FastAPI()
+
+    # The /sentiment handler as it was before the async path
+    @app.get("/sentiment/{symbol}")
+    def sentiment(symbol: str, model: str = "gpt-4o-mini", limit: int = 3):
+        news = get_latest_news(symbol, limit)
+        headlines = [n["title"] for n in news]
+        results = analyze_sentiment(headlines, model=model)
+        overall = aggregate_sentiment(results)
+        return {"symbol": symbol, "results": results, "overall": overall}
+
+    return app
+
+
+def after_app():
+    from app.main import app
+    return app
+
+
+def run_server(kind: str, news_delay: float, llm_delay: float):
+    import uvicorn
+
+    stub = f"http://127.0.0.1:{PORTS['stub']}"
+    os.environ.update({
+        "NEWS_API_KEY": "stub",
+        "OPENAI_API_KEY": "stub",
+        "OPENAI_BASE_URL": f"{stub}/v1",
+        "LLM_MAX_CONCURRENCY": str(UPSTREAM_CONCURRENCY),
+        "NEWS_POOL_SIZE": str(UPSTREAM_CONCURRENCY),
+        "WARMUP_ON_STARTUP": "false",
+        "WATCHLIST_ENABLED": "false",
+        "RATE_LIMIT_REQUESTS": "1000000",
+        "RATE_LIMIT_LLM_REQUESTS": "1000000",
+        "DATA_DIR": tempfile.mkdtemp(),
+    })
+    if kind != "stub":
+        from app.services import news_tool
+        news_tool.BASE_URL = f"{stub}/v2/everything"
+
+    app = stub_app(news_delay, llm_delay) if kind == "stub" else {"before": before_app, "after": after_app}[kind]()
+    uvicorn.run(app, host="127.0.0.1", port=PORTS[kind], log_level="warning", timeout_keep_alive=60)
+
+
+# ---- Load generator ----
+async def _get(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, path: str) -> tuple[int, bytes]:
+    """One keep-alive HTTP/1.1 GET (the servers answer with Content-Length bodies)."""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n".encode())
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.split(b"\r\n")
+    status = int(lines[0].split(b" ", 2)[1])
+    length = next(int(l.split(b":", 1)[1]) for l in lines if l.lower().startswith(b"content-length:"))
+    return status, await reader.readexactly(length)
+
+
+async def load(port: int, concurrency: int, total: int) -> dict:
+    latencies, errors = [], 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            for i in counter:
+                start = time.perf_counter()
+                status, body = await _get(reader, writer, f"/sentiment/SYM{i}")
+                latencies.append(time.perf_counter() - start)
+                if status != 200 or b'"error"' in body:
+                    errors += 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": total / wall,
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "errors": errors,
+    }
+
+
+def wait_ready(port: int, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/docs", timeout=1)
+            return
+        except httpx.TransportError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--news-delay", type=float, default=0.5, help="stub NewsAPI latency (s)")
+    parser.add_argument("--llm-delay", type=float, default=1.0, help="stub OpenAI latency (s)")
+    args = parser.parse_args()
+
+    procs = [
+        multiprocessing.Process(target=run_server, args=(kind, args.news_delay, args.llm_delay), daemon=True)
+        for kind in PORTS
+    ]
+    for p in procs:
+        p.start()
+    try:
+        for port in PORTS.values():
+            wait_ready(port)
+
+        print(f"{args.requests} requests, {args.concurrency} concurrent clients, upstream news {args.news_delay}s + LLM {args.llm_delay}s")
+        results = {}
+        for kind in ("before", "after"):
+            results[kind] = r = asyncio.run(load(PORTS[kind], args.concurrency, args.requests))
+            print(f"  {kind:<6} (/sentiment {'sync' if kind == 'before' else 'async'}): {r['rps']:7.1f} req/s  "
+                  f"p50 {r['p50'] * 1000:6.0f} ms  p95 {r['p95'] * 1000:6.0f} ms  errors {r['errors']}")
+        print(f"  speedup: {results['after']['rps'] / results['before']['rps']:.1f}x")
+    finally:
+        for p in procs:
+            p.terminate()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Cold vs warm timings for get_stock_data backed by the local bar store.
+
+yfinance is replaced by a stub that returns synthetic business-day bars after a fixed
+network delay, and the store writes to a temporary DATA_DIR. For a 60-day and a 5-year
+window it times the first (cold) request and the average of repeated (warm) requests,
+and counts how many upstream downloads each needed.
+
+Usage:
+    python tools/bench_bar_store.py [--latency 0.3] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+
+from app.services import bar_store as bar_store_module
+from app.services import equity_tool
+from app.services.bar_store import BarStore
+
+
+class StubTicker:
+    latency = 0.3
+    calls = 0
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+
+    def history(self, start: str, end: str):
+        StubTicker.calls += 1
+        time.sleep(StubTicker.latency)
+        index = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1), tz="America/New_York")
+        close = 100 + np.cumsum(np.random.default_rng(0).normal(0, 1, len(index)))
+        return pd.DataFrame(
+            {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1_000_000},
+            index=index,
+        )
+
+
+def time_requests(symbol: str, days: int, repeat: int) -> tuple[float, int, float, int]:
+    StubTicker.calls = 0
+    start = time.perf_counter()
+    equity_tool.get_stock_data(symbol, days)
+    cold = time.perf_counter() - start
+    cold_calls = StubTicker.calls
+
+    StubTicker.calls = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = equity_tool.get_stock_data(symbol, days)
+    warm = (time.perf_counter() - start) / repeat
+    assert result.get("data"), result
+    return cold, cold_calls, warm, StubTicker.calls
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.3, help="simulated yfinance round-trip (s)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    StubTicker.latency = args.latency
+    bar_store_module.yf.Ticker = StubTicker
+
+    with tempfile.TemporaryDirectory() as tmp:
+        equity_tool.bar_store = BarStore(root=Path(tmp))
+        print(f"{'window':>8} | {'cold':>16} | {'warm (avg of ' + str(args.repeat) + ')':>22}")
+        for label, symbol, days in (("60d", "AAA", 60), ("5y", "BBB", 5 * 365)):
+            cold, cold_calls, warm, warm_calls = time_requests(symbol, days, args.repeat)
+            print(f"{label:>8} | {cold * 1000:8.1f} ms {cold_calls:2d} dl | {warm * 1000:9.2f} ms {warm_calls:3d} downloads")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Per-symbol cost of get_stock_data (one yfinance request per symbol) vs
+get_stock_data_many (one bulk multi-ticker download).
+
+By default yfinance is replaced by a stub with a fixed round-trip latency plus a small
+per-ticker cost, so the comparison is reproducible offline; pass --live to hit Yahoo.
+Each mode starts from an empty temporary bar store (cold cache).
+
+Usage:
+    python tools/bench_equity_bulk.py [--symbols 50] [--days 60] [--live]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+
+from app.services import bar_store as bar_store_module
+from app.services import equity_tool
+from app.services.bar_store import BarStore
+
+WATCHLIST = [
+    "AAPL", "MSFT", "GOOGL", "AMZN", "META", "NVDA", "TSLA", "AMD", "INTC", "NFLX",
+    "ORCL", "CRM", "ADBE", "IBM", "QCOM", "TXN", "AVGO", "CSCO", "PEP", "KO",
+    "WMT", "COST", "HD", "LOW", "NKE", "MCD", "SBUX", "DIS", "T", "VZ",
+    "JPM", "BAC", "WFC", "C", "GS", "MS", "V", "MA", "PYPL", "AXP",
+    "XOM", "CVX", "COP", "PFE", "MRK", "JNJ", "ABBV", "LLY", "UNH", "CVS",
+]
+
+
+def _frame(start: str, end: str) -> pd.DataFrame:
+    index = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1))
+    close = 100 + np.cumsum(np.random.default_rng(0).normal(0, 1, len(index)))
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1_000_000}, index=index)
+
+
+def install_stub(latency: float, per_ticker: float):
+    yf = bar_store_module.yf
+
+    class StubTicker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        def history(self, start, end):
+            time.sleep(latency + per_ticker)
+            return _frame(start, end)
+
+    def stub_download(tickers, start, end, **kwargs):
+        time.sleep(latency + per_ticker * len(tickers))
+        frame = _frame(start, end)
+        return pd.concat({t.upper(): frame for t in tickers}, axis=1)
+
+    yf.Ticker = StubTicker
+    yf.download = stub_download
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--live", action="store_true", help="call Yahoo Finance instead of the stub")
+    parser.add_argument("--latency", type=float, default=0.25, help="stub round-trip per request (s)")
+    parser.add_argument("--per-ticker", type=float, default=0.005, help="stub cost per ticker (s)")
+    args = parser.parse_args()
+
+    if not args.live:
+        install_stub(args.latency, args.per_ticker)
+    symbols = WATCHLIST[:args.symbols]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        equity_tool.bar_store = BarStore(root=Path(tmp) / "single")
+        start = time.perf_counter()
+        single = {s: equity_tool.get_stock_data(s, args.days) for s in symbols}
+        single_s = time.perf_counter() - start
+
+        equity_tool.bar_store = BarStore(root=Path(tmp) / "bulk")
+        start = time.perf_counter()
+        bulk = equity_tool.get_stock_data_many(symbols, args.days)
+        bulk_s = time.perf_counter() - start
+
+    failed = lambda results: sum(1 for r in results.values() if "error" in r)
+    n = len(symbols)
+    print(f"{n} symbols, {args.days}-day window ({'live' if args.live else 'stub'})")
+    print(f"  get_stock_data x {n:<3}: {single_s:7.2f}s total  {single_s / n * 1000:8.1f} ms/symbol  ({failed(single)} failed)")
+    print(f"  get_stock_data_many  : {bulk_s:7.2f}s total  {bulk_s / n * 1000:8.1f} ms/symbol  ({failed(bulk)} failed)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Throughput of the vectorized indicator kernel vs the per-symbol pandas_ta path.
+
+Generates random-walk OHLCV for SYMBOLS x BARS (default 500 x 1,000), runs
+compute_indicators_batch once over the whole matrix, and compares it with calling
+compute_indicators symbol by symbol (timed on a sample and extrapolated).
+
+Usage:
+    python tools/bench_indicator_kernel.py [--symbols 500] [--bars 1000] [--sample 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+
+from app.services.indicator_kernel import compute_indicators_batch
+from app.services.indicators import compute_indicators, compute_indicators_many
+
+
+def make_matrix(symbols: int, bars: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, (symbols, bars)), axis=1)
+    high = close + rng.random((symbols, bars))
+    low = close - rng.random((symbols, bars))
+    volume = rng.integers(100_000, 1_000_000, (symbols, bars)).astype(np.float64)
+    return close, high, low, volume
+
+
+def to_stock_data(i: int, close, high, low, volume, dates) -> dict:
+    data = [
+        {"date": d, "open": c, "high": h, "low": l, "close": c, "volume": v}
+        for d, c, h, l, v in zip(dates, close[i].tolist(), high[i].tolist(), low[i].tolist(), volume[i].tolist())
+    ]
+    return {"symbol": f"SYM{i}", "data": data}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=1000)
+    parser.add_argument("--sample", type=int, default=50, help="symbols timed on the per-symbol path")
+    args = parser.parse_args()
+
+    close, high, low, volume = make_matrix(args.symbols, args.bars)
+    dates = pd.bdate_range("2015-01-01", periods=args.bars).strftime("%Y-%m-%d").tolist()
+
+    start = time.perf_counter()
+    compute_indicators_batch(close, high, low, volume, advanced=True)
+    kernel_s = time.perf_counter() - start
+
+    stock_data = [to_stock_data(i, close, high, low, volume, dates) for i in range(args.symbols)]
+    start = time.perf_counter()
+    compute_indicators_many(stock_data, advanced=True)
+    many_s = time.perf_counter() - start
+
+    sample = min(args.sample, args.symbols)
+    start = time.perf_counter()
+    for sd in stock_data[:sample]:
+        compute_indicators(sd, advanced=True)
+    per_symbol_s = (time.perf_counter() - start) / sample * args.symbols
+
+    print(f"{args.symbols} symbols x {args.bars} bars")
+    print(f"  kernel (arrays in)           : {kernel_s:8.3f}s  {args.symbols / kernel_s:10.0f} symbols/s")
+    print(f"  compute_indicators_many      : {many_s:8.3f}s  {args.symbols / many_s:10.0f} symbols/s")
+    print(f"  compute_indicators x N (est.): {per_symbol_s:8.3f}s  {args.symbols / per_symbol_s:10.0f} symbols/s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
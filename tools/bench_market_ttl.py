@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Upstream calls over a simulated week with fixed vs market-session-aware TTLs.
+
+Replays one /agent request every --every seconds for 7 days, starting on a
+Monday 00:00 New York time, against the cache rules the backend uses:
+ - news and decisions: cached for NEWS_CACHE_TTL / DECISION_CACHE_TTL, or
+   market_calendar.cache_ttl() of those with MARKET_AWARE_TTL;
+ - daily bars: downloaded when bar_store.window() ends past what is stored.
+Calls are split into in-session (open until close + settle) and off-hours.
+No network is used; only the policy is exercised.
+
+Usage:
+    python tools/bench_market_ttl.py [--every 60] [--week 2026-10-12]
+"""
+import argparse
+import os
+import sys
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.services import config, market_calendar
+
+
+def simulate(aware: bool, start: datetime, every: int) -> Counter:
+    config.MARKET_AWARE_TTL = aware
+    calls = Counter()
+    expires = {"news": start, "decision": start}
+    ttls = {"news": config.NEWS_CACHE_TTL, "decision": config.DECISION_CACHE_TTL}
+    covered_until = None
+
+    t = start
+    while t < start + timedelta(days=7):
+        period = "session" if market_calendar.is_live(t) else "off-hours"
+        for kind, ttl in ttls.items():
+            if t >= expires[kind]:
+                calls[kind, period] += 1
+                expires[kind] = t + timedelta(seconds=market_calendar.cache_ttl(ttl, t))
+        # bar_store.window() end for a request at t
+        end = market_calendar.last_completed_session(t) + timedelta(days=1) if aware else t.date()
+        if covered_until is None or end > covered_until:
+            calls["bars", period] += 1
+            covered_until = end
+        t += timedelta(seconds=every)
+    return calls
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--every", type=int, default=60, help="seconds between simulated requests")
+    parser.add_argument("--week", default=None, help="any date in the week to replay (default: this week)")
+    args = parser.parse_args()
+
+    day = date.fromisoformat(args.week) if args.week else date.today()
+    monday = day - timedelta(days=day.weekday())
+    start = datetime.combine(monday, datetime.min.time(), market_calendar.EXCHANGE_TZ)
+
+    print(f"week of {monday}, one request every {args.every}s")
+    print(f"{'':<8} {'kind':<9} {'session':>8} {'off-hours':>10}")
+    results = {}
+    for label, aware in (("fixed", False), ("aware", True)):
+        results[label] = calls = simulate(aware, start, args.every)
+        for kind in ("bars", "news", "decision"):
+            print(f"{label:<8} {kind:<9} {calls[kind, 'session']:>8} {calls[kind, 'off-hours']:>10}")
+
+    # Off hours, only the first request after each close may still fetch (the settled bar)
+    sessions = sum(market_calendar.session(monday + timedelta(days=i)) is not None for i in range(7))
+    off = sum(v for (_, period), v in results["aware"].items() if period == "off-hours")
+    print(f"aware off-hours upstream calls: {off} (at most {3 * (sessions + 1)} expected)")
+    return 0 if off <= 3 * (sessions + 1) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+/metrics check and instrumentation overhead.
+
+Upstream calls are replaced by sleeps (as in bench_agent_workflow.py), /agent is
+called once through FastAPI's TestClient and /metrics is scraped: it must carry
+the route histogram for /agent/{symbol} and one node histogram per orchestrator
+node. Then reports the cost of one upstream timer with metrics on, against the
+shared no-op used when METRICS_ENABLED=false.
+
+Usage:
+    python tools/bench_metrics.py [--iterations 100000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import nullcontext
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def per_call(cm_factory, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        with cm_factory():
+            pass
+    return (time.perf_counter() - start) / n
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    # Configure before the app (and its config module) is imported
+    os.environ.update({
+        "DATA_DIR": tempfile.mkdtemp(),
+        "WARMUP_ON_STARTUP": "false",
+        "WATCHLIST_ENABLED": "false",
+        "RATE_LIMIT_ENABLED": "false",
+        "METRICS_ENABLED": "true",
+    })
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.services import metrics, orchestrator
+    from bench_agent_workflow import patch_upstreams
+
+    patch_upstreams()
+    with TestClient(app) as client:
+        client.get("/agent/TSLA").raise_for_status()
+        r = client.get("/metrics")
+        r.raise_for_status()
+        body = r.text
+
+    expected = ['http_request_duration_seconds_count{route="/agent/{symbol}",method="GET",status="200"} 1']
+    expected += [f'agent_node_duration_seconds_count{{node="{node}"}} 1' for node in orchestrator.NODES]
+    missing = [line for line in expected if line not in body]
+
+    print(r.headers["content-type"], f"{len(body.splitlines())} lines")
+    for line in body.splitlines():
+        if line.startswith(("agent_node_duration_seconds_sum", "http_request_duration_seconds_sum")):
+            print(" ", line)
+
+    enabled = per_call(lambda: metrics.upstream_timer("bench"), args.iterations)
+    disabled = per_call(lambda: nullcontext(), args.iterations)
+    print(f"upstream timer: {enabled * 1e6:.2f} us enabled, {disabled * 1e6:.2f} us disabled")
+
+    print("OK" if not missing else f"FAIL: missing {missing}")
+    return 0 if not missing else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Compare batched vs per-headline sentiment classification.
+
+analyze_with_openai is replaced by a stub that sleeps for a fixed round-trip cost plus a
+small per-headline generation cost, so the numbers reflect request overhead rather than
+a real model. Runs N = 3, 10 and 50 headlines through both modes.
+
+Usage:
+    python tools/bench_sentiment.py [--round-trip 0.4] [--per-item 0.01]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.services import config, sentiment_tool
+
+BATCH_LINE = re.compile(r'^\s*(\d+): "', re.MULTILINE)
+
+
+def make_stub(round_trip: float, per_item: float, counter: dict):
+    def fake_llm(prompt: str, model: str = "gpt-4o-mini") -> str:
+        counter["calls"] += 1
+        indexes = [int(i) for i in BATCH_LINE.findall(prompt)]
+        items = max(len(indexes), 1)
+        time.sleep(round_trip + per_item * items)
+        if indexes:
+            return json.dumps([{"index": i, "label": "Positive", "confidence": 0.8} for i in indexes])
+        return json.dumps({"label": "Positive", "confidence": 0.8})
+    return fake_llm
+
+
+def run(n: int, batch_size: int, counter: dict) -> tuple[float, int]:
+    headlines = [f"Company {i} beats earnings estimates" for i in range(n)]
+    counter["calls"] = 0
+    start = time.perf_counter()
+    results = sentiment_tool.analyze_sentiment(headlines, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+    assert len(results) == n and all("label" in r for r in results)
+    return elapsed, counter["calls"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--round-trip", type=float, default=0.4, help="simulated fixed cost per LLM call (s)")
+    parser.add_argument("--per-item", type=float, default=0.01, help="simulated cost per classified headline (s)")
+    parser.add_argument("--batch-size", type=int, default=20)
+    args = parser.parse_args()
+
+    # Measure the LLM path itself, not the label cache
+    config.SENTIMENT_CACHE_ENABLED = False
+    counter = {"calls": 0}
+    sentiment_tool.analyze_with_openai = make_stub(args.round_trip, args.per_item, counter)
+
+    print(f"{'N':>4} | {'per-headline':>18} | {'batched (size ' + str(args.batch_size) + ')':>18} | speedup")
+    for n in (3, 10, 50):
+        loop_t, loop_calls = run(n, 1, counter)
+        batch_t, batch_calls = run(n, args.batch_size, counter)
+        print(f"{n:>4} | {loop_t:7.2f}s {loop_calls:3d} calls | {batch_t:7.2f}s {batch_calls:3d} calls | {loop_t / batch_t:6.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
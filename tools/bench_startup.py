@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Cold-start profile of the API.
+
+Each run uses fresh interpreters:
+ - import time: `import app.main` in a new process, plus which heavy libraries
+   (pandas, yfinance, openai, langgraph, ...) that import dragged in;
+ - time to first /health: launch uvicorn and poll /health until it answers 200;
+ - time to /ready: keep polling /ready until warm-up has marked the backend ready
+   (WATCHLIST="" also skips the watchlist prefetch that runs after it).
+
+The median of --runs is printed and appended as one JSON line to --history
+(default data/startup_history.jsonl, with commit and timestamp), so cold-start
+regressions show up against earlier runs.
+
+Usage:
+    python tools/bench_startup.py [--runs 5] [--port 8799] [--history PATH]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+HEAVY_MODULES = ("pandas", "pandas_ta", "yfinance", "openai", "langgraph", "langchain_core", "pyarrow", "requests")
+
+IMPORT_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({{"import_s": elapsed, "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import() -> dict:
+    out = subprocess.run([sys.executable, "-c", IMPORT_PROBE], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _wait_for(proc: subprocess.Popen, url: str, start: float, timeout: float) -> float:
+    while time.perf_counter() - start < timeout:
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return time.perf_counter() - start
+        except httpx.TransportError:
+            pass
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn exited before {url} answered")
+        time.sleep(0.02)
+    raise RuntimeError(f"{url} not ready after {timeout}s")
+
+
+def measure_health(port: int, timeout: float = 60) -> tuple[float, float]:
+    """Seconds from launch to the first 200 on /health, then on /ready."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env={**os.environ, "WATCHLIST": ""},
+    )
+    try:
+        health = _wait_for(proc, f"http://127.0.0.1:{port}/health", start, timeout)
+        return health, _wait_for(proc, f"http://127.0.0.1:{port}/ready", start, timeout)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--history", default=os.path.join(ROOT, "data", "startup_history.jsonl"))
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    health = [measure_health(args.port) for _ in range(args.runs)]
+
+    record = {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "import_s": round(statistics.median(r["import_s"] for r in imports), 3),
+        "first_health_s": round(statistics.median(h for h, _ in health), 3),
+        "ready_s": round(statistics.median(r for _, r in health), 3),
+        "heavy_modules_at_import": imports[-1]["heavy"],
+    }
+
+    previous = None
+    if os.path.exists(args.history):
+        with open(args.history) as f:
+            lines = [line for line in f if line.strip()]
+        previous = json.loads(lines[-1]) if lines else None
+    os.makedirs(os.path.dirname(args.history), exist_ok=True)
+    with open(args.history, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+    print(f"import app.main       : {record['import_s']:.3f}s (median of {args.runs})")
+    print(f"time to first /health : {record['first_health_s']:.3f}s")
+    print(f"time to /ready        : {record['ready_s']:.3f}s")
+    print(f"heavy modules at import: {', '.join(record['heavy_modules_at_import']) or 'none'}")
+    if previous:
+        print(f"previous ({previous.get('commit')}, {previous['ts']}): "
+              f"import {previous['import_s']:.3f}s, /health {previous['first_health_s']:.3f}s")
+    print(f"appended to {args.history}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
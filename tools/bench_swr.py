@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Latency of /agent through the stale-while-revalidate response cache.
+
+Upstream calls are replaced by sleeps (as in bench_agent_workflow.py), and the
+response cache gets a short fresh TTL. Requests walk through every state:
+ MISS (pipeline runs inline) -> HIT -> STALE (served from cache, refreshed in
+ the background) -> HIT again once the refresh landed, with a small Age.
+A stale request must not wait for the pipeline, and every response must carry
+X-Cache / Age / Cache-Control.
+
+Usage:
+    python tools/bench_swr.py [--ttl 1]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ttl", type=int, default=1, help="fresh TTL (s)")
+    args = parser.parse_args()
+
+    # Configure before the app (and its config module) is imported
+    os.environ.update({
+        "DATA_DIR": tempfile.mkdtemp(),
+        "WARMUP_ON_STARTUP": "false",
+        "WATCHLIST_ENABLED": "false",
+        "MARKET_AWARE_TTL": "false",
+        "RESPONSE_CACHE_TTL": str(args.ttl),
+        "RESPONSE_CACHE_STALE": "60",
+    })
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from bench_agent_workflow import LATENCY, patch_upstreams
+
+    patch_upstreams()
+    pipeline = max(LATENCY["news"] + LATENCY["sentiment"], LATENCY["equity"] + LATENCY["indicators"]) + LATENCY["decision"]
+
+    rows = []
+    with TestClient(app) as client:
+        def get(label):
+            start = time.perf_counter()
+            r = client.get("/agent/TSLA")
+            elapsed = time.perf_counter() - start
+            r.raise_for_status()
+            rows.append((label, elapsed, r.headers.get("X-Cache"), r.headers.get("Age"), r.headers.get("Cache-Control")))
+
+        get("first request")
+        get("repeat")
+        time.sleep(args.ttl + 0.2)
+        get("after TTL")
+        time.sleep(pipeline + 0.3)  # let the background refresh finish
+        get("after refresh")
+        stats = client.get("/cache/stats").json()["responses"]
+
+    for label, elapsed, status, age, cc in rows:
+        print(f"{label:<14} {elapsed * 1000:8.1f} ms  X-Cache {status:<6} Age {age:<3} Cache-Control {cc}")
+    print("response cache:", stats)
+
+    statuses = [r[2] for r in rows]
+    stale_ms = rows[2][1]
+    ok = statuses == ["MISS", "HIT", "STALE", "HIT"] and stale_ms < pipeline / 2 and all(r[3] is not None for r in rows)
+    print("OK" if ok else f"FAIL: statuses {statuses}, stale request took {stale_ms:.2f}s (pipeline {pipeline:.2f}s)")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
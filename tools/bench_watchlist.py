@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Check of the background watchlist scheduler.
+
+Upstream calls are replaced by sleeps (as in bench_agent_workflow.py), the
+watchlist is seeded with --symbols tickers and a short refresh interval, and
+the app runs through FastAPI's TestClient (which starts the scheduler). Reports:
+ - how long until every symbol has a snapshot, and the peak number of refreshes
+   running at once (must stay within WATCHLIST_MAX_CONCURRENCY);
+ - /agent latency for a watchlist symbol (snapshot) vs one that isn't (on demand).
+
+Usage:
+    python tools/bench_watchlist.py [--symbols 20] [--concurrency 4]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i}" for i in range(args.symbols)]
+    # Configure before the app (and its config module) is imported
+    os.environ.update({
+        "DATA_DIR": tempfile.mkdtemp(),
+        "WARMUP_ON_STARTUP": "false",
+        "WATCHLIST": ",".join(symbols),
+        "WATCHLIST_REFRESH_INTERVAL": "5",
+        "WATCHLIST_REFRESH_JITTER": "1",
+        "WATCHLIST_MAX_CONCURRENCY": str(args.concurrency),
+        "MARKET_AWARE_TTL": "false",
+        "RATE_LIMIT_ENABLED": "false",  # /watchlist is polled
+    })
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.services import orchestrator
+    from bench_agent_workflow import patch_upstreams
+
+    patch_upstreams()
+
+    # Track how many refreshes are fetching news at the same time
+    in_flight = peak = 0
+    fetch_news = orchestrator.get_latest_news_async
+
+    async def counting_news(*a, **kw):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            return await fetch_news(*a, **kw)
+        finally:
+            in_flight -= 1
+
+    orchestrator.get_latest_news_async = counting_news
+
+    with TestClient(app) as client:
+        start = time.perf_counter()
+        while True:
+            rows = client.get("/watchlist").json()["symbols"]
+            if all(r["refreshed_at"] for r in rows):
+                break
+            if time.perf_counter() - start > 120:
+                print("FAIL: watchlist not refreshed after 120s")
+                return 1
+            time.sleep(0.1)
+        filled = time.perf_counter() - start
+        refresh_peak = peak  # before on-demand requests add their own fetches
+
+        start = time.perf_counter()
+        r = client.get(f"/agent/{symbols[0]}")
+        snapshot = time.perf_counter() - start
+        served = r.headers.get("X-Cache") == "SNAPSHOT"
+
+        start = time.perf_counter()
+        client.get("/agent/NOTWATCHED").raise_for_status()
+        on_demand = time.perf_counter() - start
+
+    print(f"{args.symbols} symbols refreshed in {filled:.2f}s, peak concurrent refreshes {refresh_peak} (limit {args.concurrency})")
+    print(f"/agent watchlist symbol : {snapshot * 1000:7.1f} ms  (snapshot: {served})")
+    print(f"/agent other symbol     : {on_demand * 1000:7.1f} ms")
+    if refresh_peak > args.concurrency or not served:
+        print("FAIL")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
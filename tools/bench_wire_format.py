@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Payload size and encode/decode time for /equity wire formats.
+
+For 1 year and 20 years of synthetic daily bars it compares:
+ - JSON records  (get_stock_data payload -> json -> equity_to_df)
+ - JSON columnar (format=columnar        -> json -> equity_to_df)
+ - Arrow IPC     (Accept: application/vnd.apache.arrow.stream -> pyarrow.Table -> equity_to_df)
+
+Encode is the server side (payload build + serialization), decode is the UI side
+(parse + DataFrame). Requires pyarrow and the UI dependencies (plotly, pandas).
+
+Usage:
+    python tools/bench_wire_format.py [--repeat 5]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# ui/ goes after the repo root so ui/app.py doesn't shadow the app package
+sys.path.insert(0, os.path.join(ROOT, "ui"))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from app.services.arrow_format import bars_to_arrow
+from app.services.equity_tool import bars_to_columns, bars_to_records
+from lib.viz import equity_to_df
+
+
+def make_bars(n: int) -> dict:
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return {
+        "date": pd.bdate_range("2000-01-03", periods=n).values.astype("datetime64[D]"),
+        "open": close,
+        "high": close + rng.random(n),
+        "low": close - rng.random(n),
+        "close": close,
+        "volume": rng.integers(100_000, 10_000_000, n),
+    }
+
+
+FORMATS = {
+    "json records": (
+        lambda bars: json.dumps({"symbol": "TEST", "data": bars_to_records(bars)}).encode(),
+        lambda body: equity_to_df(json.loads(body)),
+    ),
+    "json columnar": (
+        lambda bars: json.dumps({"symbol": "TEST", "format": "columnar", "columns": bars_to_columns(bars)}).encode(),
+        lambda body: equity_to_df(json.loads(body)),
+    ),
+    "arrow ipc": (
+        lambda bars: bars_to_arrow("TEST", bars),
+        lambda body: equity_to_df(pa.ipc.open_stream(pa.py_buffer(body)).read_all()),
+    ),
+}
+
+
+def best_of(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, n in (("1 year", 252), ("20 years", 252 * 20)):
+        bars = make_bars(n)
+        print(f"{label} ({n} bars)")
+        print(f"  {'format':<14} {'bytes':>10} {'encode ms':>10} {'decode ms':>10}")
+        for name, (encode, decode) in FORMATS.items():
+            enc_s, body = best_of(lambda: encode(bars), args.repeat)
+            dec_s, df = best_of(lambda: decode(body), args.repeat)
+            assert len(df) == n, (name, len(df))
+            print(f"  {name:<14} {len(body):>10,} {enc_s * 1000:>10.2f} {dec_s * 1000:>10.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Check the incremental IndicatorEngine against compute_indicators (pandas_ta).
+
+For several synthetic histories it:
+ 1. builds an engine from all but the last bar, round-trips its state through JSON,
+    appends the last bar, and compares every indicator with compute_indicators;
+ 2. times a full pandas_ta recompute vs a single-bar engine update.
+
+Exits non-zero if any indicator differs by more than TOLERANCE.
+
+Usage:
+    python tools/check_indicator_parity.py
+"""
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+
+from app.services.indicator_engine import IndicatorEngine
+from app.services.indicators import compute_indicators
+
+# Both sides round to 2 decimals, so allow one rounding step plus float noise
+TOLERANCE = 0.011
+
+
+def synthetic_history(n: int, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    dates = pd.bdate_range("2020-01-01", periods=n).strftime("%Y-%m-%d")
+    data = [
+        {"date": d, "open": c, "high": c + h, "low": c - l, "close": c, "volume": int(v)}
+        for d, c, h, l, v in zip(dates, close, rng.random(n), rng.random(n), rng.integers(100_000, 1_000_000, n))
+    ]
+    return {"symbol": "TEST", "data": data}
+
+
+def main():
+    failures = 0
+    for n, seed in ((40, 1), (60, 2), (250, 3), (1000, 4)):
+        stock_data = synthetic_history(n, seed)
+
+        start = time.perf_counter()
+        expected = compute_indicators(stock_data, advanced=True)["indicators"]
+        full_ms = (time.perf_counter() - start) * 1000
+
+        engine = IndicatorEngine()
+        engine.extend(stock_data["data"][:-1])
+        engine = IndicatorEngine.from_dict(json.loads(json.dumps(engine.to_dict())))
+        start = time.perf_counter()
+        engine.update(stock_data["data"][-1])
+        append_ms = (time.perf_counter() - start) * 1000
+        got = engine.values(advanced=True)
+
+        worst = max(expected, key=lambda k: abs(got[k] - expected[k]))
+        diff = abs(got[worst] - expected[worst])
+        status = "OK" if diff <= TOLERANCE else "FAIL"
+        failures += status == "FAIL"
+        print(f"{n:5d} bars | max diff {diff:.4f} ({worst}) {status} | pandas_ta {full_ms:7.2f} ms | append {append_ms:6.3f} ms")
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
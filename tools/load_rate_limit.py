@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Rate limit check across uvicorn workers.
+
+Starts the API with --workers N and a budget of --budget requests per hour
+(refill is negligible during the run), then fires --requests requests at
+/cache/stats, each on a new connection so the kernel spreads them over the
+workers. Exactly --budget must pass (one more at most, from refill) whatever the
+worker count, since the buckets live in one shared SQLite file. Also reports
+the cost of one limiter check.
+
+Usage:
+    python tools/load_rate_limit.py [--workers 2] [--budget 100] [--requests 300]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx
+
+
+def wait_ready(url: str, proc: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        if proc.poll() is not None:
+            raise RuntimeError("uvicorn exited")
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout}s")
+
+
+def check_cost(n: int = 5000) -> float:
+    """Mean seconds per RateLimiter.hit on a scratch database."""
+    from app.services import config
+    config.DATA_DIR = type(config.DATA_DIR)(tempfile.mkdtemp())
+    from app.rate_limit import RateLimiter
+
+    limiter = RateLimiter("bench_rate_limits")
+    limiter.hit("warm", 10, 60)
+    start = time.perf_counter()
+    for i in range(n):
+        limiter.hit(f"ip:10.0.{i % 50}.1", 1000, 60)
+    return (time.perf_counter() - start) / n
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--budget", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--port", type=int, default=8798)
+    args = parser.parse_args()
+
+    env = {
+        **os.environ,
+        "DATA_DIR": tempfile.mkdtemp(),
+        "WARMUP_ON_STARTUP": "false",
+        "WATCHLIST_ENABLED": "false",
+        "RATE_LIMIT_REQUESTS": str(args.budget),
+        "RATE_LIMIT_WINDOW": "3600",
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(args.port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    base = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_ready(f"{base}/health", proc)
+
+        def one(_):
+            return httpx.get(f"{base}/cache/stats", timeout=10).status_code
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            statuses = Counter(pool.map(one, range(args.requests)))
+        elapsed = time.perf_counter() - start
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    per_check = check_cost()
+    print(f"{args.requests} requests over {args.workers} workers in {elapsed:.2f}s: {dict(statuses)}")
+    print(f"limiter check: {per_check * 1e6:.1f} us")
+    ok = args.budget <= statuses[200] <= args.budget + 1 and statuses[200] + statuses[429] == args.requests
+    print("OK" if ok else f"FAIL: expected {args.budget} allowed")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,7 +3,8 @@
 Small utility to start the FastAPI backend when running locally.
 
 Strategy (best-effort):
- 1. If /health responds, do nothing.
+ 1. If /ready responds, do nothing. If only /health does, the backend is still
+    warming up: wait for /ready instead of starting a second instance.
  2. Try to start the backend with `python -m uvicorn app.main:app --host 127.0.0.1 --port 8000` in background.
  3. If uvicorn isn't available or that fails, fall back to `docker-compose up -d api` if docker-compose is present.
 
@@ -34,6 +35,18 @@ def health_ok(url: str = "http://127.0.0.1:8000/health", timeout: int = 2) -> bo
     except Exception:
         return False
 
+def ready_ok(url: str = "http://127.0.0.1:8000/ready", timeout: int = 2) -> bool:
+    # /ready answers 503 until startup warm-up has finished
+    return health_ok(url, timeout)
+
+def wait_ready(seconds: int, interval: float = 0.5) -> bool:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if ready_ok():
+            return True
+        time.sleep(interval)
+    return False
+
 def try_uvicorn():
     cmd = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", "8000"]
     log(f"Attempting to start backend with: {' '.join(cmd)}")
@@ -65,27 +78,30 @@ def try_docker_compose():
 
 def main():
     log("=== start_backend.py invoked ===")
-    if health_ok():
-        log("Backend already healthy. Nothing to do.")
+    if ready_ok():
+        log("Backend already ready. Nothing to do.")
         return 0
+    if health_ok():
+        log("Backend is up but still warming up; waiting for /ready.")
+        if wait_ready(60):
+            log("Backend became ready.")
+            return 0
+        log("Timed out waiting for a running backend to become ready.")
+        return 2
 
     # First, try uvicorn in-process
     if try_uvicorn():
-        # give it a few seconds to bind
-        for i in range(20):
-            if health_ok():
-                log("Backend became healthy after starting uvicorn.")
-                return 0
-            time.sleep(0.5)
-        log("Timed out waiting for backend started by uvicorn to become healthy.")
+        # bind, then warm up (imports, graphs, pools, watchlist prefetch)
+        if wait_ready(60):
+            log("Backend became ready after starting uvicorn.")
+            return 0
+        log("Timed out waiting for backend started by uvicorn to become ready.")
 
     # Next try docker-compose
     if try_docker_compose():
-        for i in range(30):
-            if health_ok():
-                log("Backend became healthy after docker-compose up.")
-                return 0
-            time.sleep(1)
+        if wait_ready(90, interval=1):
+            log("Backend became ready after docker-compose up.")
+            return 0
         log("Timed out waiting for backend after docker-compose up.")
 
     log("Unable to start backend automatically. Check logs or start the API manually.")
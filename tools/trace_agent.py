@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Trace waterfall for one /agent request, end to end.
+
+NewsAPI, OpenAI and yfinance are replaced by stubs with fixed latencies below the
+service layer (pandas_ta by a constant RSI), so every real span (route, nodes,
+news, sentiment, OpenAI, equity) is recorded. /agent/TSLA is called with X-Debug-Trace, its inline
+waterfall printed and checked for the expected spans and attributes; a repeat
+request must show the response cache hit. Both traces must land in the JSONL
+export. Also reports the cost of a span inside and outside a traced request.
+
+Usage:
+    python tools/trace_agent.py [--symbol TSLA]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Simulated upstream latencies (seconds)
+LATENCY = {"newsapi": 0.3, "openai": 0.5, "yfinance": 0.4}
+
+
+def patch_upstreams():
+    import numpy as np
+    from app.services import indicators, llm_clients, news_tool
+    from app.services.bar_store import COLUMNS, bar_store
+
+    class News:
+        async def get(self, url, params=None, headers=None):
+            await asyncio.sleep(LATENCY["newsapi"])
+            articles = [
+                {"title": f"Stub headline {i}", "publishedAt": f"2026-10-1{i}T12:00:00Z",
+                 "url": f"https://example.com/{i}", "source": {"name": "Stub"}}
+                for i in range(3)
+            ]
+            body = {"status": "ok", "totalResults": 3, "articles": articles}
+            return SimpleNamespace(status_code=200, headers={}, text=json.dumps(body), json=lambda: body)
+
+    async def create(model, messages):
+        await asyncio.sleep(LATENCY["openai"])
+        prompt = messages[-1]["content"]
+        if "JSON array" in prompt:
+            count = prompt.count('"Stub headline')
+            content = json.dumps([{"index": i, "label": "Positive", "confidence": 0.8} for i in range(count)])
+        else:
+            content = json.dumps({"t+1": {"signal": "HOLD", "confidence": 0.5}, "explanation": "stub"})
+        usage = SimpleNamespace(prompt_tokens=len(prompt) // 4, completion_tokens=len(content) // 4)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage)
+
+    def fetch(symbol, start, end):
+        time.sleep(LATENCY["yfinance"])
+        dates = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D"))
+        bars = {"date": dates}
+        for col in COLUMNS:
+            bars[col] = np.full(len(dates), 100, dtype=np.int64 if col == "volume" else np.float64)
+        return bars
+
+    def compute(stock_data, advanced=False):
+        return {"symbol": stock_data["symbol"], "indicators": {"RSI": 50.0}}
+
+    indicators.compute_indicators = compute
+    news_tool._async_client = lambda: (News(), asyncio.Semaphore(10))
+    llm_clients.async_openai_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    bar_store._fetch = fetch
+
+
+def print_waterfall(waterfall: dict, width: int = 40) -> None:
+    total = waterfall["duration_ms"] or 1
+    for s in waterfall["spans"]:
+        start = int(s["start_ms"] / total * width)
+        length = max(int(s["duration_ms"] / total * width), 1)
+        bar = " " * start + "#" * length
+        name = "  " * s["depth"] + s["name"]
+        attrs = ", ".join(f"{k}={v}" for k, v in s["attributes"].items() if not k.startswith("http."))
+        print(f"{name:<28} {bar:<{width}} {s['duration_ms']:8.1f} ms  {attrs}")
+
+
+def span_cost(tracing, n: int = 100_000) -> tuple[float, float]:
+    start = time.perf_counter()
+    for _ in range(n):
+        with tracing.span("bench"):
+            pass
+    outside = (time.perf_counter() - start) / n
+
+    with tracing.trace("bench", debug=True):
+        start = time.perf_counter()
+        for _ in range(n):
+            with tracing.span("bench"):
+                pass
+        inside = (time.perf_counter() - start) / n
+    return outside, inside
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbol", default="TSLA")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp()
+    trace_file = os.path.join(data_dir, "traces.jsonl")
+    # Configure before the app (and its config module) is imported
+    os.environ.update({
+        "DATA_DIR": data_dir,
+        "WARMUP_ON_STARTUP": "false",
+        "WATCHLIST_ENABLED": "false",
+        "RATE_LIMIT_ENABLED": "false",
+        "MARKET_AWARE_TTL": "false",
+        "NEWS_API_KEY": "stub",
+        "TRACE_EXPORTER": "jsonl",
+        "TRACE_JSONL_PATH": trace_file,
+        "TRACE_DEBUG_HEADER": "true",
+    })
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.services import tracing
+
+    patch_upstreams()
+    with TestClient(app) as client:
+        first = client.get(f"/agent/{args.symbol}", headers={"X-Debug-Trace": "1"})
+        first.raise_for_status()
+        repeat = client.get(f"/agent/{args.symbol}", headers={"X-Debug-Trace": "1"})
+        repeat.raise_for_status()
+    tracing.exporter.flush()
+
+    waterfall = first.json()["trace"]
+    print(f"trace {waterfall['trace_id']} ({first.headers['X-Cache']})")
+    print_waterfall(waterfall)
+    print(f"repeat ({repeat.headers['X-Cache']}):")
+    print_waterfall(repeat.json()["trace"])
+
+    with open(trace_file) as f:
+        exported = [json.loads(line) for line in f]
+    outside, inside = span_cost(tracing)
+    print(f"exported traces: {len(exported)}  {tracing.exporter.stats()}")
+    print(f"span: {outside * 1e6:.2f} us outside a trace, {inside * 1e6:.2f} us inside")
+
+    spans = {s["name"]: s["attributes"] for s in waterfall["spans"]}
+    problems = []
+    for name, attrs in {
+        "GET /agent/{symbol}": {"symbol": args.symbol, "cache": "MISS"},
+        "node.fetch_news": {"symbol": args.symbol},
+        "news.latest": {"symbol": args.symbol, "cache": "miss"},
+        "sentiment.analyze": {"headlines": 3},
+        "openai.chat": {"model": "gpt-4o-mini"},
+        "equity.stock_data": {"symbol": args.symbol, "cache": "miss"},
+        "node.make_decision": {"cache": "miss"},
+    }.items():
+        if name not in spans:
+            problems.append(f"missing span {name}")
+        elif any(spans[name].get(k) != v for k, v in attrs.items()):
+            problems.append(f"{name} attributes {spans[name]}")
+    if not spans.get("equity.stock_data", {}).get("bars"):
+        problems.append("equity.stock_data has no bar count")
+    if repeat.json()["trace"]["spans"][0]["attributes"].get("cache") != "HIT":
+        problems.append("repeat request not a cache hit")
+    if [t["trace_id"] for t in exported] != [waterfall["trace_id"], repeat.json()["trace"]["trace_id"]]:
+        problems.append(f"exported {len(exported)} traces")
+
+    print("OK" if not problems else "FAIL: " + "; ".join(problems))
+    return 0 if not problems else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
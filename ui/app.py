@@ -1,4 +1,5 @@
 import re
+import httpx
 import streamlit as st
 import pandas as pd
 import subprocess
@@ -223,10 +224,10 @@ def _sentiment_articles(s: dict | None):
         return None
     return s.get("articles") or s.get("items") or s.get("per_article")
 
-def ensure_backend_running(timeout: int = 40):
+def ensure_backend_running(timeout: int = 90):
     client = get_api_client()
     try:
-        client.health()
+        client.ready()
         return True
     except Exception:
         pass
@@ -236,7 +237,7 @@ def ensure_backend_running(timeout: int = 40):
     
     try:
         subprocess.run([sys.executable, tools_path], stdout=subprocess.PIPE,
-                      stderr=subprocess.STDOUT, text=True, timeout=50)
+                      stderr=subprocess.STDOUT, text=True, timeout=100)
     except Exception:
         pass
     
@@ -244,7 +245,7 @@ def ensure_backend_running(timeout: int = 40):
     interval = 1
     while waited < timeout:
         try:
-            client.health()
+            client.ready()
             return True
         except Exception:
             time.sleep(interval)
@@ -262,6 +263,99 @@ def call_agent(symbol: str, params: dict):
     data = client.run_agent(symbol, **params)
     return data
 
+def stream_agent(symbol: str, params: dict):
+    client = get_api_client()
+    ensure_login_if_needed()
+    yield from client.stream_agent(symbol, **dict(params))
+
+# RESULT SECTIONS
+def _render_summary(data: dict, symbol: str):
+    dec_container, _ = _deep_find_decision(data)
+    dec_container = _unwrap_decision_container(dec_container)
+    
+    left, right = st.columns(2)
+    
+    with left:
+        st.subheader("🎯 Decision")
+        if isinstance(dec_container, dict):
+            if any(k in dec_container for k in ("signal", "action", "recommendation")):
+                decision_badge(dec_container)
+            else:
+                horizon_keys = [k for k in dec_container.keys() if _is_horizon_key(k)]
+                if horizon_keys:
+                    for hk in sorted(horizon_keys, key=_horizon_sort_key):
+                        st.caption(f"**{hk.upper()}**")
+                        decision_badge(dec_container.get(hk))
+                else:
+                    st.info("No decision")
+        else:
+            st.info("No decision")
+    
+    with right:
+        st.subheader("💭 Sentiment")
+        sentiment_summary(data.get("sentiment"))
+
+def _render_chart(data: dict, symbol: str):
+    df = equity_to_df(data.get("equity") or data.get("stock_data") or data)
+    if df.empty:
+        df = _fetch_equity_df(symbol)
+    
+    if df.empty:
+        st.info("No equity data")
+    else:
+        st.plotly_chart(price_chart(df), use_container_width=True)
+        if "rsi" in df.columns:
+            st.plotly_chart(rsi_chart(df), use_container_width=True)
+        with st.expander("Data"):
+            st.dataframe(df.tail(100), use_container_width=True)
+
+def _render_news(data: dict, symbol: str):
+    render_news(data.get("news"))
+
+def _render_sentiment(data: dict, symbol: str):
+    s = data.get("sentiment") or {}
+    sentiment_summary(s)
+    articles = _sentiment_articles(s)
+    if articles:
+        st.dataframe(pd.DataFrame(articles), use_container_width=True)
+
+def _render_indicators(data: dict, symbol: str):
+    ind = data.get("indicators") or {}
+    if not ind:
+        st.info("No indicators")
+    else:
+        st.json(ind)
+
+def _render_json(data: dict, symbol: str):
+    st.json(data)
+
+RESULT_TABS = [
+    ("summary", "Summary"),
+    ("chart", "Chart"),
+    ("news", "News"),
+    ("sentiment", "Sentiment"),
+    ("indicators", "Indicators"),
+    ("json", "JSON"),
+]
+
+RENDERERS = {
+    "summary": _render_summary,
+    "chart": _render_chart,
+    "news": _render_news,
+    "sentiment": _render_sentiment,
+    "indicators": _render_indicators,
+    "json": _render_json,
+}
+
+# Tabs refreshed by each streamed stage event
+EVENT_TABS = {
+    "news": ("news",),
+    "sentiment": ("summary", "sentiment"),
+    "stock_data": ("chart",),
+    "indicators": ("indicators",),
+    "decision": ("summary",),
+}
+
 # MAIN APP
 def main():
     # Header with logo
@@ -320,80 +414,52 @@ def main():
             "decision": int(do_decision),
         }
         
-        with st.spinner("Analyzing..."):
-            try:
-                data = call_agent(symbol.strip(), params)
-            except Exception as e:
-                st.error(f"Failed: {e}")
-                return
-        
-        st.success("✅ Complete!")
+        status = st.empty()
+        status.info("⏳ Analyzing...")
         st.markdown("---")
         
-        # Results
-        t_summary, t_chart, t_news, t_sent, t_ind, t_json = st.tabs(
-            ["Summary", "Chart", "News", "Sentiment", "Indicators", "JSON"]
-        )
-        
-        with t_summary:
-            dec_container, _ = _deep_find_decision(data)
-            dec_container = _unwrap_decision_container(dec_container)
-            
-            left, right = st.columns(2)
-            
-            with left:
-                st.subheader("🎯 Decision")
-                if isinstance(dec_container, dict):
-                    if any(k in dec_container for k in ("signal", "action", "recommendation")):
-                        decision_badge(dec_container)
-                    else:
-                        horizon_keys = [k for k in dec_container.keys() if _is_horizon_key(k)]
-                        if horizon_keys:
-                            for hk in sorted(horizon_keys, key=_horizon_sort_key):
-                                st.caption(f"**{hk.upper()}**")
-                                decision_badge(dec_container.get(hk))
-                        else:
-                            st.info("No decision")
-                else:
-                    st.info("No decision")
-            
-            with right:
-                st.subheader("💭 Sentiment")
-                sentiment_summary(data.get("sentiment"))
-        
-        with t_chart:
-            df = equity_to_df(data.get("equity") or data)
-            if df.empty:
-                df = _fetch_equity_df(symbol.strip())
-            
-            if df.empty:
-                st.info("No equity data")
-            else:
-                st.plotly_chart(price_chart(df), use_container_width=True)
-                if "rsi" in df.columns:
-                    st.plotly_chart(rsi_chart(df), use_container_width=True)
-                with st.expander("Data"):
-                    st.dataframe(df.tail(100), use_container_width=True)
+        # Results: tabs are filled in as each stage's event arrives
+        tabs = st.tabs([label for _, label in RESULT_TABS])
+        slots = {name: tab.empty() for (name, _), tab in zip(RESULT_TABS, tabs)}
+        for slot in slots.values():
+            slot.caption("Waiting...")
         
-        with t_news:
-            render_news(data.get("news"))
+        data, rendered = {}, set()
         
-        with t_sent:
-            s = data.get("sentiment") or {}
-            sentiment_summary(s)
-            articles = _sentiment_articles(s)
-            if articles:
-                st.dataframe(pd.DataFrame(articles), use_container_width=True)
+        def render(name):
+            with slots[name].container():
+                RENDERERS[name](data, symbol.strip())
+            rendered.add(name)
         
-        with t_ind:
-            ind = data.get("indicators") or {}
-            if not ind:
-                st.info("No indicators")
-            else:
-                st.json(ind)
+        try:
+            for event, payload in stream_agent(symbol.strip(), params):
+                if event == "error":
+                    raise RuntimeError(payload.get("detail"))
+                if event == "done":
+                    break
+                data[event] = payload
+                for name in EVENT_TABS.get(event, ()):
+                    render(name)
+        except httpx.HTTPStatusError as e:
+            # Backend without the streaming endpoint: fall back to the one-shot call
+            if e.response.status_code not in (404, 405):
+                status.error(f"Failed: {e}")
+                return
+            try:
+                data = call_agent(symbol.strip(), params)
+            except Exception as e:
+                status.error(f"Failed: {e}")
+                return
+            rendered.clear()
+        except Exception as e:
+            status.error(f"Failed: {e}")
+            return
         
-        with t_json:
-            st.json(data)
+        # Tabs no event touched (stage off, JSON, chart fallback)
+        for name, _ in RESULT_TABS:
+            if name not in rendered:
+                render(name)
+        status.success("✅ Complete!")
 
 if __name__ == "__main__":
     main()
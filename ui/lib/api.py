@@ -1,9 +1,18 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, Tuple
+import json
 import os
 import httpx
 import streamlit as st
 from dotenv import load_dotenv
 
+# pyarrow ships with streamlit; still optional so the client works without it
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
 # Load .env only if present (secrets.toml is preferred)
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "..", ".env"))
 
@@ -37,6 +46,12 @@ class APIClient:
         r.raise_for_status()
         return r.json()
 
+    def ready(self) -> Dict[str, Any]:
+        # 503 (raised) until the backend has finished warming up
+        r = self._client.get("/ready", headers=self._headers())
+        r.raise_for_status()
+        return r.json()
+
     def login(self, username: str, password: str) -> str:
         # Most FastAPI OAuth2 endpoints expect x-www-form-urlencoded
         payload = {"username": username, "password": password}
@@ -52,7 +67,8 @@ class APIClient:
         self.token = token
         return token
 
-    def run_agent(self, symbol: str, **params) -> Dict[str, Any]:
+    @staticmethod
+    def _agent_params(params: Dict[str, Any]) -> Dict[str, Any]:
         # Mirror flags → different backend param names
         if "equity" in params:
             v = params["equity"]
@@ -74,19 +90,52 @@ class APIClient:
             v = params["decision"]
             for alias in ("do_decision", "make_decision", "signal", "trade_decision"):
                 params.setdefault(alias, v)
+        return params
 
+    def run_agent(self, symbol: str, **params) -> Dict[str, Any]:
+        params = self._agent_params(params)
         r = self._client.get(f"/agent/{symbol}", params=params, headers=self._headers())
         r.raise_for_status()
         return r.json()
 
-    def get_equity(self, symbol: str, **params) -> Dict[str, Any]:
+    def stream_agent(self, symbol: str, **params) -> Iterator[Tuple[str, Any]]:
+        """
+        Run the agent via /agent/{symbol}/stream and yield (event, data) as each
+        stage finishes: news, sentiment, stock_data, indicators, decision,
+        then "done" (or "error" with {"detail": ...}).
+        """
+        params = self._agent_params(params)
+        headers = self._headers()
+        headers["Accept"] = "text/event-stream"
+        with self._client.stream("GET", f"/agent/{symbol}/stream", params=params, headers=headers) as r:
+            r.raise_for_status()
+            event, data_lines = "message", []
+            for line in r.iter_lines():
+                if line.startswith("event:"):
+                    event = line[6:].strip()
+                elif line.startswith("data:"):
+                    data_lines.append(line[5:].lstrip())
+                elif not line and data_lines:
+                    # Blank line ends the event
+                    yield event, json.loads("\n".join(data_lines))
+                    event, data_lines = "message", []
+
+    def get_equity(self, symbol: str, **params) -> Any:
         """
         Optional fallback if the agent response doesn't include prices.
         Tries /equity/{symbol}; if endpoint doesn't exist, returns {} quietly.
+        Prefers an Arrow IPC stream (returned as a pyarrow.Table over the response
+        buffer), then the columnar JSON format; equity_to_df accepts either.
         """
+        params.setdefault("format", "columnar")
+        headers = self._headers()
+        if pa is not None:
+            headers["Accept"] = f"{ARROW_STREAM}, application/json;q=0.9"
         try:
-            r = self._client.get(f"/equity/{symbol}", params=params, headers=self._headers())
+            r = self._client.get(f"/equity/{symbol}", params=params, headers=headers)
             r.raise_for_status()
+            if r.headers.get("content-type", "").startswith(ARROW_STREAM):
+                return pa.ipc.open_stream(pa.py_buffer(r.content)).read_all()
             return r.json()
         except httpx.HTTPStatusError as e:
             if e.response.status_code in (404, 405):
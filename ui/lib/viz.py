@@ -4,6 +4,11 @@ import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
 # ---------------- parsing helpers ----------------
 
 PRICE_KEYS = {"open", "high", "low", "close", "adj_close", "price"}
@@ -85,13 +90,62 @@ def _extract_records(obj):
 
     return None
 
+def _extract_columns(obj):
+    """
+    Find a columnar payload ({'format': 'columnar', 'columns': {'date': [...], ...}})
+    at the top level or under the same containers _extract_records searches.
+    """
+    if not isinstance(obj, dict):
+        return None
+    cols = obj.get("columns")
+    if isinstance(cols, dict) and isinstance(cols.get("date"), list):
+        return cols
+    for c in ("equity", "result", "agent", "output", "payload", "response"):
+        found = _extract_columns(obj.get(c))
+        if found is not None:
+            return found
+    return None
+
+def _columns_to_df(cols: dict) -> pd.DataFrame:
+    """Fast path: build the frame straight from parallel arrays (dates are epoch seconds)."""
+    if not cols.get("date"):
+        return pd.DataFrame()
+    data = {"datetime": pd.to_datetime(np.asarray(cols["date"], dtype=np.int64), unit="s", utc=True)}
+    for k, v in cols.items():
+        if k != "date":
+            data[str(k).lower()] = np.asarray(v, dtype=np.float64)
+    return _tidy_sorted(pd.DataFrame(data))
+
+def _arrow_to_df(table) -> pd.DataFrame:
+    """Fast path for Arrow tables: split_blocks keeps numeric columns as views where possible."""
+    if table.num_rows == 0:
+        return pd.DataFrame()
+    df = table.to_pandas(split_blocks=True)
+    df.columns = [str(c).lower() for c in df.columns]
+    df.rename(columns={"date": "datetime"}, inplace=True)
+    return _tidy_sorted(df)
+
+def _tidy_sorted(df: pd.DataFrame) -> pd.DataFrame:
+    # Arrays arrive sorted from the backend; only pay for a sort if they aren't
+    if not df["datetime"].is_monotonic_increasing:
+        df = df.sort_values("datetime")
+    return df.drop_duplicates(subset=["datetime"]).reset_index(drop=True)
+
 def equity_to_df(equity_obj: dict | list | None) -> pd.DataFrame:
     """
     Convert backend 'equity' payloads into a canonical DataFrame with:
     - datetime (UTC), open/high/low/close, volume (if present)
     - common indicators preserved (sma, ema, vwap, rsi, macd, macd_signal, bb_* ...)
-    Robust to many shapes and column namings.
+    Robust to many shapes and column namings; Arrow tables and columnar payloads
+    skip row parsing.
     """
+    if pa is not None and isinstance(equity_obj, pa.Table):
+        return _arrow_to_df(equity_obj)
+
+    cols = _extract_columns(equity_obj)
+    if cols is not None:
+        return _columns_to_df(cols)
+
     records = _extract_records(equity_obj)
     if not records:
         # As a last resort, if the input already looks like rows in a dict